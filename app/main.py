@@ -7,6 +7,13 @@ sys.path.append(str(Path(__file__).parent.parent))
 import uvicorn
 
 from app.routes import players, clubs, matches, transfers, leagues, staff, stats
+from app.utils.client import session_manager, page_cache, validators
+from app.utils.singleflight import flights
+from app.utils.governor import governors
+from app.utils.breaker import breakers
+from app.utils.live import live_scores
+from app.utils.transfer_feed import transfer_feed
+from app.utils.parsing import get_executor, shutdown_executor
 
 app = FastAPI(
     title="Transfermarkt API",
@@ -16,6 +23,19 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+@app.on_event("startup")
+async def startup():
+    await session_manager.start()
+    get_executor()
+    transfer_feed.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    live_scores.stop()
+    transfer_feed.stop()
+    await session_manager.close()
+    shutdown_executor()
+
 @app.get("/robots.txt", response_class=PlainTextResponse, include_in_schema=False)
 async def robots_txt():
     """
@@ -109,5 +129,9 @@ app.include_router(stats.router, prefix="/stats", tags=["stats"])
 async def health_check():
     return {"status": "healthy", "status_code": 200}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return {"single_flight": flights.stats(), "page_cache": page_cache.stats(), "conditional": validators.stats(), "upstream": governors.stats(), "breakers": breakers.stats(), "live_scores": live_scores.stats(), "transfer_feed": transfer_feed.stats()}
+
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
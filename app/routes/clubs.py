@@ -3,6 +3,7 @@ from fastapi import APIRouter, HTTPException, Request
 from ..utils.scraping import fetch_transfermarkt_clubs, scrape_club_profile, scrape_club_squad, scrape_team_transfers, get_club_fixtures_request
 from ..utils.cache import club_search_cache, club_profile_cache, club_squad_cache, club_transfers_cache, club_fixtures_cache
 from ..utils.rate_limiter import rate_limiter
+from ..utils.search_index import indexed_search, club_index
 
 from datetime import datetime
 
@@ -31,11 +32,13 @@ async def search_clubs(request: Request, query: str):
         raise HTTPException(status_code=400, detail="Query must be at least 2 characters long")
     
     try:
-        clubs = await fetch_transfermarkt_clubs(query)
+        clubs, local = await indexed_search(club_index, query, fetch_transfermarkt_clubs)
         return {
             "query": query,
             "results": clubs,
-            "cache_hit": query in club_search_cache
+            "cache_hit": local or query in club_search_cache,
+            "stale": club_search_cache.is_stale(query),
+            "source": "index" if local else "upstream"
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -55,7 +58,7 @@ async def get_club_profile(
 
     try:
         data = await scrape_club_profile(club_id)
-        return {"query": club_id, "data": data, "cache_hit": club_id in club_profile_cache}
+        return {"query": club_id, "data": data, "cache_hit": club_id in club_profile_cache, "stale": club_profile_cache.is_stale(club_id)}
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -86,7 +89,8 @@ async def get_club_squad(request: Request, club_id: int):
         return {
             "query": club_id,
             "result": squad_data,
-            "cache_hit":club_id in club_squad_cache
+            "cache_hit": str(club_id) in club_squad_cache,
+            "stale": club_squad_cache.is_stale(str(club_id))
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -122,7 +126,8 @@ async def get_team_transfers(
             "query": team_id,
             "season": season,
             "results": transfers,
-            "cache_hit": (team_id, season) in club_transfers_cache
+            "cache_hit": (team_id, season) in club_transfers_cache,
+            "stale": club_transfers_cache.is_stale((team_id, season))
         }
         
     except Exception as e:
@@ -146,7 +151,8 @@ async def get_team_fixtures(
         return {
             "query": team_id,
             "results": fixtures,
-            "cache_hit": team_id in club_fixtures_cache
+            "cache_hit": team_id in club_fixtures_cache,
+            "stale": club_fixtures_cache.is_stale(team_id)
         }
         
     except Exception as e:
@@ -1,7 +1,10 @@
+import json
+
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
 from ..utils.cache import leagues_search_cache, leagues_top_scorers_cache, leagues_clubs_cache, leagues_transfers_overview_cache, leagues_table_cache
-from ..utils.scraping import scrape_transfermarkt_leagues, get_league_top_scorers, get_league_clubs_request, get_league_transfers_overview_request, get_league_table_request
+from ..utils.scraping import scrape_transfermarkt_leagues, get_league_top_scorers, get_league_clubs_request, stream_league_squads, get_league_transfers_overview_request, get_league_table_request
 from ..utils.rate_limiter import rate_limiter
 
 router = APIRouter()
@@ -24,7 +27,8 @@ async def search_leagues(request: Request, query: str):
         return {
             "query": query,
             "results": leagues,
-            "cache_hit": query in leagues_search_cache
+            "cache_hit": query in leagues_search_cache,
+            "stale": leagues_search_cache.is_stale(query)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -49,7 +53,8 @@ async def get_top_scorers(
             "query": league_code,
             "season": season,
             "results": top_scorers,
-            "cache_hit": (league_code, season) in leagues_top_scorers_cache
+            "cache_hit": (league_code, season) in leagues_top_scorers_cache,
+            "stale": leagues_top_scorers_cache.is_stale((league_code, season))
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -72,11 +77,44 @@ async def get_league_clubs(
         return {
             "query": league_code,
             "results": league_clubs,
-            "cache_hit": league_code in leagues_clubs_cache
+            "cache_hit": league_code in leagues_clubs_cache,
+            "stale": leagues_clubs_cache.is_stale(league_code)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
+@router.get("/{league_code}/snapshot")
+async def get_league_snapshot(
+    request: Request,
+    league_code: str
+):
+    """
+    Get every club of a league with its squad in one call
+    Example: /leagues/GB1/snapshot
+    
+    Returns:
+    - NDJSON stream: one line per club with club_id, name, squad, cache_hit
+      and error, written as soon as each squad is ready
+    """
+    client_ip = request.client.host
+    
+    await rate_limiter.check_rate_limit(
+        key=f"league_snapshot:{client_ip}", 
+        limit=5, 
+        window=60 
+    )
+
+    try:
+        league_clubs = await get_league_clubs_request(league_code)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def lines():
+        async for club in stream_league_squads(league_clubs):
+            yield json.dumps(club) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @router.get("/{league_code}/transfers")
 async def get_league_transfers_overview(
     request: Request,
@@ -97,7 +135,8 @@ async def get_league_transfers_overview(
             "query": league_code,
             "season": season,
             "results": transfers,
-            "cache_hit": (league_code, season) in leagues_transfers_overview_cache
+            "cache_hit": (league_code, season) in leagues_transfers_overview_cache,
+            "stale": leagues_transfers_overview_cache.is_stale((league_code, season))
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -122,7 +161,8 @@ async def get_league_table(
             "query": league_code,
             "season": season,
             "results": table,
-            "cache_hit": (league_code, season) in leagues_table_cache
+            "cache_hit": (league_code, season) in leagues_table_cache,
+            "stale": leagues_table_cache.is_stale((league_code, season))
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
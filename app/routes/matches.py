@@ -1,12 +1,20 @@
-from fastapi import APIRouter, HTTPException, Request
+import json
+import os
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from ..utils.rate_limiter import rate_limiter
 
-from app.utils.scraping import scrape_todays_matches
+from app.utils.scraping import scrape_todays_matches, scrape_matches_range, match_day
+from app.utils.cache import matches_cache
+from app.utils.live import live_scores
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 router = APIRouter()
 
+MATCHES_RANGE_MAX_DAYS = int(os.getenv("MATCHES_RANGE_MAX_DAYS", 14))
+
 @router.get("/today")
 async def get_todays_matches(request: Request):
     client_ip = request.client.host
@@ -17,8 +25,10 @@ async def get_todays_matches(request: Request):
         window=60 
     )
     try:
+        today = match_day()
+        cache_hit = today in matches_cache
         matches = await scrape_todays_matches()
-        return {"query": "/today", "results": matches, "cache_hit": False}
+        return {"query": "/today", "results": matches, "cache_hit": cache_hit, "stale": matches_cache.is_stale(today)}
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -40,10 +50,93 @@ async def get_matches_by_date(request: Request, date: str):
     )
 
     try:
-        datetime.strptime(date, "%Y-%m-%d")
+        # strptime also accepts 2026-9-1; the cache key and matches_policy's
+        # date comparison need the zero-padded form
+        date = datetime.strptime(date, "%Y-%m-%d").strftime("%Y-%m-%d")
+        cache_hit = date in matches_cache
         matches = await scrape_todays_matches(date)
-        return {"query": date, "results": matches, "cache_hit": False}
+        return {"query": date, "results": matches, "cache_hit": cache_hit, "stale": matches_cache.is_stale(date)}
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/range")
+async def get_matches_range(
+    request: Request,
+    date_from: str = Query(..., alias="from"),
+    date_to: str = Query(..., alias="to")
+):
+    """
+    Get matches for every date in a range (format: YYYY-MM-DD, inclusive)
+    Example: /matches/range?from=2025-07-01&to=2025-07-07
+    
+    Returns:
+    - Matches per date, with the dates that failed in errors
+    """
+    client_ip = request.client.host
+    
+    await rate_limiter.check_rate_limit(
+        key=f"matches_range:{client_ip}", 
+        limit=5, 
+        window=60 
+    )
+
+    try:
+        start = datetime.strptime(date_from, "%Y-%m-%d")
+        end = datetime.strptime(date_to, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    if end < start:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    if (end - start).days >= MATCHES_RANGE_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"At most {MATCHES_RANGE_MAX_DAYS} days per range")
+
+    try:
+        dates = [(start + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range((end - start).days + 1)]
+        cache_hits = [date for date in dates if date in matches_cache]
+        results, errors = await scrape_matches_range(dates)
+        return {
+            "query": {"from": date_from, "to": date_to},
+            "results": results,
+            "errors": errors,
+            "cache_hits": cache_hits
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/live")
+async def stream_live_matches(request: Request):
+    """
+    Stream live score changes for today's matches as Server-Sent Events
+    
+    Returns:
+    - A "snapshot" event with all of today's matches, then an "update" event
+      with only the matches whose status, score or minute changed each time
+      they are polled upstream
+    """
+    client_ip = request.client.host
+    
+    await rate_limiter.check_rate_limit(
+        key=f"matches_live:{client_ip}", 
+        limit=5, 
+        window=60 
+    )
+
+    def event(kind, matches):
+        return f"event: {kind}\ndata: {json.dumps(matches)}\n\n"
+
+    async def events():
+        queue = live_scores.subscribe()
+        try:
+            yield event("snapshot", live_scores.snapshot())
+            while True:
+                kind, matches = await queue.get()
+                if matches or kind == "snapshot":
+                    yield event(kind, matches)
+                else:
+                    yield ": keep-alive\n\n"
+        finally:
+            live_scores.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
@@ -1,11 +1,27 @@
+import asyncio
+import os
+
 from fastapi import APIRouter, HTTPException, Request
 
-from ..utils.scraping import fetch_transfermarkt_players, scrape_player_profile, scrape_player_stats, get_player_transfers_request, fetch_player_injuries, fetch_player_absences, get_national_team_career
+from ..utils.scraping import fetch_transfermarkt_players, scrape_player_profile, scrape_player_profiles, scrape_player_stats, get_player_transfers_request, fetch_player_injuries, fetch_player_absences, get_national_team_career
 from ..utils.cache import player_search_cache, player_profile_cache, player_injuries_cache, player_stats_cache, player_transfers_cache, player_absences_cache, player_national_cache
 from ..utils.rate_limiter import rate_limiter
+from ..utils.search_index import indexed_search, player_index
 
 router = APIRouter()
 
+BATCH_MAX_IDS = int(os.getenv("BATCH_MAX_IDS", 100))
+
+# Facets of /players/{player_id}/full: scraper, its cache and the cache key
+PLAYER_FACETS = {
+    "profile": (lambda player_id, season: scrape_player_profile(player_id), player_profile_cache, lambda player_id, season: player_id),
+    "stats": (scrape_player_stats, player_stats_cache, lambda player_id, season: (player_id, season)),
+    "transfers": (lambda player_id, season: get_player_transfers_request(player_id), player_transfers_cache, lambda player_id, season: player_id),
+    "injuries": (lambda player_id, season: fetch_player_injuries(player_id), player_injuries_cache, lambda player_id, season: player_id),
+    "absences": (lambda player_id, season: fetch_player_absences(player_id), player_absences_cache, lambda player_id, season: player_id),
+    "national": (lambda player_id, season: get_national_team_career(player_id), player_national_cache, lambda player_id, season: player_id)
+}
+
 @router.get("/search")
 async def search_players(request: Request, query: str):
     """
@@ -29,15 +45,55 @@ async def search_players(request: Request, query: str):
         raise HTTPException(status_code=400, detail="Query must be at least 2 characters long")
     
     try:
-        players = await fetch_transfermarkt_players(query)
+        players, local = await indexed_search(player_index, query, fetch_transfermarkt_players)
         return {
             "query": query,
             "results": players,
-            "cache_hit": query in player_search_cache
+            "cache_hit": local or query in player_search_cache,
+            "stale": player_search_cache.is_stale(query),
+            "source": "index" if local else "upstream"
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
+@router.get("/batch")
+async def get_player_profiles(request: Request, ids: str):
+    """
+    Get profiles for many players in one call
+    Example: /players/batch?ids=433177,342229
+
+    Cached profiles are served immediately and the rest are scraped
+    concurrently. Players that fail are reported in errors without failing
+    the whole batch.
+    """
+    client_ip = request.client.host
+    
+    await rate_limiter.check_rate_limit(
+        key=f"player_batch:{client_ip}", 
+        limit=5, 
+        window=60 
+    )
+
+    player_ids = [player_id.strip() for player_id in ids.split(",") if player_id.strip()]
+    if not player_ids:
+        raise HTTPException(status_code=400, detail="At least one player ID is required")
+    if len(player_ids) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_IDS} player IDs per batch")
+    if not all(player_id.isdigit() for player_id in player_ids):
+        raise HTTPException(status_code=400, detail="Player IDs must be numeric")
+
+    try:
+        cache_hits = [player_id for player_id in dict.fromkeys(player_ids) if player_id in player_profile_cache]
+        results, errors = await scrape_player_profiles(player_ids)
+        return {
+            "query": player_ids,
+            "results": results,
+            "errors": errors,
+            "cache_hits": cache_hits
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{player_id}")
 async def get_player_profile(request: Request, player_id: str):
     """
@@ -60,12 +116,67 @@ async def get_player_profile(request: Request, player_id: str):
         return {
             "query": player_id,
             "results": profile,
-            "cache_hit": player_id in player_profile_cache
+            "cache_hit": player_id in player_profile_cache,
+            "stale": player_profile_cache.is_stale(player_id)
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
+@router.get("/{player_id}/full")
+async def get_player_full(
+    request: Request,
+    player_id: str,
+    facets: str = None,
+    season: str = None
+):
+    """
+    Get several facets of a player in one call
+    Example: /players/433177/full?facets=profile,stats,injuries
+    
+    Parameters:
+    - player_id: Transfermarkt player ID
+    - facets: (optional) Comma-separated facets from profile, stats, transfers,
+      injuries, absences and national (default: all)
+    - season: (optional) Season year for the stats facet
+    
+    Returns:
+    - One entry per facet with its results, cache status or error. A failing
+      facet does not fail the others.
+    """
+    client_ip = request.client.host
+    
+    await rate_limiter.check_rate_limit(
+        key=f"player_full:{client_ip}", 
+        limit=5, 
+        window=60 
+    )
+
+    if not player_id.isdigit():
+        raise HTTPException(status_code=400, detail="Player ID must be numeric")
+
+    selected = [facet.strip() for facet in facets.split(",") if facet.strip()] if facets else list(PLAYER_FACETS)
+    unknown = [facet for facet in selected if facet not in PLAYER_FACETS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown facets: {', '.join(unknown)}")
+
+    async def run_facet(facet):
+        scraper, cache, cache_key = PLAYER_FACETS[facet]
+        key = cache_key(player_id, season)
+        cache_hit = key in cache
+        stale = cache.is_stale(key)
+        try:
+            return {"results": await scraper(player_id, season), "cache_hit": cache_hit, "stale": stale, "error": None}
+        except Exception as e:
+            return {"results": None, "cache_hit": False, "stale": False, "error": str(e)}
+
+    try:
+        selected = list(dict.fromkeys(selected))
+        results = await asyncio.gather(*(run_facet(facet) for facet in selected))
+        return {"query": player_id, "results": dict(zip(selected, results))}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{player_id}/stats")
 async def get_player_stats(
     request: Request,
@@ -92,7 +203,7 @@ async def get_player_stats(
     """
     try:
         stats = await scrape_player_stats(player_id, season)
-        return {"query": player_id, "results": stats, "cache_hit": (player_id, season) in player_stats_cache}
+        return {"query": player_id, "results": stats, "cache_hit": (player_id, season) in player_stats_cache, "stale": player_stats_cache.is_stale((player_id, season))}
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -114,7 +225,7 @@ async def get_player_transfers(
 
     try:
         data = await get_player_transfers_request(player_id)
-        return {"query": player_id, "results": data, "cache_hit": player_id in player_transfers_cache}
+        return {"query": player_id, "results": data, "cache_hit": player_id in player_transfers_cache, "stale": player_transfers_cache.is_stale(player_id)}
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -136,7 +247,7 @@ async def get_player_injuries(
 
     try:
         data = await fetch_player_injuries(player_id)
-        return {"query": player_id, "results": data, "cache_hit": player_id in player_injuries_cache}
+        return {"query": player_id, "results": data, "cache_hit": player_id in player_injuries_cache, "stale": player_injuries_cache.is_stale(player_id)}
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -158,7 +269,7 @@ async def get_player_absences(
 
     try:
         data = await fetch_player_absences(player_id)
-        return {"query": player_id, "results": data, "cache_hit": player_id in player_absences_cache}
+        return {"query": player_id, "results": data, "cache_hit": player_id in player_absences_cache, "stale": player_absences_cache.is_stale(player_id)}
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -180,7 +291,7 @@ async def get_player_national_teams(
 
     try:
         data = await get_national_team_career(player_id)
-        return {"query": player_id, "results": data, "cache_hit": player_id in player_national_cache}
+        return {"query": player_id, "results": data, "cache_hit": player_id in player_national_cache, "stale": player_national_cache.is_stale(player_id)}
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -3,6 +3,7 @@ from fastapi import APIRouter, HTTPException, Request
 from ..utils.scraping import search_club_staff, get_staff_profile_scraping
 from ..utils.cache import staff_search_cache, staff_profile_cache
 from ..utils.rate_limiter import rate_limiter
+from ..utils.search_index import indexed_search, staff_index
 
 router = APIRouter()
 
@@ -16,8 +17,8 @@ async def search_staff(request: Request, query: str):
         window=60 
     )
     try:
-        search = await search_club_staff(query)
-        return {"query": query, "results": search, "cache_hit": query in staff_search_cache}
+        search, local = await indexed_search(staff_index, query, search_club_staff)
+        return {"query": query, "results": search, "cache_hit": local or query in staff_search_cache, "stale": staff_search_cache.is_stale(query), "source": "index" if local else "upstream"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -32,7 +33,7 @@ async def get_staff_profile(request: Request, staff_id: str):
     )
     try:
         profile = await get_staff_profile_scraping(staff_id)
-        return {"query": staff_id, "result": profile, "cache_hit": staff_id in staff_profile_cache}
+        return {"query": staff_id, "result": profile, "cache_hit": staff_id in staff_profile_cache, "stale": staff_profile_cache.is_stale(staff_id)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
 
 from ..utils.scraping import get_foreign_players_request
 from ..utils.cache import foreign_players_cache
 from ..utils.rate_limiter import rate_limiter
-from app.utils.store import get_country_list, search_countries_query
+from app.utils.store import get_country_list_json, search_countries_query
 
 router = APIRouter()
 
@@ -17,8 +18,7 @@ async def get_countries(request: Request):
         window=60 
     )
     try:
-        countries = get_country_list()
-        return countries
+        return Response(content=get_country_list_json(), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
@@ -51,6 +51,6 @@ async def get_current_foreign_players(request: Request, country_id: int):
     )
     try:
         countries = await get_foreign_players_request(country_id)
-        return {"query": country_id, "results": countries, "cache_hit": country_id in foreign_players_cache}
+        return {"query": country_id, "results": countries, "cache_hit": country_id in foreign_players_cache, "stale": foreign_players_cache.is_stale(country_id)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,12 +1,23 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Request
 
-from ..utils.scraping import scrape_transfers
+from ..utils.transfer_feed import transfer_feed
 from ..utils.rate_limiter import rate_limiter
 
 router = APIRouter()
 
 @router.get("/")
-async def get_transfers(request: Request):
+async def get_transfers(request: Request, since: int = None):
+    """
+    Get the latest transfers
+    
+    Parameters:
+    - since: (optional) Only return transfers with a sequence number above
+      this, oldest first. Pass back the last_seq of the previous response.
+    
+    Returns:
+    - Transfers from the background feed, each with a seq and the time it was
+      first seen as date
+    """
     client_ip = request.client.host
     
     await rate_limiter.check_rate_limit(
@@ -14,5 +25,12 @@ async def get_transfers(request: Request):
         limit=5, 
         window=60 
     )
-    transfers = await scrape_transfers()
-    return {"query":"transfers", "results": transfers, "cache_hit": False}
+
+    try:
+        cache_hit = transfer_feed.ingested_at is not None
+        if not cache_hit:
+            await transfer_feed.refresh()
+        transfers = transfer_feed.latest if since is None else transfer_feed.since(since)
+        return {"query": "transfers", "results": transfers, "last_seq": transfer_feed.seq, "cache_hit": cache_hit}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,88 @@
+import os
+import time
+
+class UpstreamUnavailable(Exception):
+    """Raised instead of calling an upstream host whose circuit is open"""
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one upstream host.
+
+    After failure_threshold consecutive failed requests the circuit opens and
+    every request fails fast for reset_timeout seconds. Then a single probe
+    request is let through (half-open): success closes the circuit again,
+    failure keeps it open for another reset_timeout.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.probing or time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.probing:
+            self.probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self, probe: bool = False):
+        self.failures = 0
+        self.opened_at = None
+        if probe:
+            self.probing = False
+
+    def record_failure(self, probe: bool = False):
+        """
+        Count a failed request. probe says whether it was the half-open
+        probe; only the probe's own outcome ends probing, so a request let
+        through before the circuit opened cannot start a second probe.
+        """
+        self.failures += 1
+        if probe or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        if probe:
+            self.probing = False
+
+    def abandon_probe(self):
+        """Lets another request probe when the current probe was cancelled"""
+        self.probing = False
+
+    def stats(self) -> dict:
+        return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
+
+class Breakers:
+    """One CircuitBreaker per upstream host, created on first use"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hosts = {}
+
+    def get(self, host: str) -> CircuitBreaker:
+        breaker = self.hosts.get(host)
+        if breaker is None:
+            breaker = self.hosts[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return breaker
+
+    def stats(self) -> dict:
+        return {host: breaker.stats() for host, breaker in self.hosts.items()}
+
+breakers = Breakers(
+    failure_threshold=int(os.getenv("BREAKER_FAILURE_THRESHOLD", 5)),
+    reset_timeout=float(os.getenv("BREAKER_RESET_TIMEOUT", 30))
+)
@@ -1,27 +1,289 @@
-from cachetools import TTLCache
-
-player_search_cache = TTLCache(maxsize=1000, ttl=3600)
-player_profile_cache = TTLCache(maxsize=1000, ttl=3600)
-player_transfers_cache = TTLCache(maxsize=1000, ttl=3600)
-player_injuries_cache = TTLCache(maxsize=1000, ttl=3600)
-player_stats_cache = TTLCache(maxsize=1000, ttl=3600)
-player_absences_cache = TTLCache(maxsize=1000, ttl=3600)
-player_national_cache = TTLCache(maxsize=1000, ttl=3600)
-
-club_search_cache = TTLCache(maxsize=1000, ttl=3600)
-club_profile_cache = TTLCache(maxsize=1000, ttl=3600)
-club_squad_cache = TTLCache(maxsize=1000, ttl=3600)
-club_transfers_cache = TTLCache(maxsize=1000, ttl=3600)
-club_fixtures_cache = TTLCache(maxsize=1000, ttl=3600)
-
-leagues_search_cache = TTLCache(maxsize=1000, ttl=3600)
-leagues_top_scorers_cache = TTLCache(maxsize=1000, ttl=3600)
-leagues_clubs_cache = TTLCache(maxsize=1000, ttl=3600)
-leagues_transfers_overview_cache = TTLCache(maxsize=1000, ttl=3600)
-leagues_table_cache = TTLCache(maxsize=1000, ttl=3600)
-
-staff_search_cache =  TTLCache(maxsize=1000, ttl=3600)
-staff_profile_cache = TTLCache(maxsize=1000, ttl=3600)
-
-country_list_cache = TTLCache(maxsize=1000, ttl=3600)
-foreign_players_cache = TTLCache(maxsize=1000, ttl=3600)
\ No newline at end of file
+import asyncio
+import functools
+import inspect
+import os
+import time
+from collections.abc import MutableMapping
+from contextvars import ContextVar
+from datetime import date
+
+from cachetools import TLRUCache
+
+from .cache_backends import SQLiteCache
+from .client import start_refresh
+from .governor import set_priority, BACKGROUND
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_PATH = os.getenv("CACHE_PATH", "/tmp/tmkt-api-cache.sqlite3")
+CACHE_MAX_STALE = int(os.getenv("CACHE_MAX_STALE", 3600))
+CACHE_PERSIST_PATH = os.getenv("CACHE_PERSIST_PATH")
+CACHE_PERSIST_MAX_BYTES = int(os.getenv("CACHE_PERSIST_MAX_BYTES", 256 * 1024 * 1024))
+CACHE_MAXSIZE = int(os.getenv("CACHE_MAXSIZE", 1000))
+CACHE_TTL = int(os.getenv("CACHE_TTL", 3600))
+CACHE_HISTORICAL_TTL = int(os.getenv("CACHE_HISTORICAL_TTL", 30 * 24 * 3600))
+CACHE_LIVE_TTL = int(os.getenv("CACHE_LIVE_TTL", 300))
+CACHE_MATCHES_LIVE_TTL = int(os.getenv("CACHE_MATCHES_LIVE_TTL", 30))
+
+_revalidating = ContextVar("revalidating", default=None)
+_refresh_tasks = {}
+
+class Cache(MutableMapping):
+    """
+    Soft/hard TTL cache in front of a backend.
+
+    Entries are fresh for ``ttl`` seconds (soft TTL). After that they are stale
+    but still served until ``ttl + max_stale`` (hard TTL), when the backend
+    drops them and the next request has to block on the upstream fetch.
+
+    An optional persistent store sits under the backend: every write goes to
+    both, and a backend miss is looked up in the store and promoted, so a
+    restarted process warms up from disk instead of from Transfermarkt.
+    """
+
+    def __init__(self, backend, ttl: float, max_stale: float, store=None, policy=None):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.store = store
+        self.policy = policy
+
+    def ttl_for(self, key, value) -> float:
+        """Soft TTL of a cached value: the policy's choice for it, else the cache default"""
+        ttl = self.policy(key, value) if self.policy is not None else None
+        return self.ttl if ttl is None else ttl
+
+    def _bypassed(self, key) -> bool:
+        # A background refresh must miss its own key so the scraper refetches it
+        current = _revalidating.get()
+        return current is not None and current[0] is self and current[1] == key
+
+    def _entry(self, key):
+        try:
+            return self.backend[key]
+        except KeyError:
+            if self.store is None:
+                raise
+        entry = self.store[key]
+        stored_at, value = entry
+        if time.time() - stored_at > self.ttl_for(key, value) + self.max_stale:
+            raise KeyError(key)
+        # The backend counts its hard TTL from stored_at (see make_cache)
+        self.backend[key] = entry
+        return entry
+
+    def __contains__(self, key) -> bool:
+        if self._bypassed(key):
+            return False
+        try:
+            self._entry(key)
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, key):
+        if self._bypassed(key):
+            raise KeyError(key)
+        return self._entry(key)[1]
+
+    def __setitem__(self, key, value):
+        entry = (time.time(), value)
+        self.backend[key] = entry
+        if self.store is not None:
+            self.store[key] = entry
+
+    def __delitem__(self, key):
+        del self.backend[key]
+        if self.store is not None:
+            self.store.pop(key, None)
+
+    def __iter__(self):
+        return iter(self.backend)
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    def touch(self, key):
+        """Mark key fresh again without changing its value, if it is still cached"""
+        try:
+            value = self._entry(key)[1]
+        except KeyError:
+            # Hard-expired meanwhile, e.g. while its refresh was running
+            return
+        self[key] = value
+
+    def is_stale(self, key) -> bool:
+        """True when key is cached but older than the soft TTL"""
+        if self._bypassed(key):
+            # Already being refreshed in this context
+            return False
+        try:
+            stored_at, value = self._entry(key)
+        except KeyError:
+            return False
+        return time.time() - stored_at > self.ttl_for(key, value)
+
+def current_season(today: date = None) -> int:
+    """Transfermarkt season ID (its starting year) in progress today; seasons turn over in July"""
+    today = today or date.today()
+    return today.year if today.month >= 7 else today.year - 1
+
+def past_season(season) -> bool:
+    try:
+        return int(season) < current_season()
+    except (TypeError, ValueError):
+        return False
+
+def season_policy(position: int):
+    """
+    TTL policy for caches keyed by (..., season, ...): finished seasons no
+    longer change, so they keep CACHE_HISTORICAL_TTL. Other keys, including
+    the current season and season=None, use the cache's default TTL.
+    """
+    def policy(key, value):
+        return CACHE_HISTORICAL_TTL if past_season(key[position]) else None
+    return policy
+
+def matches_policy(key, value):
+    """
+    TTL policy for match days keyed by date (YYYY-MM-DD): days that are over
+    keep CACHE_HISTORICAL_TTL, future days the cache default, and today
+    CACHE_LIVE_TTL, or CACHE_MATCHES_LIVE_TTL while any match is live.
+    """
+    if any(match.get("status") == "live" for match in value or []):
+        return CACHE_MATCHES_LIVE_TTL
+    today = date.today().isoformat()
+    if key < today:
+        return CACHE_HISTORICAL_TTL
+    if key == today:
+        return CACHE_LIVE_TTL
+    return None
+
+def _setting(name: str, option: str, default: int) -> int:
+    return int(os.getenv(f"CACHE_{option}_{name.upper()}", default))
+
+def make_cache(name: str, maxsize: int = None, ttl: int = None, max_stale: int = CACHE_MAX_STALE, policy=None):
+    """
+    Build the cache for one resource using the backend selected by CACHE_BACKEND:
+    - memory: per-process cachetools.TLRUCache (default)
+    - sqlite: SQLite WAL file at CACHE_PATH shared by all workers on the host
+
+    maxsize and ttl come from CACHE_MAXSIZE_<NAME> and CACHE_TTL_<NAME> when
+    set, else the given defaults, else CACHE_MAXSIZE and CACHE_TTL. policy
+    optionally picks the TTL from each key and cached value (e.g.
+    season_policy) and returns None to fall back to ttl.
+
+    Entries are served fresh for their TTL and stale for max_stale more.
+    When CACHE_PERSIST_PATH is set, entries are also written to a SQLite file
+    there, capped at CACHE_PERSIST_MAX_BYTES, and survive restarts.
+    """
+    maxsize = _setting(name, "MAXSIZE", maxsize or CACHE_MAXSIZE)
+    ttl = _setting(name, "TTL", ttl or CACHE_TTL)
+    cache = Cache(None, ttl=ttl, max_stale=max_stale, policy=policy)
+
+    def hard_ttl(key, entry):
+        # Seconds left until the hard TTL, counted from when the entry was
+        # stored, so one promoted from the persistent store keeps its deadline
+        return entry[0] + cache.ttl_for(key, entry[1]) + max_stale - time.time()
+
+    if CACHE_BACKEND == "sqlite":
+        cache.backend = SQLiteCache(CACHE_PATH, namespace=name, maxsize=maxsize, ttl=ttl + max_stale, ttl_for=hard_ttl)
+    else:
+        cache.backend = TLRUCache(maxsize=maxsize, ttu=lambda key, entry, now: now + hard_ttl(key, entry), timer=time.time)
+
+    if CACHE_PERSIST_PATH:
+        cache.store = SQLiteCache(CACHE_PERSIST_PATH, namespace=name, maxsize=maxsize, ttl=ttl + max_stale, max_bytes=CACHE_PERSIST_MAX_BYTES, ttl_for=hard_ttl)
+    return cache
+
+def _default_key(signature: inspect.Signature, args, kwargs):
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    values = tuple(bound.arguments.values())
+    return values[0] if len(values) == 1 else values
+
+def revalidate(cache: Cache, key=None):
+    """
+    Decorator for cached scrapers: when the cached entry for this call is
+    stale, the scraper still returns it straight away and a background task
+    re-runs the scraper to refresh it. The refresh fetches pages
+    conditionally; if upstream answers 304 the cached result is kept and
+    only its TTL restarts. Keys are derived from the call
+    arguments the same way the scrapers build them (a single argument is the
+    key itself, several become a tuple) unless key is given.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        def cache_key(args, kwargs):
+            if key is not None:
+                return key(*args, **kwargs)
+            return _default_key(signature, args, kwargs)
+
+        async def refresh(cache_key_value, args, kwargs):
+            _revalidating.set((cache, cache_key_value))
+            set_priority(BACKGROUND)
+            outcome = start_refresh()
+            try:
+                await fn(*args, **kwargs)
+            except Exception as e:
+                if not outcome["not_modified"]:
+                    print(f"Background refresh of {fn.__name__}{args} failed: {e}")
+                    return
+            # Checked after a normal return too: some scrapers turn every
+            # error, NotModified included, into an empty result
+            if outcome["not_modified"]:
+                # Page unchanged upstream: keep the parsed result, restart its TTL
+                cache.touch(cache_key_value)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            cache_key_value = cache_key(args, kwargs)
+            refresh_key = (id(cache), cache_key_value)
+            if cache.is_stale(cache_key_value) and refresh_key not in _refresh_tasks:
+                task = asyncio.ensure_future(refresh(cache_key_value, args, kwargs))
+                _refresh_tasks[refresh_key] = task
+                task.add_done_callback(lambda _: _refresh_tasks.pop(refresh_key, None))
+            return await fn(*args, **kwargs)
+
+        return wrapper
+    return decorator
+
+def bypass(cache: Cache, key):
+    """
+    Make the current context miss key in cache, the way a background refresh
+    does, so the next scraper call for it downloads its page again (skipping
+    the raw page cache) and stores a fresh value.
+    """
+    _revalidating.set((cache, key))
+    start_refresh(conditional=False)
+
+def refreshes_in_flight() -> int:
+    return len(_refresh_tasks)
+
+player_search_cache = make_cache("player_search")
+player_profile_cache = make_cache("player_profile")
+player_transfers_cache = make_cache("player_transfers")
+player_injuries_cache = make_cache("player_injuries")
+player_stats_cache = make_cache("player_stats", policy=season_policy(1))
+player_absences_cache = make_cache("player_absences")
+player_national_cache = make_cache("player_national")
+
+club_search_cache = make_cache("club_search")
+club_profile_cache = make_cache("club_profile")
+club_squad_cache = make_cache("club_squad")
+club_transfers_cache = make_cache("club_transfers", policy=season_policy(1))
+club_fixtures_cache = make_cache("club_fixtures", ttl=CACHE_LIVE_TTL)
+club_name_cache = make_cache("club_name", maxsize=10000, ttl=7 * 24 * 3600)
+
+leagues_search_cache = make_cache("leagues_search")
+leagues_top_scorers_cache = make_cache("leagues_top_scorers", policy=season_policy(1))
+leagues_clubs_cache = make_cache("leagues_clubs")
+leagues_transfers_overview_cache = make_cache("leagues_transfers_overview", policy=season_policy(1))
+leagues_table_cache = make_cache("leagues_table", policy=season_policy(1))
+
+staff_search_cache = make_cache("staff_search")
+staff_profile_cache = make_cache("staff_profile")
+
+country_list_cache = make_cache("country_list", ttl=7 * 24 * 3600)
+foreign_players_cache = make_cache("foreign_players")
+
+matches_cache = make_cache("matches", max_stale=CACHE_LIVE_TTL, policy=matches_policy)
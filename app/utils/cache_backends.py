@@ -0,0 +1,170 @@
+import json
+import os
+import sqlite3
+import time
+from collections.abc import MutableMapping
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Opens a connection to a SQLite file shared by every worker on the host,
+    in WAL mode so readers never block the writer.
+    """
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+class WorkerConnection:
+    """
+    Connection to a shared SQLite file, opened on first use and again in each
+    worker process. The schema statements (CREATE ... IF NOT EXISTS) run
+    every time it is opened.
+    """
+
+    def __init__(self, path: str, schema: tuple = ()):
+        self.path = path
+        self.schema = schema
+        self._conn = None
+        self._pid = None
+
+    def get(self) -> sqlite3.Connection:
+        # Connections must not cross a fork, so each worker opens its own
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = connect(self.path)
+            for statement in self.schema:
+                self._conn.execute(statement)
+            self._pid = os.getpid()
+        return self._conn
+
+class CacheBackend(MutableMapping):
+    """
+    Interface every cache object in app.utils.cache implements.
+
+    Scrapers and routes only use the mapping protocol (``key in cache``,
+    ``cache[key]``, ``cache[key] = value``), so a backend is any MutableMapping
+    that expires entries after its TTL. cachetools.TTLCache already satisfies
+    it and stays the in-process default.
+    """
+
+CACHE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cache ("
+    "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, size INTEGER NOT NULL, expires REAL NOT NULL, "
+    "PRIMARY KEY (namespace, key))",
+    "CREATE INDEX IF NOT EXISTS cache_expires ON cache (namespace, expires)",
+    # For the budget, which evicts across namespaces
+    "CREATE INDEX IF NOT EXISTS cache_expires_all ON cache (expires)",
+)
+
+class SQLiteCache(CacheBackend):
+    """
+    TTL cache stored in a SQLite database in WAL mode.
+
+    Every uvicorn worker on the host opens the same file, so a page scraped by
+    one worker is a cache hit for all of them. Keys and values are stored as
+    JSON, which covers everything the scrapers return.
+
+    ttl_for, if given, returns the TTL of each entry from its key and value
+    instead of the fixed ttl.
+
+    If max_bytes is set, the total size of stored values across every
+    namespace in the file is kept under that budget by evicting the entries
+    closest to expiry first.
+
+    Counting rows and summing sizes scans the table, so maxsize and max_bytes
+    are enforced on every evict_every-th write of this process rather than on
+    each one, and may be exceeded by that many entries in between.
+    """
+
+    def __init__(self, path: str, namespace: str, maxsize: int = 1000, ttl: float = 3600, max_bytes: int = None, ttl_for=None, evict_every: int = 64):
+        self.path = path
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttl_for = ttl_for
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self._writes = 0
+        self._connection = WorkerConnection(path, CACHE_SCHEMA)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self._connection.get()
+
+    @staticmethod
+    def _encode_key(key) -> str:
+        return json.dumps(key, separators=(",", ":"))
+
+    def __getitem__(self, key):
+        row = self.conn.execute(
+            "SELECT value FROM cache WHERE namespace = ? AND key = ? AND expires > ?",
+            (self.namespace, self._encode_key(key), time.time())
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __contains__(self, key) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM cache WHERE namespace = ? AND key = ? AND expires > ?",
+            (self.namespace, self._encode_key(key), time.time())
+        ).fetchone()
+        return row is not None
+
+    def __setitem__(self, key, value):
+        now = time.time()
+        encoded = json.dumps(value, separators=(",", ":"))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, value, size, expires) VALUES (?, ?, ?, ?, ?)",
+            (self.namespace, self._encode_key(key), encoded, len(encoded), now + (self.ttl_for(key, value) if self.ttl_for else self.ttl))
+        )
+        if self._writes % self.evict_every == 0:
+            self._evict(now)
+        self._writes += 1
+
+    def __delitem__(self, key):
+        cursor = self.conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND key = ?",
+            (self.namespace, self._encode_key(key))
+        )
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def _evict(self, now: float):
+        self.conn.execute("DELETE FROM cache WHERE namespace = ? AND expires <= ?", (self.namespace, now))
+        overflow = len(self) - self.maxsize
+        if overflow > 0:
+            self.conn.execute(
+                "DELETE FROM cache WHERE rowid IN ("
+                "SELECT rowid FROM cache WHERE namespace = ? ORDER BY expires LIMIT ?)",
+                (self.namespace, overflow)
+            )
+        if self.max_bytes is not None:
+            self._enforce_budget()
+
+    def _enforce_budget(self):
+        overflow = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0] - self.max_bytes
+        if overflow <= 0:
+            return
+
+        victims = []
+        for rowid, size in self.conn.execute("SELECT rowid, size FROM cache ORDER BY expires"):
+            victims.append((rowid,))
+            overflow -= size
+            if overflow <= 0:
+                break
+        self.conn.executemany("DELETE FROM cache WHERE rowid = ?", victims)
+
+    def __iter__(self):
+        rows = self.conn.execute(
+            "SELECT key FROM cache WHERE namespace = ? AND expires > ?",
+            (self.namespace, time.time())
+        ).fetchall()
+        for (key,) in rows:
+            key = json.loads(key)
+            yield tuple(key) if isinstance(key, list) else key
+
+    def __len__(self) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM cache WHERE namespace = ? AND expires > ?",
+            (self.namespace, time.time())
+        ).fetchone()[0]
@@ -0,0 +1,309 @@
+import asyncio
+import os
+import random
+import zlib
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+import aiohttp
+from cachetools import TTLCache
+
+from .breaker import breakers, UpstreamUnavailable
+from .governor import governors
+from .singleflight import flights, flight_scope
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(
+    total=float(os.getenv("UPSTREAM_TIMEOUT", 15)),
+    connect=float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", 5))
+)
+UPSTREAM_RETRIES = int(os.getenv("UPSTREAM_RETRIES", 2))
+UPSTREAM_RETRY_BACKOFF = float(os.getenv("UPSTREAM_RETRY_BACKOFF", 0.5))
+
+class SessionManager:
+    """
+    Owns the single aiohttp.ClientSession shared by every scraper.
+
+    The session is opened on application startup and closed on shutdown, so
+    connections to Transfermarkt are pooled and kept alive between cache misses
+    instead of paying a DNS lookup and TCP+TLS handshake on every request.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30,
+        ttl_dns_cache: int = 300,
+        headers: dict = None
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.headers = headers or DEFAULT_HEADERS
+        self._session = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=True
+        )
+        return aiohttp.ClientSession(headers=self.headers, connector=connector)
+
+    async def start(self):
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def get(self) -> aiohttp.ClientSession:
+        """
+        Return the shared session, opening it lazily if startup has not run
+        (e.g. when a scraper is called from a script instead of the app).
+        """
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+session_manager = SessionManager(
+    limit=int(os.getenv("HTTP_POOL_LIMIT", 100)),
+    limit_per_host=int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", 20)),
+    keepalive_timeout=float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 30)),
+    ttl_dns_cache=int(os.getenv("HTTP_DNS_CACHE_TTL", 300))
+)
+
+def get_session() -> aiohttp.ClientSession:
+    return session_manager.get()
+
+class PageCache:
+    """
+    URL-keyed cache of raw upstream HTML, stored zlib-compressed.
+
+    It sits beneath the per-endpoint parsed caches so that parsers reading the
+    same page (e.g. the club start page used for profile, squad and name) share
+    one download instead of fetching it once each. Refreshes of stale parsed
+    results bypass it, so a parsed TTL shorter than the page TTL still takes
+    effect.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: int = 600):
+        self.pages = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, url: str):
+        compressed = self.pages.get(url)
+        if compressed is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return zlib.decompress(compressed).decode("utf-8")
+
+    def set(self, url: str, html: str):
+        self.pages[url] = zlib.compress(html.encode("utf-8"), 6)
+
+    def stats(self) -> dict:
+        return {
+            "pages": len(self.pages),
+            "bytes": sum(len(page) for page in self.pages.values()),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+page_cache = PageCache(
+    maxsize=int(os.getenv("PAGE_CACHE_MAXSIZE", 256)),
+    ttl=int(os.getenv("PAGE_CACHE_TTL", 600))
+)
+
+class Validators:
+    """
+    ETag / Last-Modified validators of the last 200 response for each URL.
+
+    They outlive the raw page cache so that when a parsed result goes stale,
+    its refresh can send a conditional GET and Transfermarkt can answer 304
+    Not Modified instead of resending an unchanged page.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: int = 7 * 24 * 3600):
+        self.urls = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.sent = 0
+        self.not_modified = 0
+
+    def get(self, url: str) -> dict:
+        etag, last_modified = self.urls.get(url, (None, None))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def set(self, url: str, response_headers):
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        if etag or last_modified:
+            self.urls[url] = (etag, last_modified)
+
+    def stats(self) -> dict:
+        return {"urls": len(self.urls), "sent": self.sent, "not_modified": self.not_modified}
+
+validators = Validators(
+    maxsize=int(os.getenv("VALIDATORS_MAXSIZE", 10000)),
+    ttl=int(os.getenv("VALIDATORS_TTL", 7 * 24 * 3600))
+)
+
+class NotModified(Exception):
+    """Raised by fetch_page when a conditional request is answered with 304"""
+
+# Set by a cache refresh: the first upstream request made in its context is
+# for the refreshed resource, and its page skips the page cache and may be
+# requested conditionally. A 304 for that page is recorded here for the
+# refresh to act on.
+_refresh = ContextVar("refresh", default=None)
+
+def start_refresh(conditional: bool = True) -> dict:
+    """
+    Make the current context's first upstream request the refreshed one: if
+    it is a page, it is downloaded even when the page cache holds it, and
+    with conditional it carries the page's stored validators. Requests made
+    after it (e.g. the club names a transfers page links to) are plain, so a
+    304 for one of them says nothing about the resource. Single-flight calls
+    made from here on run in a scope of their own.
+
+    Returns:
+        Dictionary where "not_modified" is set once the page gets a 304
+    """
+    outcome = {"url": None, "conditional": conditional, "not_modified": False}
+    _refresh.set(outcome)
+    flight_scope.set(object())
+    return outcome
+
+def _refreshed(url: str):
+    """The current refresh's outcome if url is the resource it refreshes, else None"""
+    outcome = _refresh.get()
+    if outcome is None:
+        return None
+    if outcome["url"] is None:
+        outcome["url"] = url
+    return outcome if outcome["url"] == url else None
+
+async def request(url: str, read, params: dict = None, headers: dict = None, timeout: aiohttp.ClientTimeout = None):
+    """
+    Send a GET to an upstream host, the way every scraper reaches Transfermarkt.
+
+    Each attempt waits for a slot from the host's governor and is bounded by
+    timeout (DEFAULT_TIMEOUT unless the endpoint passes its own). 5xx
+    responses, connection errors and timeouts are retried up to
+    UPSTREAM_RETRIES times with jittered exponential backoff, and count as
+    failures for the host's circuit breaker. While the breaker is open,
+    requests fail fast with UpstreamUnavailable; cached scrapers keep serving
+    their stale entries meanwhile.
+
+    Args:
+        read: Coroutine function reading the body from the response
+
+    Returns:
+        (status, body) - the last response when every attempt returned 5xx
+    """
+    host = urlsplit(url).hostname
+    breaker = breakers.get(host)
+
+    for attempt in range(UPSTREAM_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(random.uniform(0, UPSTREAM_RETRY_BACKOFF * 2 ** (attempt - 1)))
+        # The request allowed through a half-open circuit is its probe
+        probe = breaker.state == "half-open"
+        if not breaker.allow():
+            raise UpstreamUnavailable(f"{host} is unavailable after repeated failures, try again later")
+
+        try:
+            async with governors.slot(url), get_session().get(url, params=params, headers=headers, timeout=timeout or DEFAULT_TIMEOUT) as response:
+                body = await read(response)
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            breaker.record_failure(probe)
+            if attempt == UPSTREAM_RETRIES:
+                raise Exception(f"Request to {host} failed: {e!r}")
+            continue
+        except BaseException:
+            # Cancelled, or the body could not be read (e.g. invalid JSON):
+            # no verdict on the host, but a probe must not stay claimed
+            if probe:
+                breaker.abandon_probe()
+            raise
+
+        if status < 500:
+            breaker.record_success(probe)
+            return status, body
+        breaker.record_failure(probe)
+
+    return status, body
+
+async def _read_page(response: aiohttp.ClientResponse):
+    return await response.text(), response.headers
+
+async def _read_json(response: aiohttp.ClientResponse):
+    if response.status != 200:
+        return None
+    return await response.json()
+
+async def _download(url: str, headers: dict = None, timeout: aiohttp.ClientTimeout = None, conditional: bool = False):
+    if conditional:
+        headers = {**(headers or {}), **validators.get(url)}
+        validators.sent += 1
+    status, (html, response_headers) = await request(url, _read_page, headers=headers, timeout=timeout)
+    if status == 200:
+        page_cache.set(url, html)
+        validators.set(url, response_headers)
+    return status, html
+
+async def fetch_page(url: str, headers: dict = None, timeout: aiohttp.ClientTimeout = None):
+    """
+    Fetch an HTML page through the shared session and raw page cache.
+
+    When this is the page a cache refresh is for (see start_refresh), it
+    always goes upstream. A conditional refresh sends the page's stored
+    validators, and a 304 answer raises NotModified.
+
+    Returns:
+        (status, html) - only 200 responses are cached
+    """
+    outcome = _refreshed(url)
+    if outcome is None:
+        html = page_cache.get(url)
+        if html is not None:
+            return 200, html
+    # A refreshed page skips the page cache, which may hold the very copy
+    # the stale result was parsed from (PAGE_CACHE_TTL can exceed its TTL)
+
+    if outcome is None or not outcome["conditional"] or not validators.get(url):
+        return await flights.do(("page", url), lambda: _download(url, headers, timeout), name="fetch_page")
+
+    # Kept apart from plain fetches, which could not use a 304 answer
+    status, html = await flights.do(("conditional", url), lambda: _download(url, headers, timeout, conditional=True), name="fetch_page")
+    if status == 304:
+        validators.not_modified += 1
+        outcome["not_modified"] = True
+        raise NotModified(f"{url} not modified")
+    return status, html
+
+async def fetch_json(url: str, params: dict = None, headers: dict = None, timeout: aiohttp.ClientTimeout = None):
+    """
+    Fetch a JSON API response through the shared session and upstream governor.
+
+    Returns:
+        (status, data) - data is None unless the status is 200
+    """
+    # Claims the refresh for this URL, so pages fetched after it are plain
+    _refreshed(url)
+    return await request(url, _read_json, params=params, headers=headers, timeout=timeout)
@@ -0,0 +1,233 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import os
+import time
+from contextvars import ContextVar
+from urllib.parse import urlsplit
+
+# Scheduling priorities for upstream requests, lowest value served first
+INTERACTIVE = 0
+BACKGROUND = 1
+BATCH = 2
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background", BATCH: "batch"}
+
+# Priority of the upstream requests made by the current task. Route handlers
+# run as interactive; background refreshes and batch fan-outs lower it.
+request_priority = ContextVar("request_priority", default=INTERACTIVE)
+
+# Set inside work shared by several callers (a single-flight task), whose
+# priority is that of the best-placed caller waiting for it
+shared_priority = ContextVar("shared_priority", default=None)
+
+def set_priority(priority: int):
+    request_priority.set(priority)
+    # Work started from here on is this task's own, not the shared work's
+    shared_priority.set(None)
+
+def current_priority() -> int:
+    shared = shared_priority.get()
+    return shared.priority if shared is not None else request_priority.get()
+
+class SharedPriority:
+    """
+    Priority of work that several callers wait for, e.g. a single-flight task.
+
+    It starts at the priority of the caller that started the work and is
+    raised whenever a caller with a better priority joins, so an interactive
+    request joining a flight started by batch or background work is not left
+    queued behind them. Raising it moves the upstream requests the work has
+    queued, and the shared work it is itself waiting for, up with it.
+    """
+
+    def __init__(self, priority: int):
+        self.priority = priority
+        self.children = []
+        self.queued = []
+
+    def join(self):
+        """Raise to the priority of the calling context, which now waits for this work"""
+        self.raise_to(current_priority())
+        parent = shared_priority.get()
+        if parent is not None:
+            # Shared work waiting for this one: its later raises apply here too
+            parent.children.append(self)
+
+    def raise_to(self, priority: int):
+        if priority >= self.priority:
+            return
+        self.priority = priority
+        for governor, order, waiter in self.queued:
+            governor.requeue(priority, order, waiter)
+        for child in self.children:
+            child.raise_to(priority)
+
+    @classmethod
+    def start(cls) -> "SharedPriority":
+        """Priority for new shared work started by the calling context"""
+        shared = cls(current_priority())
+        parent = shared_priority.get()
+        if parent is not None:
+            parent.children.append(shared)
+        return shared
+
+    def enter(self):
+        """Run the rest of the current task (the shared work) at this priority"""
+        shared_priority.set(self)
+
+class HostGovernor:
+    """
+    Admission control for the requests sent to one upstream host.
+
+    At most max_in_flight requests run at once and new ones start at no more
+    than `rate` per second on average (token bucket holding up to `burst`
+    tokens). Requests that cannot start right away wait in a priority queue,
+    so interactive misses go ahead of background refreshes and batch work,
+    in arrival order within a priority.
+    """
+
+    def __init__(self, max_in_flight: int = 16, rate: float = 10, burst: int = 20):
+        self.max_in_flight = max_in_flight
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.in_flight = 0
+        self._updated = time.monotonic()
+        self._queue = []
+        self._order = itertools.count()
+        self._timer = None
+        self.started = 0
+        self.queued = 0
+        self.waited = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _can_start(self) -> bool:
+        self._refill(time.monotonic())
+        return self.in_flight < self.max_in_flight and self.tokens >= 1
+
+    def _start(self):
+        self.tokens -= 1
+        self.in_flight += 1
+        self.started += 1
+
+    def _wake(self):
+        self._timer = None
+        while self._queue and self._can_start():
+            _, _, waiter = heapq.heappop(self._queue)
+            if waiter.done():
+                continue
+            self._start()
+            waiter.set_result(None)
+
+        if self._queue and self.in_flight < self.max_in_flight and self._timer is None:
+            # Out of tokens: come back when the next one is due
+            delay = (1 - self.tokens) / self.rate
+            self._timer = asyncio.get_running_loop().call_later(delay, self._wake)
+
+    async def acquire(self, priority: int = INTERACTIVE, shared: SharedPriority = None):
+        """
+        Wait for a slot. With shared, the request waits at the shared work's
+        priority and moves up the queue when that priority is raised.
+        """
+        if not self._queue and self._can_start():
+            self._start()
+            return
+
+        if shared is not None:
+            priority = shared.priority
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (self, next(self._order), waiter)
+        heapq.heappush(self._queue, (priority, entry[1], waiter))
+        if shared is not None:
+            shared.queued.append(entry)
+        self.queued += 1
+        queued_at = time.monotonic()
+        self._wake()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as the caller went away: hand it on
+                self.release()
+            raise
+        finally:
+            if shared is not None:
+                shared.queued.remove(entry)
+        waited = time.monotonic() - queued_at
+        self.waited += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def requeue(self, priority: int, order: int, waiter: asyncio.Future):
+        """
+        Move a queued request to a better priority. The old heap entry stays
+        behind and is skipped once the waiter is done.
+        """
+        if waiter.done():
+            return
+        heapq.heappush(self._queue, (priority, order, waiter))
+        self._wake()
+
+    def stats(self) -> dict:
+        # A requeued request has an entry per priority it waited at; count its best
+        waiting = {}
+        for priority, order, waiter in self._queue:
+            if not waiter.done():
+                waiting[order] = min(priority, waiting.get(order, priority))
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority in waiting.values():
+            depth[PRIORITY_NAMES.get(priority, str(priority))] += 1
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": depth,
+            "tokens": round(self.tokens, 2),
+            "started": self.started,
+            "queued": self.queued,
+            "wait_avg_ms": round(self.wait_total / self.waited * 1000, 2) if self.waited else 0.0,
+            "wait_max_ms": round(self.wait_max * 1000, 2)
+        }
+
+class Governors:
+    """One HostGovernor per upstream host, created on first use"""
+
+    def __init__(self, max_in_flight: int = 16, rate: float = 10, burst: int = 20):
+        self.max_in_flight = max_in_flight
+        self.rate = rate
+        self.burst = burst
+        self.hosts = {}
+
+    def get(self, host: str) -> HostGovernor:
+        governor = self.hosts.get(host)
+        if governor is None:
+            governor = self.hosts[host] = HostGovernor(self.max_in_flight, self.rate, self.burst)
+        return governor
+
+    @contextlib.asynccontextmanager
+    async def slot(self, url: str):
+        """Holds one in-flight slot on the URL's host for the duration of the block"""
+        governor = self.get(urlsplit(url).hostname)
+        await governor.acquire(request_priority.get(), shared_priority.get())
+        try:
+            yield
+        finally:
+            governor.release()
+
+    def stats(self) -> dict:
+        return {host: governor.stats() for host, governor in self.hosts.items()}
+
+governors = Governors(
+    max_in_flight=int(os.getenv("UPSTREAM_CONCURRENCY", 16)),
+    rate=float(os.getenv("UPSTREAM_RATE", 10)),
+    burst=int(os.getenv("UPSTREAM_BURST", 20))
+)
@@ -0,0 +1,98 @@
+import asyncio
+import os
+
+from .cache import bypass, matches_cache
+from .scraping import scrape_todays_matches, match_day
+
+# Fields whose change is pushed to live score subscribers
+TRACKED_FIELDS = ("status", "time_or_score", "minute")
+
+class LiveScores:
+    """
+    Pushes live score changes to every subscriber from one shared poller.
+
+    While at least one client is subscribed, a single background task polls
+    today's matches every `interval` seconds, diffs them by match_id against
+    the previous poll and puts only the changed matches on each subscriber's
+    queue. Upstream load is therefore one scrape per interval however many
+    clients are connected, and none when nobody is.
+    """
+
+    def __init__(self, poll, interval: float = 30, queue_size: int = 16):
+        self.poll = poll
+        self.interval = interval
+        self.queue_size = queue_size
+        self.subscribers = set()
+        self.matches = {}
+        self.polls = 0
+        self.errors = 0
+        self._task = None
+
+    def snapshot(self) -> list:
+        return list(self.matches.values())
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+        if not self.subscribers:
+            self.stop()
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.matches = {}
+
+    async def _run(self):
+        while self.subscribers:
+            try:
+                self._broadcast("update", self._diff(await self.poll()))
+                self.polls += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"Live score poll failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def _diff(self, matches: list) -> list:
+        changed = []
+        current = {}
+        for match in matches:
+            current[match['match_id']] = match
+            previous = self.matches.get(match['match_id'])
+            if previous is None or any(previous.get(field) != match.get(field) for field in TRACKED_FIELDS):
+                changed.append(match)
+        self.matches = current
+        return changed
+
+    def _broadcast(self, kind: str, matches: list):
+        for queue in self.subscribers:
+            try:
+                queue.put_nowait((kind, matches))
+            except asyncio.QueueFull:
+                # Subscriber fell behind: drop its backlog and resync it
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("snapshot", self.snapshot()))
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self.subscribers),
+            "polling": self._task is not None and not self._task.done(),
+            "matches": len(self.matches),
+            "polls": self.polls,
+            "errors": self.errors
+        }
+
+async def poll_todays_matches() -> list:
+    # Always download and scrape instead of reading the parsed or raw page
+    # cache, which the poll refreshes
+    bypass(matches_cache, match_day())
+    return await scrape_todays_matches()
+
+live_scores = LiveScores(poll_todays_matches, interval=float(os.getenv("LIVE_POLL_INTERVAL", 30)))
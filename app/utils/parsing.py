@@ -0,0 +1,103 @@
+import asyncio
+import functools
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# BeautifulSoup tree builders the scrapers can run on, fastest first. lxml is
+# optional; html.parser ships with Python and is always available.
+PARSER_MODULES = {
+    "lxml": "lxml",
+    "html5lib": "html5lib",
+    "html.parser": None
+}
+
+def available_parsers() -> list:
+    return [
+        parser for parser, module in PARSER_MODULES.items()
+        if module is None or importlib.util.find_spec(module) is not None
+    ]
+
+def resolve_parser(parser: str = None) -> str:
+    """
+    Returns the tree builder to use, falling back to html.parser when the
+    requested one is unknown or its package is not installed.
+    """
+    parser = parser or os.getenv("HTML_PARSER", "html.parser")
+    if parser not in available_parsers():
+        print(f"HTML parser '{parser}' is not available, using html.parser")
+        return "html.parser"
+    return parser
+
+HTML_PARSER = resolve_parser()
+PARSE_SCOPED = os.getenv("PARSE_SCOPED", "1") != "0"
+
+def scoped(*targets) -> SoupStrainer:
+    """
+    Builds a SoupStrainer that keeps only the subtrees a scraper reads.
+
+    Each target is a (tag name, css class) pair, with None as the class to
+    keep every tag of that name. Everything outside the matching tags is
+    skipped while parsing, so the tree only holds the part of the page needed.
+    """
+    def match(name, attrs):
+        classes = attrs.get("class") or ""
+        if isinstance(classes, str):
+            classes = classes.split()
+        return any(name == tag and (css_class is None or css_class in classes) for tag, css_class in targets)
+
+    return SoupStrainer(match)
+
+def make_soup(html: str, parser: str = None, parse_only: SoupStrainer = None) -> BeautifulSoup:
+    """
+    Parses html with the configured backend (HTML_PARSER) unless parser is
+    given, building only the parse_only subtrees when PARSE_SCOPED is on.
+    """
+    if not PARSE_SCOPED:
+        parse_only = None
+    return BeautifulSoup(html, parser or HTML_PARSER, parse_only=parse_only)
+
+PARSE_EXECUTOR = os.getenv("PARSE_EXECUTOR", "process")
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", 2))
+PARSE_INLINE_CHARS = int(os.getenv("PARSE_INLINE_CHARS", 64 * 1024))
+
+_executor = None
+
+def get_executor():
+    """
+    Returns the pool parse functions run in, created on first use:
+    - process: ProcessPoolExecutor, parsing never holds the event loop's GIL
+    - thread: ThreadPoolExecutor, cheaper but still competes for the GIL
+    - inline: no pool, everything parses on the event loop
+    """
+    global _executor
+    if _executor is None and PARSE_EXECUTOR != "inline":
+        if PARSE_EXECUTOR == "thread":
+            _executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+        else:
+            _executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    return _executor
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+async def parse(fn, html: str, *args):
+    """
+    Runs a parse function (html, *args) -> plain data off the event loop.
+
+    Pages shorter than PARSE_INLINE_CHARS characters are parsed inline,
+    where handing the page to a pool would cost more than the parse itself.
+    fn must be a module-level function so it can be sent to a worker
+    process.
+    """
+    executor = get_executor()
+    if executor is None or len(html) < PARSE_INLINE_CHARS:
+        return fn(html, *args)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, html, *args))
@@ -1,39 +1,94 @@
 from fastapi import APIRouter, Request, HTTPException, Depends
-from datetime import datetime, timedelta
-from collections import defaultdict
-import asyncio
+import time
 
 router = APIRouter()
 
 class RateLimiter:
-    def __init__(self):
-        self.requests = defaultdict(list)
-        self.lock = asyncio.Lock()
+    """
+    Sliding-window counter rate limiter.
+
+    Each key (route + client IP) keeps only the request count of the current and
+    previous fixed window, and the previous count is weighted by how much of it
+    still overlaps the sliding window. That makes every check O(1) in time and
+    memory per key. State is split over shards so idle keys can be evicted one
+    shard at a time without scanning every client on a single request. Checks
+    never await while touching state, so no lock is needed on the event loop.
+    """
+
+    def __init__(self, shards: int = 64, sweep_interval: float = 5):
+        self.shards = [{} for _ in range(shards)]
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.time() + sweep_interval
+        self._sweep_shard = 0
+
+    def _shard(self, key: str) -> dict:
+        return self.shards[hash(key) % len(self.shards)]
+
+    def _sweep(self, now: float):
+        """Evict keys idle for more than a full window from one shard"""
+        shard = self.shards[self._sweep_shard]
+        self._sweep_shard = (self._sweep_shard + 1) % len(self.shards)
+
+        idle = [key for key, (window, window_index, _, _) in shard.items() if int(now // window) - window_index > 1]
+        for key in idle:
+            del shard[key]
+
+    def hit(self, key: str, limit: int, window: int, now: float = None):
+        """
+        Record a request for key, returning (allowed, remaining, reset).
+        """
+        if now is None:
+            now = time.time()
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval
+            self._sweep(now)
+
+        window_index = int(now // window)
+        reset = (window_index + 1) * window
+        shard = self._shard(key)
+        entry = shard.get(key)
+
+        if entry is None or entry[0] != window:
+            current, previous = 0, 0
+        elif entry[1] == window_index:
+            current, previous = entry[2], entry[3]
+        elif entry[1] == window_index - 1:
+            current, previous = 0, entry[2]
+        else:
+            current, previous = 0, 0
+
+        overlap = 1 - (now - window_index * window) / window
+        estimated = previous * overlap + current
+
+        if estimated >= limit:
+            shard[key] = (window, window_index, current, previous)
+            return False, 0, reset
+
+        current += 1
+        shard[key] = (window, window_index, current, previous)
+        return True, max(0, limit - int(estimated) - 1), reset
 
     async def check_rate_limit(self, key: str, limit: int, window: int):
-        async with self.lock:
-            now = datetime.now()
-            window_start = now - timedelta(seconds=window)
-            
-            self.requests[key] = [t for t in self.requests[key] if t > window_start]
-            
-            if len(self.requests[key]) >= limit:
-                raise HTTPException(
-                    status_code=429,
-                    detail=f"Rate limit exceeded: {limit} requests per {window} seconds",
-                    headers={
-                        "X-RateLimit-Limit": str(limit),
-                        "X-RateLimit-Remaining": "0",
-                        "X-RateLimit-Reset": str((window_start + timedelta(seconds=window)).timestamp())
-                    }
-                )
-            
-            self.requests[key].append(now)
-            remaining = limit - len(self.requests[key])
-            return {
-                "X-RateLimit-Limit": str(limit),
-                "X-RateLimit-Remaining": str(remaining),
-                "X-RateLimit-Reset": str((window_start + timedelta(seconds=window)).timestamp())
-            }
-
-rate_limiter = RateLimiter()
\ No newline at end of file
+        allowed, remaining, reset = self.hit(key, limit, window)
+
+        if not allowed:
+            raise HTTPException(
+                status_code=429,
+                detail=f"Rate limit exceeded: {limit} requests per {window} seconds",
+                headers={
+                    "X-RateLimit-Limit": str(limit),
+                    "X-RateLimit-Remaining": "0",
+                    "X-RateLimit-Reset": str(float(reset))
+                }
+            )
+
+        return {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(float(reset))
+        }
+
+    def size(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,73 @@
+import soupsieve as sv
+
+def text(element) -> str:
+    return element.get_text(strip=True)
+
+def exists(element) -> bool:
+    return True
+
+def attr(name: str):
+    return lambda element: element[name]
+
+def labelled(rows: str, label, value, labels: dict):
+    """
+    Transform for a block of label/value rows such as "Citizenship: Spain".
+
+    For every row matching the rows selector, label(row) gives its label text
+    and value(row) its value element (rows without one are skipped). The row
+    takes the name of the first labels entry whose text occurs in its label.
+
+    Returns:
+        (name, value element) pairs in page order, without unlabelled rows
+    """
+    compiled = sv.compile(rows)
+
+    def transform(block):
+        matched = []
+        for row in compiled.select(block):
+            element = value(row)
+            if element is None:
+                continue
+            row_label = label(row)
+            for fragment, name in labels.items():
+                if fragment in row_label:
+                    matched.append((name, element))
+                    break
+        return matched
+
+    return transform
+
+class Field:
+    """
+    One value of a page schema: the element matching selector, passed through
+    transform. Single fields take the first match and are None when nothing
+    matches; many fields pass the list of every match to transform.
+    """
+
+    def __init__(self, selector: str, transform=text, many: bool = False):
+        self.selector = selector
+        self.transform = transform
+        self.many = many
+        self.compiled = sv.compile(selector)
+
+class Schema:
+    """
+    Declarative extraction plan for one page type (field -> selector -> transform).
+
+    Selectors are compiled once when the schema is declared at import, so
+    extracting a page only runs the precompiled matchers against the tree
+    instead of re-parsing every CSS selector on each call.
+    """
+
+    def __init__(self, **fields: Field):
+        self.fields = fields
+
+    def extract(self, root) -> dict:
+        values = {}
+        for name, field in self.fields.items():
+            if field.many:
+                values[name] = field.transform(field.compiled.select(root))
+            else:
+                element = field.compiled.select_one(root)
+                values[name] = field.transform(element) if element is not None else None
+        return values
@@ -1,19 +1,37 @@
 import aiohttp
-
-from bs4 import BeautifulSoup
+import asyncio
 import re
 from urllib.parse import urljoin
 
 from datetime import datetime
 
-from .cache import player_search_cache, club_search_cache, player_profile_cache, player_transfers_cache, leagues_search_cache, player_injuries_cache, player_stats_cache, club_profile_cache, club_squad_cache, club_transfers_cache, staff_search_cache, staff_profile_cache, leagues_top_scorers_cache, leagues_clubs_cache, leagues_table_cache, player_injuries_cache, leagues_transfers_overview_cache, club_fixtures_cache, country_list_cache, foreign_players_cache, player_absences_cache, player_national_cache
+from .client import fetch_page, fetch_json, NotModified
+from .governor import set_priority, BATCH
+from .search_index import player_index, club_index, staff_index
+from .parsing import make_soup, parse, scoped, SoupStrainer
+from .schemas import Schema, Field, attr, exists, labelled
+from .singleflight import single_flight
+from .cache import revalidate, club_name_cache, player_search_cache, club_search_cache, player_profile_cache, player_transfers_cache, leagues_search_cache, player_injuries_cache, player_stats_cache, club_profile_cache, club_squad_cache, club_transfers_cache, staff_search_cache, staff_profile_cache, leagues_top_scorers_cache, leagues_clubs_cache, leagues_table_cache, player_injuries_cache, leagues_transfers_overview_cache, club_fixtures_cache, country_list_cache, foreign_players_cache, player_absences_cache, player_national_cache, matches_cache
 
 BASE_URL = "https://www.transfermarkt.co.uk"
 
+CLUB_NAME_CONCURRENCY = 8
+BATCH_CONCURRENCY = 8
+SNAPSHOT_CONCURRENCY = 4
+MATCHES_RANGE_CONCURRENCY = 4
+
+# Search is typed interactively, so give up on a slow upstream sooner
+SEARCH_TIMEOUT = aiohttp.ClientTimeout(total=8, connect=3)
+
+# Most list pages only read the first table.items, so only that subtree is parsed
+ITEMS_TABLE_SCOPE = scoped(("table", "items"))
+
 headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     }
 
+@single_flight
+@revalidate(player_search_cache)
 async def fetch_transfermarkt_players(query: str):
     if query in player_search_cache:
         return player_search_cache[query]
@@ -22,16 +40,14 @@ async def fetch_transfermarkt_players(query: str):
     url = "https://www.transfermarkt.co.uk/spieler/searchSpielerDaten"
     params = {"q": query}
 
-    async with aiohttp.ClientSession(headers=headers) as session:
-        async with session.get(url, params=params) as response:
-            if response.status != 200:
-                raise Exception(f"Transfermarkt returned status {response.status}")
-            data = await response.json()
+    status, data = await fetch_json(url, params=params, headers=headers, timeout=SEARCH_TIMEOUT)
+    if status != 200:
+        raise Exception(f"Transfermarkt returned status {status}")
 
     players = []
     for entry in data:
         player_id = entry["id"]
-        soup = BeautifulSoup(entry["name"], "html.parser")
+        soup = make_soup(entry["name"])
 
         team_tag = soup.find("i")
         team_name = team_tag.get_text(strip=True) if team_tag else "Unknown"
@@ -49,11 +65,15 @@ async def fetch_transfermarkt_players(query: str):
 
         players.append({"id": player_id, "name": player_name, "team": team_name})
 
+    for player in players:
+        player_index.add(player["id"], player["name"], player, replace=True)
     if players:
         player_search_cache[query] = players
 
     return players
 
+@single_flight
+@revalidate(club_search_cache)
 async def fetch_transfermarkt_clubs(query: str):
     if query in club_search_cache:
         return club_search_cache[query]
@@ -65,11 +85,9 @@ async def fetch_transfermarkt_clubs(query: str):
         "q": query
     }
 
-    async with aiohttp.ClientSession(headers=headers) as session:
-        async with session.get(url, params=params) as response:
-            if response.status != 200:
-                raise Exception(f"Transfermarkt returned status {response.status}")
-            data = await response.json()
+    status, data = await fetch_json(url, params=params, headers=headers, timeout=SEARCH_TIMEOUT)
+    if status != 200:
+        raise Exception(f"Transfermarkt returned status {status}")
 
     clubs = []
     for entry in data:
@@ -83,6 +101,8 @@ async def fetch_transfermarkt_clubs(query: str):
             "market_value": entry.get("mw", "Unknown")
         })
 
+    for club in clubs:
+        club_index.add(club["id"], club["name"], club, replace=True)
     if clubs:
         club_search_cache[query] = clubs
 
@@ -99,17 +119,11 @@ def extract_team_id(url: str) -> str:
             return parts[verein_index + 1]
     return None
 
-async def scrape_todays_matches(date: str = None):  
-    base_url = "https://www.transfermarkt.co.uk/live/index"
-    url = f"{base_url}?datum={date}" if date else base_url
-    
-    async with aiohttp.ClientSession(headers=headers) as session:
-        async with session.get(url) as response:
-            if response.status != 200:
-                raise Exception(f"Failed to fetch data: HTTP {response.status}")
-            html = await response.text()
-    
-    soup = BeautifulSoup(html, 'html.parser')
+MATCHES_SCOPE = scoped(("div", "kategorie"), ("table", "livescore"))
+
+def parse_matches(html):
+    """Extracts matches from a livescore page"""
+    soup = make_soup(html, parse_only=MATCHES_SCOPE)
     matches = []
     
     for competition_section in soup.select('div.kategorie'):
@@ -151,182 +165,281 @@ async def scrape_todays_matches(date: str = None):
                 'minute': row.select_one('span.live-ergebnis').get_text(strip=True) if status == 'live' else None
             }
             matches.append(match)
-    
     return matches
 
-async def scrape_player_profile(player_id: str):   
-    if player_id in player_profile_cache:
-        return player_profile_cache[player_id]
+def match_day(date: str = None) -> str:
+    """Date (YYYY-MM-DD) a matches request is for, today when date is None"""
+    return date or datetime.now().strftime("%Y-%m-%d")
+
+@single_flight
+@revalidate(matches_cache, key=match_day)
+async def scrape_todays_matches(date: str = None):  
+    if match_day(date) in matches_cache:
+        return matches_cache[match_day(date)]
+
+    base_url = "https://www.transfermarkt.co.uk/live/index"
+    url = f"{base_url}?datum={date}" if date else base_url
     
-    url = f"https://www.transfermarkt.co.uk/-/profil/spieler/{player_id}"
+    status, html = await fetch_page(url)
+    if status != 200:
+        raise Exception(f"Failed to fetch data: HTTP {status}")
     
-    try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    raise Exception(f"Failed to fetch player data: HTTP {response.status}")
-                html = await response.text()
-        
-        soup = BeautifulSoup(html, 'html.parser')
-        header = soup.find('header', class_='data-header')
-        if not header:
-            raise Exception("Player profile header not found")
-
-        name_element = header.find('h1', class_='data-header__headline-wrapper')
-        shirt_number_element = header.find('span', class_='data-header__shirt-number')
-        shirt_number = shirt_number_element.get_text(strip=True) if shirt_number_element else None
-        
-        full_name = None
-        if name_element:
-            name_text = name_element.get_text(strip=False)  
-            if shirt_number:
-                name_text = name_text.replace(shirt_number, '')
-            full_name = re.sub(r'\s+', ' ', name_text).strip()
-
-        is_deceased = bool(header.find('div', class_='dataRibbonRIP'))
-
-        club_link = header.find('span', class_='data-header__club').find('a') if header.find('span', class_='data-header__club') else None
-        club_id = club_link['href'].split('/')[-1] if club_link else None
-        
-        club_logo_img = header.find('a', class_='data-header__box__club-link').find('img') if header.find('a', class_='data-header__box__club-link') else None
-        club_logo = None
-        if club_logo_img:
-            if 'srcset' in club_logo_img.attrs:
-                club_logo = club_logo_img['srcset'].split()[0]
-            elif 'src' in club_logo_img.attrs:
-                club_logo = club_logo_img['src']
-
-        market_value_div = header.find('div', class_='data-header__box--small')
-        market_value_text = market_value_div.get_text(' ', strip=True) if market_value_div else None
-        market_value = market_value_text.split('Last update:')[0].strip() if market_value_text else None
-        market_value_update_element = market_value_div.find('p', class_='data-header__last-update') if market_value_div else None
-        market_value_update = market_value_update_element.get_text(strip=True).split("Last update:")[-1].strip() if market_value_update_element else None
-
-        international_data = None
-        international_section = header.select_one('ul.data-header__items li:-soup-contains("Current international")') or \
-                               header.select_one('ul.data-header__items li:-soup-contains("Former International")')
-
-        if international_section:
-            country_link = international_section.find('a')
-            country = country_link.get_text(strip=True) if country_link else None
-            country_id = country_link['href'].split('/')[-1] if country_link else None
-            
-            caps_goals_li = international_section.find_next_sibling('li', class_='data-header__label')
-            caps = None
-            goals = None
-            
-            if caps_goals_li and "Caps/Goals" in caps_goals_li.get_text():
-                caps_goals_links = caps_goals_li.select('a.data-header__content--highlight')
-                if len(caps_goals_links) >= 2:
-                    caps = caps_goals_links[0].get_text(strip=True)
-                    goals = caps_goals_links[1].get_text(strip=True)
-            
-            international_data = {
-                'country': country,
-                'country_id': country_id,
-                'caps': caps,
-                'goals': goals
-            }
-
-        def extract_date(label):
-            label_element = header.select_one(f'span.data-header__label:-soup-contains("{label}")')
-            if label_element:
-                return label_element.find_next('span', class_='data-header__content').get_text(strip=True)
-            return None
+    matches = await parse(parse_matches, html)
+    matches_cache[match_day(date)] = matches
+    return matches
 
-        joined_date = extract_date('Joined:')
-        contract_expires = extract_date('Contract expires:')
-
-        birth_date_element = header.find('span', itemprop='birthDate')
-        birth_date = None
-        age = None
-        if birth_date_element:
-            birth_date_text = birth_date_element.get_text(strip=True)
-            if '(' in birth_date_text:
-                birth_date = birth_date_text.split('(')[0].strip()
-                age = birth_date_text.split('(')[1].replace(')', '').strip()
-            else:
-                birth_date = birth_date_text
+async def scrape_matches_range(dates, concurrency: int = MATCHES_RANGE_CONCURRENCY):
+    """
+    Scrapes the matches of several dates at once.
+    
+    Dates already in matches_cache are returned without a request and the
+    rest are scraped concurrently with at most `concurrency` in flight. A
+    failing date does not fail the others.
+    
+    Args:
+        dates: Dates in YYYY-MM-DD format
+        
+    Returns:
+        (results, errors) - dictionaries mapping each date to its matches
+        or to the error message
+    """
+    results = {}
+    errors = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def scrape(date):
+        async with semaphore:
+            try:
+                results[date] = await scrape_todays_matches(date)
+            except Exception as e:
+                errors[date] = str(e)
+
+    await asyncio.gather(*(scrape(date) for date in dates))
+    return {date: results[date] for date in dates if date in results}, errors
+
+PLAYER_PROFILE_SCOPE = scoped(("header", "data-header"))
+
+def player_club_id(club):
+    club_link = club.find('a')
+    return club_link['href'].split('/')[-1] if club_link else None
+
+def player_club_logo(club_box_link):
+    club_logo_img = club_box_link.find('img')
+    if club_logo_img:
+        if 'srcset' in club_logo_img.attrs:
+            return club_logo_img['srcset'].split()[0]
+        elif 'src' in club_logo_img.attrs:
+            return club_logo_img['src']
+    return None
 
-        position_element = header.select_one('li:-soup-contains("Position:") span.data-header__content')
-        position = position_element.get_text(strip=True) if position_element else None
+def player_market_value(market_value_div):
+    market_value_text = market_value_div.get_text(' ', strip=True)
+    return market_value_text.split('Last update:')[0].strip() if market_value_text else None
 
-        height_element = header.select_one('li:-soup-contains("Height:") span[itemprop="height"]')
-        height = height_element.get_text(strip=True) if height_element else None
+def player_market_value_update(market_value_div):
+    market_value_update_element = market_value_div.find('p', class_='data-header__last-update')
+    return market_value_update_element.get_text(strip=True).split("Last update:")[-1].strip() if market_value_update_element else None
 
-        club_name = header.find('span', class_='data-header__club').get_text(strip=True) if header.find('span', class_='data-header__club') else None
-        is_retired = True if club_name and club_name.lower() == "retired" else None
+def header_content_after(label_element):
+    return label_element.find_next('span', class_='data-header__content').get_text(strip=True)
 
-        agent_link = header.find('a', href=lambda x: x and 'beraterfirma' in x)
-        agent_info = {
-            "name": agent_link.get_text(strip=True).replace(".", "").strip() if agent_link else None,
-            "id": agent_link['href'].split('/')[-1] if agent_link else None
+def player_trophies(trophy_elements):
+    trophies = []
+    for trophy in trophy_elements:
+        img = trophy.find('img')
+        count = trophy.find('span', class_='data-header__success-number')
+        if img and count:
+            image_url = img.get('data-src') if 'data:image/gif' in img.get('src', '') else img.get('src')
+            
+            trophies.append({
+                'name': img.get('title', '').replace(' winner', ''),
+                'count': count.get_text(strip=True),
+                'image': image_url.replace("header", "medium") if image_url and not image_url.startswith('data:image') else None
+            })
+    return trophies
+
+PLAYER_PROFILE_SCHEMA = Schema(
+    name=Field('h1.data-header__headline-wrapper', lambda element: element.get_text(strip=False)),
+    shirt_number=Field('span.data-header__shirt-number'),
+    is_deceased=Field('div.dataRibbonRIP', exists),
+    club_id=Field('span.data-header__club', player_club_id),
+    club_name=Field('span.data-header__club'),
+    club_logo=Field('a.data-header__box__club-link', player_club_logo),
+    league=Field('span.data-header__league'),
+    market_value=Field('div.data-header__box--small', player_market_value),
+    market_value_update=Field('div.data-header__box--small', player_market_value_update),
+    current_international=Field('ul.data-header__items li:-soup-contains("Current international")', lambda element: element),
+    former_international=Field('ul.data-header__items li:-soup-contains("Former International")', lambda element: element),
+    joined_date=Field('span.data-header__label:-soup-contains("Joined:")', header_content_after),
+    contract_expires=Field('span.data-header__label:-soup-contains("Contract expires:")', header_content_after),
+    birth_date=Field('span[itemprop="birthDate"]'),
+    birth_place=Field('span[itemprop="birthPlace"]'),
+    nationality=Field('span[itemprop="nationality"]'),
+    position=Field('li:-soup-contains("Position:") span.data-header__content'),
+    height=Field('li:-soup-contains("Height:") span[itemprop="height"]'),
+    profile_image=Field('img.data-header__profile-image', lambda element: element['src'].replace("header", "medium")),
+    agent=Field('a[href*="beraterfirma"]', lambda element: element),
+    trophies=Field('.data-header__success-data', player_trophies, many=True)
+)
+
+def parse_player_profile(html, player_id):
+    """Extracts a player profile from the player header"""
+    soup = make_soup(html, parse_only=PLAYER_PROFILE_SCOPE)
+    header = soup.find('header', class_='data-header')
+    if not header:
+        raise Exception("Player profile header not found")
+
+    fields = PLAYER_PROFILE_SCHEMA.extract(header)
+    shirt_number = fields["shirt_number"]
+    
+    full_name = None
+    if fields["name"] is not None:
+        name_text = fields["name"]
+        if shirt_number:
+            name_text = name_text.replace(shirt_number, '')
+        full_name = re.sub(r'\s+', ' ', name_text).strip()
+
+    club_name = fields["club_name"]
+    is_retired = True if club_name and club_name.lower() == "retired" else None
+
+    international_data = None
+    international_section = fields["current_international"] or fields["former_international"]
+
+    if international_section:
+        country_link = international_section.find('a')
+        country = country_link.get_text(strip=True) if country_link else None
+        country_id = country_link['href'].split('/')[-1] if country_link else None
+        
+        caps_goals_li = international_section.find_next_sibling('li', class_='data-header__label')
+        caps = None
+        goals = None
+        
+        if caps_goals_li and "Caps/Goals" in caps_goals_li.get_text():
+            caps_goals_links = caps_goals_li.select('a.data-header__content--highlight')
+            if len(caps_goals_links) >= 2:
+                caps = caps_goals_links[0].get_text(strip=True)
+                goals = caps_goals_links[1].get_text(strip=True)
+        
+        international_data = {
+            'country': country,
+            'country_id': country_id,
+            'caps': caps,
+            'goals': goals
         }
 
-        trophies = []
-        for trophy in header.select('.data-header__success-data'):
-            img = trophy.find('img')
-            count = trophy.find('span', class_='data-header__success-number')
-            if img and count:
-                image_url = img.get('data-src') if 'data:image/gif' in img.get('src', '') else img.get('src')
-                
-                trophies.append({
-                    'name': img.get('title', '').replace(' winner', ''),
-                    'count': count.get_text(strip=True),
-                    'image': image_url.replace("header", "medium") if image_url and not image_url.startswith('data:image') else None
-                })
+    birth_date = None
+    age = None
+    if fields["birth_date"] is not None:
+        birth_date_text = fields["birth_date"]
+        if '(' in birth_date_text:
+            birth_date = birth_date_text.split('(')[0].strip()
+            age = birth_date_text.split('(')[1].replace(')', '').strip()
+        else:
+            birth_date = birth_date_text
+
+    agent_link = fields["agent"]
+    agent_info = {
+        "name": agent_link.get_text(strip=True).replace(".", "").strip() if agent_link else None,
+        "id": agent_link['href'].split('/')[-1] if agent_link else None
+    }
 
-        result = {
-            "id": int(player_id),
-            "name": full_name,
-            "shirt_number": shirt_number.replace("#", "") if shirt_number else None,
-            "club": {
-                "name": club_name,
-                "id": club_id,
-                "logo": club_logo,
-                "league": header.find('span', class_='data-header__league').get_text(strip=True) if header.find('span', class_='data-header__league') else None
-            },
-            "market_value": market_value,
-            "market_value_last_update": market_value_update,
-            "profile_image": header.find('img', class_='data-header__profile-image')['src'].replace("header", "medium") if header.find('img', class_='data-header__profile-image') else None,
-            "position": position,
-            "age": age,
-            "birth_date": birth_date,
-            "birth_place": header.find('span', itemprop='birthPlace').get_text(strip=True) if header.find('span', itemprop='birthPlace') else None,
-            "nationality": header.find('span', itemprop='nationality').get_text(strip=True) if header.find('span', itemprop='nationality') else None,
-            "height": height,
-            "agent": agent_info,
-            "joined_date": joined_date,
-            "contract_expires": contract_expires,
-            "international": international_data,
-            "trophies": trophies,
-            "status": "deceased" if is_deceased else "retired" if is_retired else "active"
-        }
+    result = {
+        "id": int(player_id),
+        "name": full_name,
+        "shirt_number": shirt_number.replace("#", "") if shirt_number else None,
+        "club": {
+            "name": club_name,
+            "id": fields["club_id"],
+            "logo": fields["club_logo"],
+            "league": fields["league"]
+        },
+        "market_value": fields["market_value"],
+        "market_value_last_update": fields["market_value_update"],
+        "profile_image": fields["profile_image"],
+        "position": fields["position"],
+        "age": age,
+        "birth_date": birth_date,
+        "birth_place": fields["birth_place"],
+        "nationality": fields["nationality"],
+        "height": fields["height"],
+        "agent": agent_info,
+        "joined_date": fields["joined_date"],
+        "contract_expires": fields["contract_expires"],
+        "international": international_data,
+        "trophies": fields["trophies"],
+        "status": "deceased" if fields["is_deceased"] else "retired" if is_retired else "active"
+    }
+    return {"result": result}
 
-        player_profile_cache[player_id] = {"result": result}
-        return {"result": result}
+@single_flight
+@revalidate(player_profile_cache)
+async def scrape_player_profile(player_id: str):   
+    if player_id in player_profile_cache:
+        return player_profile_cache[player_id]
+    
+    url = f"https://www.transfermarkt.co.uk/-/profil/spieler/{player_id}"
+    
+    try:
+        status, html = await fetch_page(url)
+        if status != 200:
+            raise Exception(f"Failed to fetch player data: HTTP {status}")
+        
+        profile = await parse(parse_player_profile, html, player_id)
+        player = profile["result"]
+        player_index.add(player_id, player["name"], {"id": player_id, "name": player["name"], "team": player["club"]["name"]})
+        player_profile_cache[player_id] = profile
+        return profile
 
     except Exception as e:
         raise Exception(f"Error scraping player {player_id}: {str(e)}")
         raise
 
-async def scrape_player_stats(player_id: str, season: str = None):    
-
-    if (player_id, season) in player_stats_cache:
-        return player_stats_cache[(player_id, season)]
-    
-    if season:
-        url = f"https://www.transfermarkt.co.uk/-/leistungsdaten/spieler/{player_id}/plus/0?saison={season}"
-    else:
-        url = f"https://www.transfermarkt.co.uk/-/leistungsdaten/spieler/{player_id}"
+async def scrape_player_profiles(player_ids, concurrency: int = BATCH_CONCURRENCY):
+    """
+    Scrapes many player profiles at once.
     
-    async with aiohttp.ClientSession(headers=headers) as session:
-        async with session.get(url) as resp:
-            if resp.status != 200:
-                raise Exception(f"Failed to fetch player stats: HTTP {resp.status}")
-            html = await resp.text()
+    IDs are deduplicated, profiles already in player_profile_cache are
+    returned without a request (a stale one also starts its background
+    refresh), and the misses are scraped concurrently with at most
+    `concurrency` in flight. A failing ID does not fail the others.
     
-    soup = BeautifulSoup(html, 'html.parser')
+    Args:
+        player_ids: Iterable of Transfermarkt player IDs
+        
+    Returns:
+        (results, errors) - dictionaries mapping each player ID to its
+        profile or to the error message
+    """
+    results = {}
+    errors = {}
+    missing = []
+    player_ids = list(dict.fromkeys(player_ids))
+    for player_id in player_ids:
+        if player_id not in player_profile_cache:
+            missing.append(player_id)
+            continue
+        # Through the scraper rather than the cache, so stale profiles get revalidated
+        try:
+            results[player_id] = await scrape_player_profile(player_id)
+        except Exception as e:
+            errors[player_id] = str(e)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def scrape(player_id):
+        set_priority(BATCH)
+        async with semaphore:
+            try:
+                results[player_id] = await scrape_player_profile(player_id)
+            except Exception as e:
+                errors[player_id] = str(e)
+
+    await asyncio.gather(*(scrape(player_id) for player_id in missing))
+    return {player_id: results[player_id] for player_id in player_ids if player_id in results}, errors
+
+def parse_player_stats(html, player_id, season):
+    """Extracts season or all-time stats from a player performance page"""
+    soup = make_soup(html, parse_only=ITEMS_TABLE_SCOPE)
     
     stats_table = soup.find('table', class_='items')
     if not stats_table:
@@ -381,10 +494,105 @@ async def scrape_player_stats(player_id: str, season: str = None):
                     "red_cards": cells[7].get_text(strip=True) if cells[7].get_text(strip=True) else "0",
                     "minutes_played": cells[8].get_text(strip=True) if cells[8].get_text(strip=True) else "0"
                 })
+    return stats_data
+
+@single_flight
+@revalidate(player_stats_cache)
+async def scrape_player_stats(player_id: str, season: str = None):    
+
+    if (player_id, season) in player_stats_cache:
+        return player_stats_cache[(player_id, season)]
+    
+    if season:
+        url = f"https://www.transfermarkt.co.uk/-/leistungsdaten/spieler/{player_id}/plus/0?saison={season}"
+    else:
+        url = f"https://www.transfermarkt.co.uk/-/leistungsdaten/spieler/{player_id}"
+    
+    status, html = await fetch_page(url)
+    if status != 200:
+        raise Exception(f"Failed to fetch player stats: HTTP {status}")
     
+    stats_data = await parse(parse_player_stats, html, player_id, season)
     player_stats_cache[(player_id, season)] = stats_data
     return stats_data
 
+club_page_extractors = {}
+
+def club_page_extractor(name: str, cache):
+    """
+    Registers an extractor for the club start page (/-/startseite/verein/{id}).
+    The extractor receives the parsed page and the club ID, and its result is
+    stored in cache under the club ID.
+    """
+    def decorator(fn):
+        club_page_extractors[name] = (cache, fn)
+        return fn
+    return decorator
+
+CLUB_PAGE_SCOPE = scoped(("header", "data-header"), ("table", "items"))
+
+def parse_club_page(html, club_id: str):
+    """Runs every registered club page extractor over one parsed document"""
+    soup = make_soup(html, parse_only=CLUB_PAGE_SCOPE)
+
+    results = {}
+    errors = {}
+    for name, (cache, extractor) in club_page_extractors.items():
+        try:
+            results[name] = extractor(soup, club_id)
+        except Exception as e:
+            errors[name] = e
+
+    return results, errors
+
+@single_flight
+async def load_club_page(club_id: str):
+    """
+    Downloads and parses a club start page once and runs every registered
+    extractor over the same document, filling all of their caches in one pass.
+    
+    Args:
+        club_id: Transfermarkt club ID (e.g., '11' for Arsenal)
+        
+    Returns:
+        (results, errors) - dictionaries keyed by extractor name
+    """
+    club_id = str(club_id)
+    url = f"https://www.transfermarkt.co.uk/-/startseite/verein/{club_id}"
+
+    status, html = await fetch_page(url)
+    if status != 200:
+        raise Exception(f"HTTP Error {status}")
+
+    results, errors = await parse(parse_club_page, html, club_id)
+    for name, result in results.items():
+        cache = club_page_extractors[name][0]
+        cache[club_id] = result
+
+    club_name = results.get("name")
+    club_index.add(club_id, club_name, {"id": club_id, "name": club_name, "market_value": "Unknown"})
+    for player in results.get("squad", []):
+        player_index.add(player["player_id"], player["player_name"], {"id": player["player_id"], "name": player["player_name"], "team": club_name or "Unknown"})
+
+    return results, errors
+
+async def get_club_page_result(club_id: str, name: str):
+    """Returns one extractor's result for a club page, raising its error if it failed"""
+    results, errors = await load_club_page(club_id)
+    if name in errors:
+        raise errors[name]
+    return results[name]
+
+@club_page_extractor("name", club_name_cache)
+def extract_club_name(soup, club_id: str) -> str:
+    header = soup.find('h1', class_='data-header__headline-wrapper')
+    if not header:
+        raise Exception("Team page not found or invalid structure")
+    
+    return header.get_text(strip=True)
+
+@single_flight
+@revalidate(club_name_cache, key=lambda team_id: str(team_id))
 async def get_team_name(team_id: str) -> str:
     """
     Fetches and returns the official team name from Transfermarkt.
@@ -395,27 +603,48 @@ async def get_team_name(team_id: str) -> str:
     Returns:
         The team name (e.g., "Arsenal FC")
     """
-    url = f"https://www.transfermarkt.co.uk/-/startseite/verein/{team_id}"
+    team_id = str(team_id)
+    if team_id in club_name_cache:
+        return club_name_cache[team_id]
 
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    raise Exception(f"HTTP Error {response.status}")
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                header = soup.find('h1', class_='data-header__headline-wrapper')
-                if not header:
-                    raise Exception("Team page not found or invalid structure")
-                
-                team_name = header.get_text(strip=True)
-                return team_name
-    
+        return await get_club_page_result(team_id, "name")
     except Exception as e:
         raise Exception(f"Failed to fetch team name: {str(e)}")
+
+async def resolve_club_names(club_ids, concurrency: int = CLUB_NAME_CONCURRENCY) -> dict:
+    """
+    Resolves many club IDs to names at once.
+    
+    IDs are deduplicated, names already in club_name_cache are returned
+    without a request, and the misses are fetched concurrently with at most
+    `concurrency` club pages in flight.
+    
+    Args:
+        club_ids: Iterable of Transfermarkt club IDs (str or int)
+        
+    Returns:
+        Dictionary mapping each club ID (as str) to its name
+    """
+    names = {}
+    missing = []
+    for club_id in dict.fromkeys(str(club_id) for club_id in club_ids if club_id is not None):
+        if club_id in club_name_cache:
+            names[club_id] = club_name_cache[club_id]
+        else:
+            missing.append(club_id)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def resolve(club_id):
+        async with semaphore:
+            names[club_id] = await get_team_name(club_id)
+
+    await asyncio.gather(*(resolve(club_id) for club_id in missing))
+    return names
     
+@single_flight
+@revalidate(player_transfers_cache)
 async def get_player_transfers_request(player_id: str):
     """
     Fetches a player's transfer history from Transfermarkt API and enriches with team names.
@@ -436,69 +665,175 @@ async def get_player_transfers_request(player_id: str):
     api_url = f"https://tmapi-alpha.transfermarkt.technology/transfer/history/player/{player_id}"
     
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(api_url) as response:
-                if response.status != 200:
-                    return []
-                transfer_data = await response.json()
-                
-                if not transfer_data.get('success'):
-                    raise Exception("Transfer API returned unsuccessful response")
-                
-                transfers = []
-                for transfer in transfer_data['data']['history']['terminated']:
-                    source_club_name = await get_team_name(transfer['transferSource']['clubId'])
-                    dest_club_name = await get_team_name(transfer['transferDestination']['clubId'])
-                    
-                    transfers.append({
-                        "transfer_id": transfer['id'],
-                        "date": transfer['details']['date'],
-                        "season": transfer['details']['season']['display'],
-                        "age": transfer['details']['age'],
-                        "market_value": transfer['details']['marketValue']['compact'],
-                        "fee": transfer['details']['fee']['compact'] if transfer['details'].get('fee') else None,
-                        "from": {
-                            "club_id": transfer['transferSource']['clubId'],
-                            "club_name": source_club_name,
-                            "country_id": transfer['transferSource']['countryId'],
-                            "competition_id": transfer['transferSource']['competitionId']
-                        },
-                        "to": {
-                            "club_id": transfer['transferDestination']['clubId'],
-                            "club_name": dest_club_name,
-                            "country_id": transfer['transferDestination']['countryId'],
-                            "competition_id": transfer['transferDestination']['competitionId']
-                        },
-                        "contract_until": transfer['details']['contractUntilDate'],
-                        "type": transfer['typeDetails']['type'],
-                        "relative_url": transfer['relativeUrl']
-                    })
-                
-                current_club = None
-                if transfer_data['data'].get('currentClub'):
-                    current_club_id = transfer_data['data']['currentClub']['clubId']
-                    current_club_name = await get_team_name(current_club_id)
-                    current_club = {
-                        "club_id": current_club_id,
-                        "club_name": current_club_name,
-                        "country_id": transfer_data['data']['currentClub']['countryId'],
-                        "competition_id": transfer_data['data']['currentClub']['competitionId'],
-                        "joined_date": transfer_data['data']['currentClub']['joined'],
-                        "contract_until": transfer_data['data']['currentClub']['contractUntil']
-                    }
-                
-                returnData = {
-                    "player_id": player_id,
-                    "transfers": transfers,
-                    "current_club": current_club
-                }
+        status, transfer_data = await fetch_json(api_url)
+        if status != 200:
+            return []
+        
+        if not transfer_data.get('success'):
+            raise Exception("Transfer API returned unsuccessful response")
+        
+        history = transfer_data['data']['history']['terminated']
+        current_club_data = transfer_data['data'].get('currentClub')
+
+        club_ids = [club_id for transfer in history for club_id in (transfer['transferSource']['clubId'], transfer['transferDestination']['clubId'])]
+        if current_club_data:
+            club_ids.append(current_club_data['clubId'])
+        club_names = await resolve_club_names(club_ids)
+
+        transfers = []
+        for transfer in history:
+            source_club_name = club_names.get(str(transfer['transferSource']['clubId']))
+            dest_club_name = club_names.get(str(transfer['transferDestination']['clubId']))
+            
+            transfers.append({
+                "transfer_id": transfer['id'],
+                "date": transfer['details']['date'],
+                "season": transfer['details']['season']['display'],
+                "age": transfer['details']['age'],
+                "market_value": transfer['details']['marketValue']['compact'],
+                "fee": transfer['details']['fee']['compact'] if transfer['details'].get('fee') else None,
+                "from": {
+                    "club_id": transfer['transferSource']['clubId'],
+                    "club_name": source_club_name,
+                    "country_id": transfer['transferSource']['countryId'],
+                    "competition_id": transfer['transferSource']['competitionId']
+                },
+                "to": {
+                    "club_id": transfer['transferDestination']['clubId'],
+                    "club_name": dest_club_name,
+                    "country_id": transfer['transferDestination']['countryId'],
+                    "competition_id": transfer['transferDestination']['competitionId']
+                },
+                "contract_until": transfer['details']['contractUntilDate'],
+                "type": transfer['typeDetails']['type'],
+                "relative_url": transfer['relativeUrl']
+            })
+        
+        current_club = None
+        if current_club_data:
+            current_club_id = current_club_data['clubId']
+            current_club_name = club_names.get(str(current_club_id))
+            current_club = {
+                "club_id": current_club_id,
+                "club_name": current_club_name,
+                "country_id": transfer_data['data']['currentClub']['countryId'],
+                "competition_id": transfer_data['data']['currentClub']['competitionId'],
+                "joined_date": transfer_data['data']['currentClub']['joined'],
+                "contract_until": transfer_data['data']['currentClub']['contractUntil']
+            }
+        
+        returnData = {
+            "player_id": player_id,
+            "transfers": transfers,
+            "current_club": current_club
+        }
 
-                player_transfers_cache[player_id] = returnData
-                return returnData
-                
+        player_transfers_cache[player_id] = returnData
+        return returnData
+        
     except Exception as e:
         raise Exception(f"Failed to fetch transfer history: {str(e)}" )
 
+def club_trophies(trophy_elements):
+    trophies = []
+    for trophy in trophy_elements:
+        img = trophy.find('img')
+        count = trophy.find('span', class_='data-header__success-number')
+        if img and count:
+            trophies.append({
+                'title': img.get('title', ''),
+                'count': count.get_text(strip=True),
+                'image': img.get('data-src', '')
+            })
+    return trophies
+
+def club_league(club):
+    league_link = club.find('a')
+    if not league_link:
+        return {}
+    return {
+        'name': league_link.get_text(strip=True),
+        'id': league_link['href'].split('/')[-1]
+    }
+
+def link_text(element):
+    link = element.find('a')
+    return link.get_text(strip=True) if link else None
+
+def link_title(element):
+    link = element.find('a')
+    return link.get('title') if link else None
+
+def table_position(element):
+    position = element.find('span', class_='tabellenplatz')
+    return position.get_text(strip=True) if position else None
+
+def club_market_value(market_value_a):
+    market_value_text = market_value_a.get_text(' ', strip=True)
+    market_value_p = market_value_a.find('p', class_='data-header__last-update')
+    return {
+        'value': market_value_text.replace(market_value_p.get_text(strip=True), '').strip() if market_value_p else market_value_text
+    }
+
+def club_detail(label: str) -> str:
+    return f'div.data-header__details li.data-header__label:-soup-contains("{label}")'
+
+CLUB_PROFILE_SCHEMA = Schema(
+    name=Field('h1.data-header__headline-wrapper'),
+    logo=Field('img[src*="wappen/head"]', attr('src')),
+    trophies=Field('.data-header__success-data', club_trophies, many=True),
+    league=Field('span.data-header__club', club_league),
+    squad_size=Field(club_detail("Squad size:"), header_content_after),
+    average_age=Field(club_detail("Average age:"), header_content_after),
+    foreigners_count=Field(club_detail("Foreigners:"), link_text),
+    foreigners_percentage=Field(club_detail("Foreigners:"), table_position),
+    national_players=Field(club_detail("National team players:"), link_text),
+    stadium_name=Field(club_detail("Stadium:"), link_title),
+    stadium_capacity=Field(club_detail("Stadium:"), table_position),
+    transfer_record=Field(club_detail("Current transfer record:"), link_text),
+    market_value=Field('a.data-header__market-value-wrapper', club_market_value)
+)
+
+@club_page_extractor("profile", club_profile_cache)
+def extract_club_profile(soup, club_id: str) -> dict:
+    header = soup.find('header', class_='data-header')
+    if not header:
+        raise Exception("Club profile header not found")
+
+    fields = CLUB_PROFILE_SCHEMA.extract(header)
+    if fields["league"] is None:
+        raise Exception("Club league not found")
+
+    returnData = {
+        'club_id': club_id,
+        'name': fields["name"],
+        'logo': fields["logo"],
+        'trophies': fields["trophies"],
+        'league': fields["league"],
+        'squad_info': {
+            'size': fields["squad_size"],
+            'average_age': fields["average_age"],
+            'foreigners': {
+                'count': fields["foreigners_count"],
+                'percentage': fields["foreigners_percentage"]
+            },
+            'national_players': fields["national_players"]
+        },
+        'stadium': {
+            'name': fields["stadium_name"],
+            'capacity': fields["stadium_capacity"]
+        },
+        'transfer_record': fields["transfer_record"],
+        'market_value': fields["market_value"] or {
+            'value': None,
+            'last_update': None
+        }
+    }
+
+    return returnData
+
+@single_flight
+@revalidate(club_profile_cache)
 async def scrape_club_profile(club_id: str):
     """
     Scrapes detailed club profile information from Transfermarkt.
@@ -512,119 +847,61 @@ async def scrape_club_profile(club_id: str):
     if club_id in club_profile_cache:
         return club_profile_cache[club_id]
     
-    url = f"https://www.transfermarkt.co.uk/-/startseite/verein/{club_id}"
-    
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    raise Exception(f"HTTP Error {response.status}")
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                header = soup.find('header', class_='data-header')
-                if not header:
-                    raise Exception("Club profile header not found")
-                
-                name_element = header.find('h1', class_='data-header__headline-wrapper')
-                club_name = name_element.get_text(strip=True) if name_element else None
-                
-                logo_element = header.find('img', src=lambda x: x and 'wappen/head' in x)
-                club_logo = logo_element['src'] if logo_element else None
-                
-                trophies = []
-                for trophy in header.select('.data-header__success-data'):
-                    img = trophy.find('img')
-                    count = trophy.find('span', class_='data-header__success-number')
-                    if img and count:
-                        trophies.append({
-                            'title': img.get('title', ''),
-                            'count': count.get_text(strip=True),
-                            'image': img.get('data-src', '')
-                        })
-                
-                league_info = {}
-                league_link = header.find('span', class_='data-header__club').find('a')
-                if league_link:
-                    league_info = {
-                        'name': league_link.get_text(strip=True),
-                        'id': league_link['href'].split('/')[-1]
-                    }
-                
-                info_boxes = header.find_all('div', class_='data-header__details')
-                
-                squad_size = None
-                avg_age = None
-                foreigners_count = None
-                foreigners_percentage = None
-                national_players = None
-                stadium_name = None
-                stadium_capacity = None
-                transfer_record = None
-                
-                for box in info_boxes:
-                    items = box.find_all('li', class_='data-header__label')
-                    for item in items:
-                        text = item.get_text(strip=True)
-                        
-                        if 'Squad size:' in text:
-                            squad_size = item.find_next('span', class_='data-header__content').get_text(strip=True)
-                        elif 'Average age:' in text:
-                            avg_age = item.find_next('span', class_='data-header__content').get_text(strip=True)
-                        elif 'Foreigners:' in text:
-                            foreigners_count = item.find('a').get_text(strip=True) if item.find('a') else None
-                            foreigners_percentage = item.find('span', class_='tabellenplatz').get_text(strip=True) if item.find('span', class_='tabellenplatz') else None
-                        elif 'National team players:' in text:
-                            national_players = item.find('a').get_text(strip=True) if item.find('a') else None
-                        elif 'Stadium:' in text:
-                            stadium_name = item.find('a').get('title') if item.find('a') else None
-                            stadium_capacity = item.find('span', class_='tabellenplatz').get_text(strip=True) if item.find('span', class_='tabellenplatz') else None
-                        elif 'Current transfer record:' in text:
-                            transfer_record = item.find('a').get_text(strip=True) if item.find('a') else None
-                
-                market_value_a = header.find('a', class_='data-header__market-value-wrapper')
-                if market_value_a:
-                    market_value_text = market_value_a.get_text(' ', strip=True)
-                    market_value_p = market_value_a.find('p', class_='data-header__last-update')
-                    market_value = {
-                        'value': market_value_text.replace(market_value_p.get_text(strip=True), '').strip() if market_value_p else market_value_text
-                    }
-                else:
-                    market_value = {
-                        'value': None,
-                        'last_update': None
-                    }
-                
-                returnData = {
-                    'club_id': club_id,
-                    'name': club_name,
-                    'logo': club_logo,
-                    'trophies': trophies,
-                    'league': league_info,
-                    'squad_info': {
-                        'size': squad_size,
-                        'average_age': avg_age,
-                        'foreigners': {
-                            'count': foreigners_count,
-                            'percentage': foreigners_percentage
-                        },
-                        'national_players': national_players
-                    },
-                    'stadium': {
-                        'name': stadium_name,
-                        'capacity': stadium_capacity
-                    },
-                    'transfer_record': transfer_record,
-                    'market_value': market_value
-                }
-
-                club_profile_cache[club_id] = returnData
-                return returnData
-    
+        return await get_club_page_result(club_id, "profile")
     except Exception as e:
         raise Exception(f"Failed to scrape club profile: {str(e)}")
     
+@club_page_extractor("squad", club_squad_cache)
+def extract_club_squad(soup, club_id: str) -> list:
+    players = []
+    
+    for row in soup.select("table.items tr")[1:]: 
+        cols = row.find_all("td")
+        if len(cols) < 8: 
+            continue
+
+        try:
+            number = cols[0].text.strip()
+            
+            image_url = cols[2].select_one("img")
+            image_url = image_url["data-src"] if image_url and "data-src" in image_url.attrs else None
+            
+            player_link_tag = cols[3].select_one("a")
+            player_name = player_link_tag.text.strip() if player_link_tag else None
+            player_id = player_link_tag["href"].split("/")[-1] if player_link_tag else None
+            
+            position = cols[4].text.strip()
+            
+            dob = cols[5].text.strip()
+            
+            nationality_img = cols[6].select_one("img")
+            nationality = nationality_img["title"] if nationality_img else None
+            
+            market_value = cols[7].text.strip()
+            
+            injury_tag = player_link_tag.select_one("span.verletzt-table.icons_sprite") if player_link_tag else None
+            injury_status = injury_tag["title"] if injury_tag else None
+
+            players.append({
+                "player_id": player_id,
+                "player_name": player_name,
+                "position": position,
+                "number": number,
+                "dob": dob,
+                "market_value": market_value,
+                "nationality": nationality,
+                "image": image_url,
+                "injury_status": injury_status
+            })
+        except Exception as e:
+            print(f"Error processing player row: {e}")
+            continue
+
+    return players
+
+@single_flight
+@revalidate(club_squad_cache)
 async def scrape_club_squad(club_id: str):
     """
     Scrapes squad information from Transfermarkt club page using the correct URL structure
@@ -639,66 +916,31 @@ async def scrape_club_squad(club_id: str):
     if club_id in club_squad_cache:
         return club_squad_cache[club_id]
     
-    url = f"https://www.transfermarkt.co.uk/-/startseite/verein/{club_id}"
-    
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    raise Exception(f"HTTP Error {response.status}")
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, "html.parser")
-                players = []
-                
-                for row in soup.select("table.items tr")[1:]: 
-                    cols = row.find_all("td")
-                    if len(cols) < 8: 
-                        continue
-
-                    try:
-                        number = cols[0].text.strip()
-                        
-                        image_url = cols[2].select_one("img")
-                        image_url = image_url["data-src"] if image_url and "data-src" in image_url.attrs else None
-                        
-                        player_link_tag = cols[3].select_one("a")
-                        player_name = player_link_tag.text.strip() if player_link_tag else None
-                        player_id = player_link_tag["href"].split("/")[-1] if player_link_tag else None
-                        
-                        position = cols[4].text.strip()
-                        
-                        dob = cols[5].text.strip()
-                        
-                        nationality_img = cols[6].select_one("img")
-                        nationality = nationality_img["title"] if nationality_img else None
-                        
-                        market_value = cols[7].text.strip()
-                        
-                        injury_tag = player_link_tag.select_one("span.verletzt-table.icons_sprite") if player_link_tag else None
-                        injury_status = injury_tag["title"] if injury_tag else None
-
-                        players.append({
-                            "player_id": player_id,
-                            "player_name": player_name,
-                            "position": position,
-                            "number": number,
-                            "dob": dob,
-                            "market_value": market_value,
-                            "nationality": nationality,
-                            "image": image_url,
-                            "injury_status": injury_status
-                        })
-                    except Exception as e:
-                        print(f"Error processing player row: {e}")
-                        continue
-                
-                club_squad_cache[club_id] = players
-                return players
-    
+        return await get_club_page_result(club_id, "squad")
     except Exception as e:
         raise Exception(f"Failed to scrape squad: {str(e)}")
 
+HEADED_TABLES_SCOPE = scoped(("h2", None), ("table", None))
+
+def parse_team_transfers(html):
+    """Extracts arrivals and departures from a club transfers page"""
+    soup = make_soup(html, parse_only=HEADED_TABLES_SCOPE)
+    transfers = []
+
+    for table_type in ["Arrivals", "Departures"]:
+        table_header = soup.find("h2", string=lambda text: text and table_type in text)
+        if table_header:
+            table = table_header.find_next("table")
+            if table:
+                for row in table.select("tbody > tr"):
+                    transfer = process_transfer_row(row, table_type.lower()[:-1])
+                    if transfer:
+                        transfers.append(transfer)
+    return transfers
+
+@single_flight
+@revalidate(club_transfers_cache)
 async def scrape_team_transfers(club_id: int, season: int):
     """Scrape transfers for a specific team and season"""
     if (club_id, season) in club_transfers_cache:
@@ -707,33 +949,19 @@ async def scrape_team_transfers(club_id: int, season: int):
     transfers_url = f"https://www.transfermarkt.co.uk/-/transfers/verein/{club_id}/saison_id/{season}"
     
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(transfers_url) as response:
-                if response.status != 200:
-                    print(f"Failed to fetch: HTTP {response.status}")
-                    return []
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, "html.parser")
-                transfers = []
-
-                for table_type in ["Arrivals", "Departures"]:
-                    table_header = soup.find("h2", string=lambda text: text and table_type in text)
-                    if table_header:
-                        table = table_header.find_next("table")
-                        if table:
-                            for row in table.select("tbody > tr"):
-                                transfer = await process_transfer_row(row, table_type.lower()[:-1])
-                                if transfer:
-                                    transfers.append(transfer)
-
-                club_transfers_cache[(club_id, season)] = transfers
-                return transfers
+        status, html = await fetch_page(transfers_url)
+        if status != 200:
+            print(f"Failed to fetch: HTTP {status}")
+            return []
+        
+        transfers = await parse(parse_team_transfers, html)
+        club_transfers_cache[(club_id, season)] = transfers
+        return transfers
     except Exception as e:
         raise Exception(f"Error scraping transfers: {str(e)}")
         return []
 
-async def process_transfer_row(row, transfer_type):
+def process_transfer_row(row, transfer_type):
     """Process a single transfer row with improved error handling"""
     try:
         player_name_elem = row.select_one("td.hauptlink a[title]")
@@ -791,6 +1019,107 @@ async def process_transfer_row(row, transfer_type):
         raise Exception(f"Error processing transfer row: {str(e)}")
         return None
     
+def parse_latest_transfers(content):
+    """Extracts rows from the latest transfers statistics table"""
+    soup = make_soup(content, parse_only=ITEMS_TABLE_SCOPE)
+    table = soup.find('table', {'class': 'items'}) 
+    transfers = []
+
+    if table:
+        rows = table.find_all('tr')[1:]  
+
+        for row in rows:
+            columns = row.find_all('td')
+            if len(columns) < 15:  
+                continue
+
+            player_info = {
+                'name': '',
+                'position': '',
+                'age': '',
+                'nationality': '',
+                'current_club': '',
+                'current_club_league': '',
+                'current_club_nationality': '',
+                'previous_club': '',
+                'previous_club_league': '',
+                'previous_club_nationality': '',
+                'transfer_fee': '',
+                'player_logo': '',
+                'date': int(datetime.now().timestamp()),
+                'player_id': ''
+            }
+
+            player_info_table = columns[0].find('table', {'class': 'inline-table'})
+            if player_info_table:
+                info_rows = player_info_table.find_all('tr')
+                if len(info_rows) > 1:
+                    name_td = info_rows[0].find('td', {'class': 'hauptlink'})
+                    if name_td:
+                        player_info['name'] = name_td.get_text(strip=True)
+                        # Extract player ID from href
+                        name_link = name_td.find('a')
+                        if name_link and 'href' in name_link.attrs:
+                            href = name_link['href']
+                            player_info['player_id'] = href.split('/')[-1]
+
+                    position_td = info_rows[1].find('td')
+                    if position_td:
+                        player_info['position'] = position_td.get_text(strip=True)
+
+                    player_logo_img = info_rows[0].find('img')
+                    if player_logo_img:
+                        player_info['player_logo'] = player_logo_img.get('data-src', '')
+
+            player_info['age'] = columns[4].get_text(strip=True)
+
+            nationality_img = columns[5].find('img')
+            if nationality_img:
+                player_info['nationality'] = nationality_img.get('title', 'N/A')
+
+            current_club_table = columns[10].find('table', {'class': 'inline-table'})
+            if current_club_table:
+                current_club_rows = current_club_table.find_all('tr')
+                if len(current_club_rows) > 1:
+                    current_club_name_td = current_club_rows[0].find('td', {'class': 'hauptlink'})
+                    if current_club_name_td:
+                        player_info['current_club'] = current_club_name_td.get_text(strip=True)
+                    current_club_country = current_club_rows[1].find('img', {'class': 'flaggenrahmen'})
+                    if current_club_country:
+                        player_info['current_club_nationality'] = current_club_country.get('title', '').strip()
+
+                    current_club_league_td = current_club_rows[1].find('td')
+                    if current_club_league_td:
+                        player_info['current_club_league'] = current_club_league_td.get_text(strip=True)
+
+            previous_club_table = columns[6].find('table', {'class': 'inline-table'})
+            if previous_club_table:
+                previous_club_rows = previous_club_table.find_all('tr')
+                if len(previous_club_rows) > 1:
+                    previous_club_name_td = previous_club_rows[0].find('td', {'class': 'hauptlink'})
+                    if previous_club_name_td:
+                        player_info['previous_club'] = previous_club_name_td.get_text(strip=True)
+
+                    previous_club_league_td = previous_club_rows[1].find('td')
+                    if previous_club_league_td:
+                        player_info['previous_club_league'] = previous_club_league_td.get_text(strip=True)
+
+                    previous_club_nationality_img = previous_club_rows[1].find('img', {'class': 'flaggenrahmen'})
+                    if previous_club_nationality_img:
+                        player_info['previous_club_nationality'] = previous_club_nationality_img.get('title', '').strip()
+
+            transfer_fee_a = columns[14].find('a')
+            if transfer_fee_a:
+                player_info['transfer_fee'] = transfer_fee_a.get_text(strip=True)
+            else:
+                transfer_fee_span = columns[14].find('span')
+                if transfer_fee_span:
+                    player_info['transfer_fee'] = transfer_fee_span.get_text(strip=True)
+
+            transfers.append(player_info)
+    return transfers
+
+@single_flight
 async def scrape_transfers():
     headers = {
         "User-Agent": (
@@ -802,110 +1131,51 @@ async def scrape_transfers():
     }
     url = "https://www.transfermarkt.co.uk/transfers/neuestetransfers/statistik/plus/?plus=0&galerie=0&wettbewerb_id=alle&land_id=&selectedOptionInternalType=nothingSelected&minMarktwert=500.000&maxMarktwert=500.000.000&minAbloese=0&maxAbloese=500.000.000&top10=Top+10+leagues"
     
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers) as response:
-            response.raise_for_status()  
-            content = await response.text()  
-
-            soup = BeautifulSoup(content, 'html.parser')
-            table = soup.find('table', {'class': 'items'}) 
-            transfers = []
+    status, content = await fetch_page(url, headers=headers)
+    if status != 200:
+        raise Exception(f"HTTP Error {status}")
+
+    transfers = await parse(parse_latest_transfers, content)
+    for transfer in transfers:
+        player_index.add(transfer["player_id"], transfer["name"], {"id": transfer["player_id"], "name": transfer["name"], "team": transfer["current_club"] or "Unknown"})
+    return transfers
+    
+def parse_leagues_search(html):
+    """Extracts competitions from a quick search results page"""
+    soup = make_soup(html, parse_only=ITEMS_TABLE_SCOPE)
+    leagues = []
+    
+    for table in soup.find_all('table', class_='items'):
+        headers = [th.get_text(strip=True) for th in table.find_all('th')]
+        if 'Competition' in headers and 'Country' in headers:
+            for row in table.find_all('tr', class_=['odd', 'even']):
+                cols = row.find_all('td')
+                if len(cols) >= 8:
+                    league_link = cols[1].find('a', href=True)
+                    league_url = league_link['href'] if league_link else None
+                    league_code = None
+                    
+                    if league_url:
+                        parts = league_url.split('/')
+                        if len(parts) >= 5 and parts[-2] == 'wettbewerb':
+                            league_code = parts[-1]
+                    
+                    leagues.append({
+                        'name': league_link['title'] if league_link else None,
+                        'code': league_code,  # Added league code
+                        'country': cols[2].find('img')['title'] if cols[2].find('img') else None,
+                        'clubs': cols[3].get_text(strip=True),
+                        'players': cols[4].get_text(strip=True),
+                        'total_value': cols[5].get_text(strip=True),
+                        'mean_value': cols[6].get_text(strip=True),
+                        'continent': cols[7].get_text(strip=True),
+                        'logo': cols[0].find('img')['src'] if cols[0].find('img') else None  # Added league logo
+                    })
+            break
+    return leagues
 
-            if table:
-                rows = table.find_all('tr')[1:]  
-
-                for row in rows:
-                    columns = row.find_all('td')
-                    if len(columns) < 15:  
-                        continue
-
-                    player_info = {
-                        'name': '',
-                        'position': '',
-                        'age': '',
-                        'nationality': '',
-                        'current_club': '',
-                        'current_club_league': '',
-                        'current_club_nationality': '',
-                        'previous_club': '',
-                        'previous_club_league': '',
-                        'previous_club_nationality': '',
-                        'transfer_fee': '',
-                        'player_logo': '',
-                        'date': int(datetime.now().timestamp()),
-                        'player_id': ''
-                    }
-
-                    player_info_table = columns[0].find('table', {'class': 'inline-table'})
-                    if player_info_table:
-                        info_rows = player_info_table.find_all('tr')
-                        if len(info_rows) > 1:
-                            name_td = info_rows[0].find('td', {'class': 'hauptlink'})
-                            if name_td:
-                                player_info['name'] = name_td.get_text(strip=True)
-                                # Extract player ID from href
-                                name_link = name_td.find('a')
-                                if name_link and 'href' in name_link.attrs:
-                                    href = name_link['href']
-                                    player_info['player_id'] = href.split('/')[-1]
-
-                            position_td = info_rows[1].find('td')
-                            if position_td:
-                                player_info['position'] = position_td.get_text(strip=True)
-
-                            player_logo_img = info_rows[0].find('img')
-                            if player_logo_img:
-                                player_info['player_logo'] = player_logo_img.get('data-src', '')
-
-                    player_info['age'] = columns[4].get_text(strip=True)
-
-                    nationality_img = columns[5].find('img')
-                    if nationality_img:
-                        player_info['nationality'] = nationality_img.get('title', 'N/A')
-
-                    current_club_table = columns[10].find('table', {'class': 'inline-table'})
-                    if current_club_table:
-                        current_club_rows = current_club_table.find_all('tr')
-                        if len(current_club_rows) > 1:
-                            current_club_name_td = current_club_rows[0].find('td', {'class': 'hauptlink'})
-                            if current_club_name_td:
-                                player_info['current_club'] = current_club_name_td.get_text(strip=True)
-                            current_club_country = current_club_rows[1].find('img', {'class': 'flaggenrahmen'})
-                            if current_club_country:
-                                player_info['current_club_nationality'] = current_club_country.get('title', '').strip()
-
-                            current_club_league_td = current_club_rows[1].find('td')
-                            if current_club_league_td:
-                                player_info['current_club_league'] = current_club_league_td.get_text(strip=True)
-
-                    previous_club_table = columns[6].find('table', {'class': 'inline-table'})
-                    if previous_club_table:
-                        previous_club_rows = previous_club_table.find_all('tr')
-                        if len(previous_club_rows) > 1:
-                            previous_club_name_td = previous_club_rows[0].find('td', {'class': 'hauptlink'})
-                            if previous_club_name_td:
-                                player_info['previous_club'] = previous_club_name_td.get_text(strip=True)
-
-                            previous_club_league_td = previous_club_rows[1].find('td')
-                            if previous_club_league_td:
-                                player_info['previous_club_league'] = previous_club_league_td.get_text(strip=True)
-
-                            previous_club_nationality_img = previous_club_rows[1].find('img', {'class': 'flaggenrahmen'})
-                            if previous_club_nationality_img:
-                                player_info['previous_club_nationality'] = previous_club_nationality_img.get('title', '').strip()
-
-                    transfer_fee_a = columns[14].find('a')
-                    if transfer_fee_a:
-                        player_info['transfer_fee'] = transfer_fee_a.get_text(strip=True)
-                    else:
-                        transfer_fee_span = columns[14].find('span')
-                        if transfer_fee_span:
-                            player_info['transfer_fee'] = transfer_fee_span.get_text(strip=True)
-
-                    transfers.append(player_info)
-
-            return transfers
-    
+@single_flight
+@revalidate(leagues_search_cache)
 async def scrape_transfermarkt_leagues(search_query: str):
     if search_query in leagues_search_cache:
         return leagues_search_cache[search_query]
@@ -913,110 +1183,100 @@ async def scrape_transfermarkt_leagues(search_query: str):
     url = f"https://www.transfermarkt.co.uk/schnellsuche/ergebnis/schnellsuche?query={search_query.replace(' ', '+')}"
     
     try:
-        async with aiohttp.ClientSession(headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }) as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                html = await response.text()
-                
-                soup = BeautifulSoup(html, 'html.parser')
-                leagues = []
-                
-                for table in soup.find_all('table', class_='items'):
-                    headers = [th.get_text(strip=True) for th in table.find_all('th')]
-                    if 'Competition' in headers and 'Country' in headers:
-                        for row in table.find_all('tr', class_=['odd', 'even']):
-                            cols = row.find_all('td')
-                            if len(cols) >= 8:
-                                league_link = cols[1].find('a', href=True)
-                                league_url = league_link['href'] if league_link else None
-                                league_code = None
-                                
-                                if league_url:
-                                    parts = league_url.split('/')
-                                    if len(parts) >= 5 and parts[-2] == 'wettbewerb':
-                                        league_code = parts[-1]
-                                
-                                leagues.append({
-                                    'name': league_link['title'] if league_link else None,
-                                    'code': league_code,  # Added league code
-                                    'country': cols[2].find('img')['title'] if cols[2].find('img') else None,
-                                    'clubs': cols[3].get_text(strip=True),
-                                    'players': cols[4].get_text(strip=True),
-                                    'total_value': cols[5].get_text(strip=True),
-                                    'mean_value': cols[6].get_text(strip=True),
-                                    'continent': cols[7].get_text(strip=True),
-                                    'logo': cols[0].find('img')['src'] if cols[0].find('img') else None  # Added league logo
-                                })
-                        break
-
-                leagues_search_cache[search_query] = leagues
-                return leagues
-                
+        status, html = await fetch_page(url)
+        if status != 200:
+            raise Exception(f"HTTP Error {status}")
+        
+        leagues = await parse(parse_leagues_search, html)
+        leagues_search_cache[search_query] = leagues
+        return leagues
+            
     except Exception as e:
         raise Exception(f"Error scraping leagues: {e}")
         return []
 
+def parse_player_injuries(html):
+    """Extracts injury history, or None when the page has no injury table"""
+    soup = make_soup(html, parse_only=ITEMS_TABLE_SCOPE)
+    table = soup.find('table', {'class': 'items'})
+    
+    if not table:
+        return None
+    
+    injuries = []
+    for row in table.find_all('tr', class_=['odd', 'even']):
+        cols = row.find_all('td')
+        if len(cols) < 6:
+            continue
+        
+        team_elements = cols[5].find_all('a')
+        teams = []
+        for team in team_elements:
+            if 'verein' in team['href']:
+                teams.append({
+                    'name': team.get('title'),
+                    'type': 'club' if 'verein' in team['href'] else 'national team',
+                    'image': team.find('img')['src'] if team.find('img') else None
+                })
+        
+        games_missed = cols[5].get_text(strip=True)
+        if cols[5].find('span'):
+            games_missed = cols[5].find('span').get_text(strip=True)
+        
+        injuries.append({
+            'season': cols[0].get_text(strip=True),
+            'injury': cols[1].get_text(strip=True),
+            'from_date': cols[2].get_text(strip=True),
+            'until_date': cols[3].get_text(strip=True),
+            'duration': cols[4].get_text(strip=True),
+            'games_missed': games_missed,
+            'teams_affected': teams
+        })
+    return injuries
+
+@single_flight
+@revalidate(player_injuries_cache)
 async def fetch_player_injuries(player_id: str):
     """
     Fetches injury history for a player by their Transfermarkt ID
     Returns a list of dictionaries containing injury data
     """
     if player_id in player_injuries_cache:
-        return player_injuries_cache[player_injuries_cache]
+        return player_injuries_cache[player_id]
     
     url = f"{BASE_URL}/-/verletzungen/spieler/{player_id}"
     
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                html = await response.text()
-                
-                soup = BeautifulSoup(html, 'html.parser')
-                table = soup.find('table', {'class': 'items'})
-                
-                if not table:
-                    return []
-                
-                injuries = []
-                for row in table.find_all('tr', class_=['odd', 'even']):
-                    cols = row.find_all('td')
-                    if len(cols) < 6:
-                        continue
-                    
-                    team_elements = cols[5].find_all('a')
-                    teams = []
-                    for team in team_elements:
-                        if 'verein' in team['href']:
-                            teams.append({
-                                'name': team.get('title'),
-                                'type': 'club' if 'verein' in team['href'] else 'national team',
-                                'image': team.find('img')['src'] if team.find('img') else None
-                            })
-                    
-                    games_missed = cols[5].get_text(strip=True)
-                    if cols[5].find('span'):
-                        games_missed = cols[5].find('span').get_text(strip=True)
-                    
-                    injuries.append({
-                        'season': cols[0].get_text(strip=True),
-                        'injury': cols[1].get_text(strip=True),
-                        'from_date': cols[2].get_text(strip=True),
-                        'until_date': cols[3].get_text(strip=True),
-                        'duration': cols[4].get_text(strip=True),
-                        'games_missed': games_missed,
-                        'teams_affected': teams
-                    })
-
-                player_injuries_cache[player_id] = injuries
-                return injuries
-                
+        status, html = await fetch_page(url)
+        if status != 200:
+            raise Exception(f"HTTP Error {status}")
+        
+        injuries = await parse(parse_player_injuries, html)
+        if injuries is None:
+            return []
+        player_injuries_cache[player_id] = injuries
+        return injuries
+            
     except Exception as e:
         raise Exception(f"Error fetching injuries for player {player_id}: {e}")
         return []
     
+def parse_staff_search(html):
+    """Extracts staff rows from a quick search results page"""
+    soup = make_soup(html, parse_only=ITEMS_TABLE_SCOPE)
+    staff_list = []
+    
+    for table in soup.find_all('table', class_='items'):
+        staff_headers = [th.get_text(strip=True) for th in table.find_all('th')]
+        if 'Name' in staff_headers and 'Club' in staff_headers and 'Contract until' in staff_headers:
+            for row in table.find_all('tr', class_=['odd', 'even']):
+                staff_data = extract_staff_data(row)
+                if staff_data:
+                    staff_list.append(staff_data)
+    return staff_list
+
+@single_flight
+@revalidate(staff_search_cache)
 async def search_club_staff(query: str):
     """
     Search for club staff (managers, coaches) on Transfermarkt
@@ -1041,25 +1301,16 @@ async def search_club_staff(query: str):
     url = f"{BASE_URL}/schnellsuche/ergebnis/schnellsuche?query={query.replace(' ', '+')}"
     
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                html = await response.text()
-                
-                soup = BeautifulSoup(html, 'html.parser')
-                staff_list = []
-                
-                for table in soup.find_all('table', class_='items'):
-                    staff_headers = [th.get_text(strip=True) for th in table.find_all('th')]
-                    if 'Name' in staff_headers and 'Club' in staff_headers and 'Contract until' in staff_headers:
-                        for row in table.find_all('tr', class_=['odd', 'even']):
-                            staff_data = extract_staff_data(row)
-                            if staff_data:
-                                staff_list.append(staff_data)
-
-                staff_search_cache[query] = staff_list
-                return staff_list
-                
+        status, html = await fetch_page(url)
+        if status != 200:
+            raise Exception(f"HTTP Error {status}")
+        
+        staff_list = await parse(parse_staff_search, html)
+        for staff in staff_list:
+            staff_index.add(staff["id"], staff["name"], staff, replace=True)
+        staff_search_cache[query] = staff_list
+        return staff_list
+            
     except Exception as e:
         raise Exception(f"Error searching for staff: {e}")
         return []
@@ -1109,10 +1360,117 @@ def extract_staff_data(row):
         raise Exception(f"Error extracting staff data: {e}")
         return None
 
-async def get_staff_profile_scraping(staff_id: str):
-    """
-    Get detailed profile information for a staff member (manager/coach)
-    
+STAFF_PROFILE_SCOPE = scoped(("div", "data-header__info-box"), ("div", "spielerdaten"), ("div", "data-header__club-info"))
+
+def header_label(item):
+    return item.get_text(strip=True).split(':')[0].strip()
+
+def details_key(row):
+    th = row.find('th')
+    return th.get_text(strip=True).split(':')[0].strip().lower().replace(' ', '_') if th else ''
+
+def staff_club(club_info):
+    club_link = club_info.find('a')
+    if not club_link:
+        return {}
+    club = {
+        'name': club_link.get('title'),
+        'url': urljoin(BASE_URL, club_link['href'])
+    }
+    club_img = club_link.find('img')
+    if club_img:
+        club['logo'] = club_img['src']
+    return club
+
+STAFF_PROFILE_SCHEMA = Schema(
+    header=Field('div.data-header__info-box', labelled(
+        'li.data-header__label',
+        header_label,
+        lambda item: item.find('span', class_='data-header__content'),
+        {
+            'Date of birth': 'date_of_birth',
+            'Citizenship': 'citizenship',
+            'Im Amt seit': 'appointed',
+            'Vertrag bis': 'contract_expires',
+            'Avg. term': 'avg_term',
+            'Preferred formation': 'preferred_formation'
+        }
+    )),
+    details=Field('div.spielerdaten table.auflistung', labelled(
+        'tr',
+        details_key,
+        lambda row: row.find('td') if row.find('th') else None,
+        {
+            'name_in_home_country': 'full_name',
+            'place_of_birth': 'place_of_birth',
+            'coaching_licence': 'licence',
+            'agent': 'agent'
+        }
+    )),
+    current_club=Field('div.data-header__club-info', staff_club)
+)
+
+def parse_staff_profile(html, url):
+    """Extracts a staff member profile from their profile page"""
+    soup = make_soup(html, parse_only=STAFF_PROFILE_SCOPE)
+    fields = STAFF_PROFILE_SCHEMA.extract(soup)
+
+    profile_data = {
+        'personal_info': {},
+        'coaching_info': {},
+        'current_club': {},
+        'agent': None
+    }
+    personal_info = profile_data['personal_info']
+
+    for name, content in fields["header"] or []:
+        content_text = content.get_text(strip=True)
+        if name == 'date_of_birth':
+            dob, age = content_text.split('(')
+            personal_info['date_of_birth'] = dob.strip()
+            personal_info['age'] = age.replace(')', '').strip()
+        elif name == 'citizenship':
+            personal_info['citizenship'] = content_text
+            flag = content.find('img')
+            if flag:
+                personal_info['citizenship_flag'] = flag['src']
+        else:
+            profile_data['coaching_info'][name] = content_text
+
+    for name, td in fields["details"] or []:
+        value = td.get_text(strip=True)
+        if name == 'place_of_birth':
+            personal_info['place_of_birth'] = value.split('  ')[0].strip()
+            flag = td.find('img')
+            if flag:
+                personal_info['birth_country_flag'] = flag['src']
+        elif name == 'agent':
+            agent_link = td.find('a')
+            if agent_link:
+                profile_data['agent'] = {
+                    'name': agent_link.get_text(strip=True),
+                    'url': urljoin(BASE_URL, agent_link['href'])
+                }
+        elif name == 'licence':
+            profile_data['coaching_info']['licence'] = value
+        else:
+            personal_info[name] = value
+
+    if fields["current_club"] is not None:
+        profile_data['current_club'] = fields["current_club"]
+
+    if not profile_data['agent']:
+        del profile_data['agent']
+
+    profile_data['profile_url'] = url
+    return profile_data
+
+@single_flight
+@revalidate(staff_profile_cache)
+async def get_staff_profile_scraping(staff_id: str):
+    """
+    Get detailed profile information for a staff member (manager/coach)
+    
     Args:
         staff_id: The Transfermarkt ID of the staff member (e.g. '47620' for Mikel Arteta)
     
@@ -1125,98 +1483,74 @@ async def get_staff_profile_scraping(staff_id: str):
     url = f"{BASE_URL}/-/profil/trainer/{staff_id}"
     
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                profile_data = {
-                    'personal_info': {},
-                    'coaching_info': {},
-                    'current_club': {},
-                    'agent': None
-                }
-                
-                info_box = soup.find('div', class_='data-header__info-box')
-                if info_box:
-                    for item in info_box.find_all('li', class_='data-header__label'):
-                        label = item.get_text(strip=True).split(':')[0].strip()
-                        content = item.find('span', class_='data-header__content')
-                        if not content:
-                            continue
-                            
-                        content_text = content.get_text(strip=True)
-                        
-                        if 'Date of birth' in label:
-                            dob, age = content_text.split('(')
-                            profile_data['personal_info']['date_of_birth'] = dob.strip()
-                            profile_data['personal_info']['age'] = age.replace(')', '').strip()
-                        elif 'Citizenship' in label:
-                            profile_data['personal_info']['citizenship'] = content_text
-                            flag = content.find('img')
-                            if flag:
-                                profile_data['personal_info']['citizenship_flag'] = flag['src']
-                        elif 'Im Amt seit' in label:
-                            profile_data['coaching_info']['appointed'] = content_text
-                        elif 'Vertrag bis' in label:
-                            profile_data['coaching_info']['contract_expires'] = content_text
-                        elif 'Avg. term' in label:
-                            profile_data['coaching_info']['avg_term'] = content_text
-                        elif 'Preferred formation' in label:
-                            profile_data['coaching_info']['preferred_formation'] = content_text
-                
-                spielerdaten = soup.find('div', class_='spielerdaten')
-                if spielerdaten:
-                    table = spielerdaten.find('table', class_='auflistung')
-                    if table:
-                        for row in table.find_all('tr'):
-                            th = row.find('th')
-                            td = row.find('td')
-                            if not th or not td:
-                                continue
-                                
-                            key = th.get_text(strip=True).split(':')[0].strip().lower().replace(' ', '_')
-                            value = td.get_text(strip=True)
-                            
-                            if 'name_in_home_country' in key:
-                                profile_data['personal_info']['full_name'] = value
-                            elif 'place_of_birth' in key:
-                                profile_data['personal_info']['place_of_birth'] = value.split('  ')[0].strip()
-                                flag = td.find('img')
-                                if flag:
-                                    profile_data['personal_info']['birth_country_flag'] = flag['src']
-                            elif 'coaching_licence' in key:
-                                profile_data['coaching_info']['licence'] = value
-                            elif 'agent' in key:
-                                agent_link = td.find('a')
-                                if agent_link:
-                                    profile_data['agent'] = {
-                                        'name': agent_link.get_text(strip=True),
-                                        'url': urljoin(BASE_URL, agent_link['href'])
-                                    }
-                
-                current_club = soup.find('div', class_='data-header__club-info')
-                if current_club:
-                    club_link = current_club.find('a')
-                    if club_link:
-                        profile_data['current_club']['name'] = club_link.get('title')
-                        profile_data['current_club']['url'] = urljoin(BASE_URL, club_link['href'])
-                        club_img = club_link.find('img')
-                        if club_img:
-                            profile_data['current_club']['logo'] = club_img['src']
-                
-                if not profile_data['agent']:
-                    del profile_data['agent']
-                
-                profile_data['profile_url'] = url
-                staff_profile_cache[staff_id] = profile_data
-                return profile_data
-                
+        status, html = await fetch_page(url)
+        if status != 200:
+            raise Exception(f"HTTP Error {status}")
+        profile_data = await parse(parse_staff_profile, html, url)
+        staff_profile_cache[staff_id] = profile_data
+        return profile_data
+            
     except Exception as e:
         raise Exception(f"Error fetching staff profile {staff_id}: {e}")
         return None
 
+def parse_league_top_scorers(html):
+    """Extracts top scorers, or None when the page has no scorers table"""
+    soup = make_soup(html, parse_only=ITEMS_TABLE_SCOPE)
+    
+    scorers = []
+    table = soup.find('table', {'class': 'items'})
+    
+    if not table:
+        return None
+    
+    for row in table.find_all('tr', class_=['odd', 'even']):
+        cols = row.find_all('td')
+        
+        rank = cols[0].get_text(strip=True)
+        
+        player_table = cols[1].find('table', class_='inline-table')
+        if not player_table:
+            continue
+            
+        player_link = player_table.find('a', href=True)
+        player_name = player_link.get('title') if player_link else None
+        player_url = urljoin(BASE_URL, player_link['href']) if player_link else None
+        position = player_table.find_all('tr')[1].get_text(strip=True) if len(player_table.find_all('tr')) > 1 else None
+        
+        flags = cols[5].find_all('img', class_='flaggenrahmen')
+        nationality = [flag['title'] for flag in flags if flag.has_attr('title')]
+        
+        age = cols[6].get_text(strip=True)
+        
+        club_link = cols[7].find('a')
+        club = club_link.get('title') if club_link else None
+        club_logo = club_link.find('img')['src'] if club_link and club_link.find('img') else None
+        
+        appearances = cols[8].get_text(strip=True)
+        
+        goals = cols[9].get_text(strip=True)
+        
+        photo_img = cols[1].find('img', class_='bilderrahmen-fixed')
+        photo_url = photo_img.get('data-src') or photo_img.get('src') if photo_img else None
+        
+        scorers.append({
+            'rank': rank,
+            'name': player_name,
+            'position': position,
+            'nationality': nationality,
+            'age': age,
+            'club': club,
+            'club_logo': club_logo,
+            'appearances': appearances,
+            'goals': goals,
+            'player_url': player_url,
+            'photo_url': photo_url
+        })
+    return scorers
+
+@single_flight
+@revalidate(leagues_top_scorers_cache)
 async def get_league_top_scorers(league_code: str, season: str):
     """
     Get top scorers for a specific league and season
@@ -1234,69 +1568,56 @@ async def get_league_top_scorers(league_code: str, season: str):
     url = f"{BASE_URL}/-/torschuetzenliste/wettbewerb/{league_code}/plus/?saison_id={season}"
     
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                scorers = []
-                table = soup.find('table', {'class': 'items'})
-                
-                if not table:
-                    return []
-                
-                for row in table.find_all('tr', class_=['odd', 'even']):
-                    cols = row.find_all('td')
-                    
-                    rank = cols[0].get_text(strip=True)
-                    
-                    player_table = cols[1].find('table', class_='inline-table')
-                    if not player_table:
-                        continue
-                        
-                    player_link = player_table.find('a', href=True)
-                    player_name = player_link.get('title') if player_link else None
-                    player_url = urljoin(BASE_URL, player_link['href']) if player_link else None
-                    position = player_table.find_all('tr')[1].get_text(strip=True) if len(player_table.find_all('tr')) > 1 else None
-                    
-                    flags = cols[5].find_all('img', class_='flaggenrahmen')
-                    nationality = [flag['title'] for flag in flags if flag.has_attr('title')]
-                    
-                    age = cols[6].get_text(strip=True)
-                    
-                    club_link = cols[7].find('a')
-                    club = club_link.get('title') if club_link else None
-                    club_logo = club_link.find('img')['src'] if club_link and club_link.find('img') else None
-                    
-                    appearances = cols[8].get_text(strip=True)
-                    
-                    goals = cols[9].get_text(strip=True)
-                    
-                    photo_img = cols[1].find('img', class_='bilderrahmen-fixed')
-                    photo_url = photo_img.get('data-src') or photo_img.get('src') if photo_img else None
-                    
-                    scorers.append({
-                        'rank': rank,
-                        'name': player_name,
-                        'position': position,
-                        'nationality': nationality,
-                        'age': age,
-                        'club': club,
-                        'club_logo': club_logo,
-                        'appearances': appearances,
-                        'goals': goals,
-                        'player_url': player_url,
-                        'photo_url': photo_url
-                    })
-                
-                leagues_top_scorers_cache[(league_code, season)] = scorers
-                return scorers
-                
+        status, html = await fetch_page(url)
+        if status != 200:
+            raise Exception(f"HTTP Error {status}")
+        scorers = await parse(parse_league_top_scorers, html)
+        if scorers is None:
+            return []
+        leagues_top_scorers_cache[(league_code, season)] = scorers
+        return scorers
+            
     except Exception as e:
         raise Exception(f"Error fetching top scorers for {league_code} season {season}: {e}")
         return []
     
+def parse_league_clubs(html):
+    """Extracts clubs from a league overview, or None when the page has no clubs table"""
+    soup = make_soup(html, parse_only=ITEMS_TABLE_SCOPE)
+    clubs = []
+    table = soup.find('table', {'class': 'items'})
+    
+    if not table:
+        return None
+    
+    for row in table.find_all('tr', class_=['odd', 'even']):
+        cols = row.find_all('td')
+        if len(cols) < 7:  
+            continue
+        
+        logo_link = cols[0].find('a')
+        logo = logo_link.find('img')['src'] if logo_link and logo_link.find('img') else None
+        
+        name_link = cols[1].find('a')
+        name = name_link.get('title') if name_link else None
+        club_url = urljoin(BASE_URL, name_link['href']) if name_link else None
+        
+        clubs.append({
+            'rank': len(clubs) + 1,  
+            'club_id': club_url.split("/")[-3] if club_url else None,
+            'name': name,
+            'logo': logo,
+            'squad_size': cols[2].get_text(strip=True),
+            'avg_age': cols[3].get_text(strip=True),
+            'foreigners': cols[4].get_text(strip=True),
+            'avg_market_value': cols[5].get_text(strip=True),
+            'total_market_value': cols[6].get_text(strip=True),
+            'club_url': club_url
+        })
+    return clubs
+
+@single_flight
+@revalidate(leagues_clubs_cache)
 async def get_league_clubs_request(league_code: str):
     """
     Get league overview data including club statistics
@@ -1322,49 +1643,120 @@ async def get_league_clubs_request(league_code: str):
     url = f"{BASE_URL}/-/startseite/wettbewerb/{league_code}"
     
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                html = await response.text()
-                
-                soup = BeautifulSoup(html, 'html.parser')
-                clubs = []
-                table = soup.find('table', {'class': 'items'})
-                
-                if not table:
-                    return []
-                
-                for row in table.find_all('tr', class_=['odd', 'even']):
-                    cols = row.find_all('td')
-                    if len(cols) < 7:  
-                        continue
-                    
-                    logo_link = cols[0].find('a')
-                    logo = logo_link.find('img')['src'] if logo_link and logo_link.find('img') else None
-                    
-                    name_link = cols[1].find('a')
-                    name = name_link.get('title') if name_link else None
-                    club_url = urljoin(BASE_URL, name_link['href']) if name_link else None
-                    
-                    clubs.append({
-                        'rank': len(clubs) + 1,  
-                        'club_id': club_url.split("/")[-3] if club_url else None,
-                        'name': name,
-                        'logo': logo,
-                        'squad_size': cols[2].get_text(strip=True),
-                        'avg_age': cols[3].get_text(strip=True),
-                        'foreigners': cols[4].get_text(strip=True),
-                        'avg_market_value': cols[5].get_text(strip=True),
-                        'total_market_value': cols[6].get_text(strip=True),
-                        'club_url': club_url
-                    })
-                leagues_clubs_cache[league_code] = clubs
-                return clubs
-                
+        status, html = await fetch_page(url)
+        if status != 200:
+            raise Exception(f"HTTP Error {status}")
+        
+        clubs = await parse(parse_league_clubs, html)
+        if clubs is None:
+            return []
+        for club in clubs:
+            club_index.add(club["club_id"], club["name"], {"id": club["club_id"], "name": club["name"], "market_value": club["total_market_value"]})
+        leagues_clubs_cache[league_code] = clubs
+        return clubs
+            
     except Exception as e:
         raise Exception(f"Error fetching league overview for {league_code}: {e}")
         return []
     
+async def stream_league_squads(clubs, concurrency: int = SNAPSHOT_CONCURRENCY):
+    """
+    Scrapes the squad of every club in a league, yielding each club as soon
+    as its squad is ready.
+    
+    Squads go through scrape_club_squad, so cached clubs are yielded at once
+    and at most `concurrency` club pages are fetched at a time. A failing
+    club is yielded with its error instead of stopping the stream.
+    
+    Args:
+        clubs: Clubs as returned by get_league_clubs_request
+        
+    Yields:
+        Dictionary with club_id, name, squad, cache_hit and error
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def scrape(club):
+        set_priority(BATCH)
+        club_id = club['club_id']
+        cache_hit = club_id in club_squad_cache
+        async with semaphore:
+            try:
+                squad = await scrape_club_squad(club_id)
+                return {'club_id': club_id, 'name': club['name'], 'squad': squad, 'cache_hit': cache_hit, 'error': None}
+            except Exception as e:
+                return {'club_id': club_id, 'name': club['name'], 'squad': None, 'cache_hit': False, 'error': str(e)}
+
+    tasks = [asyncio.ensure_future(scrape(club)) for club in clubs if club['club_id']]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        # Stop the remaining fetches if the client went away mid-stream
+        for task in tasks:
+            task.cancel()
+
+def parse_league_table(html):
+    """Extracts league standings, or None when the page has no table"""
+    soup = make_soup(html, parse_only=ITEMS_TABLE_SCOPE)
+    
+    table = []
+    
+    table_element = soup.find('table', class_='items')
+    if not table_element:
+        return None
+    
+    rows = table_element.find_all('tr', class_=lambda x: x != 'zeile-unterschiedliche-tabellenfarben')
+    
+    for row in rows:
+        if not row.find('td', class_='rechts'):
+            continue
+        
+        pos = row.find('td', class_='rechts').get_text(strip=True).split()[0]
+        
+        team_link = row.find('td', class_='no-border-links').find('a')
+        team_name = team_link.get('title', '').strip()
+        team_url = urljoin(BASE_URL, team_link.get('href', ''))
+        
+        logo_img = row.find('img', class_='tiny_wappen')
+        logo_url = logo_img.get('src') if logo_img else None
+        
+        cols = row.find_all('td', class_='zentriert')
+        if len(cols) < 7:
+            continue
+        
+        played = cols[0].get_text(strip=True)
+        wins = cols[1].get_text(strip=True)
+        draws = cols[2].get_text(strip=True)
+        losses = cols[3].get_text(strip=True)
+        goals = cols[4].get_text(strip=True)
+        goal_diff = cols[5].get_text(strip=True)
+        points = cols[6].get_text(strip=True)
+        
+        pos_change = None
+        pos_change_span = row.find('td', class_='rechts').find('span')
+        if pos_change_span and 'title' in pos_change_span.attrs:
+            pos_change = pos_change_span['title']
+        
+        table.append({
+            'position': pos,
+            'position_change': pos_change,
+            'team_id': team_url.split("/")[-3] if team_url else None,
+            'team': team_name,
+            'team_url': team_url,
+            'team_logo': logo_url,
+            'matches_played': played,
+            'wins': wins,
+            'draws': draws,
+            'losses': losses,
+            'goals': goals,
+            'goal_difference': goal_diff,
+            'points': points
+        })
+    return table
+
+@single_flight
+@revalidate(leagues_table_cache)
 async def get_league_table_request(league_code: str, season: str):
     """
     Get league table for a specific league and season
@@ -1382,73 +1774,81 @@ async def get_league_table_request(league_code: str, season: str):
     url = f"{BASE_URL}/-/tabelle/wettbewerb/{league_code}/saison_id/{season}"
     
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                table = []
-                
-                table_element = soup.find('table', class_='items')
-                if not table_element:
-                    return []
-                
-                rows = table_element.find_all('tr', class_=lambda x: x != 'zeile-unterschiedliche-tabellenfarben')
-                
-                for row in rows:
-                    if not row.find('td', class_='rechts'):
-                        continue
-                    
-                    pos = row.find('td', class_='rechts').get_text(strip=True).split()[0]
-                    
-                    team_link = row.find('td', class_='no-border-links').find('a')
-                    team_name = team_link.get('title', '').strip()
-                    team_url = urljoin(BASE_URL, team_link.get('href', ''))
-                    
-                    logo_img = row.find('img', class_='tiny_wappen')
-                    logo_url = logo_img.get('src') if logo_img else None
-                    
-                    cols = row.find_all('td', class_='zentriert')
-                    if len(cols) < 7:
-                        continue
-                    
-                    played = cols[0].get_text(strip=True)
-                    wins = cols[1].get_text(strip=True)
-                    draws = cols[2].get_text(strip=True)
-                    losses = cols[3].get_text(strip=True)
-                    goals = cols[4].get_text(strip=True)
-                    goal_diff = cols[5].get_text(strip=True)
-                    points = cols[6].get_text(strip=True)
-                    
-                    pos_change = None
-                    pos_change_span = row.find('td', class_='rechts').find('span')
-                    if pos_change_span and 'title' in pos_change_span.attrs:
-                        pos_change = pos_change_span['title']
-                    
-                    table.append({
-                        'position': pos,
-                        'position_change': pos_change,
-                        'team_id': team_url.split("/")[-3] if team_url else None,
-                        'team': team_name,
-                        'team_url': team_url,
-                        'team_logo': logo_url,
-                        'matches_played': played,
-                        'wins': wins,
-                        'draws': draws,
-                        'losses': losses,
-                        'goals': goals,
-                        'goal_difference': goal_diff,
-                        'points': points
-                    })
-
-                leagues_table_cache[(league_code, season)] = table
-                return table
-                
+        status, html = await fetch_page(url)
+        if status != 200:
+            raise Exception(f"HTTP Error {status}")
+        table = await parse(parse_league_table, html)
+        if table is None:
+            return []
+        leagues_table_cache[(league_code, season)] = table
+        return table
+            
     except Exception as e:
         raise Exception(f"Error fetching league table for {league_code} season {season}: {e}")
         return []
 
+FIXTURES_SCOPE = scoped(("div", "responsive-table"))
+
+def parse_club_fixtures(html):
+    """Extracts fixtures, or None when the page has no fixtures table"""
+    soup = make_soup(html, parse_only=FIXTURES_SCOPE)
+    
+    fixtures = []
+    
+    table_container = soup.find('div', {'class': 'responsive-table'})
+    if not table_container:
+        print("No responsive-table container found")
+        return None
+    
+    table = table_container.find('table')
+    if not table:
+        print("No fixtures table found")
+        return None
+    
+    for row in table.find_all('tr'):
+        row_classes = row.get('class', [])
+        if isinstance(row_classes, str):
+            row_classes = row_classes.split()
+        
+        cols = row.find_all('td')
+        if len(cols) < 10:
+            continue
+        
+        try:
+            matchday_elem = cols[0].find('a')
+            matchday = cols[0].get_text(strip=True)
+            matchday_url = urljoin(BASE_URL, matchday_elem.get('href')) if matchday_elem else None
+            
+            opponent_elem = cols[6].find('a')
+            opponent_img = cols[5].find('img', {'class': 'tiny_wappen'})
+            
+            fixture = {
+                'matchday': matchday,
+                'matchday_url': matchday_url,
+                'date': cols[1].get_text(strip=True),
+                'time': cols[2].get_text(strip=True),
+                'venue': cols[3].get_text(strip=True),
+                'ranking': cols[4].get_text(strip=True),
+                'opponent': {
+                    'club_id': opponent_elem.get('href').split('/')[-3] if opponent_elem else None,
+                    'name': cols[6].get_text(strip=True),
+                    'url': urljoin(BASE_URL, opponent_elem.get('href')) if opponent_elem else None,
+                    'logo': opponent_img.get('src') if opponent_img else None
+                },
+                'system_of_play': cols[7].get_text(strip=True),
+                'attendance': cols[8].get_text(strip=True),
+                'result': cols[9].get_text(strip=True),
+                'result_url': urljoin(BASE_URL, cols[9].find('a').get('href')) if cols[9].find('a') else None
+            }
+            
+            fixtures.append(fixture)
+        except Exception as e:
+            print(f"Error processing fixture row: {e}")
+            continue
+    return fixtures
+
+@single_flight
+@revalidate(club_fixtures_cache)
 async def get_club_fixtures_request(club_id: str):
     """
     Get club fixtures from Transfermarkt with complete data extraction
@@ -1465,72 +1865,42 @@ async def get_club_fixtures_request(club_id: str):
     url = f"https://www.transfermarkt.co.uk/-/spielplandatum/verein/{club_id}"
     
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                fixtures = []
-                
-                table_container = soup.find('div', {'class': 'responsive-table'})
-                if not table_container:
-                    print("No responsive-table container found")
-                    return []
-                
-                table = table_container.find('table')
-                if not table:
-                    print("No fixtures table found")
-                    return []
-                
-                for row in table.find_all('tr'):
-                    row_classes = row.get('class', [])
-                    if isinstance(row_classes, str):
-                        row_classes = row_classes.split()
-                    
-                    cols = row.find_all('td')
-                    if len(cols) < 10:
-                        continue
-                    
-                    try:
-                        matchday_elem = cols[0].find('a')
-                        matchday = cols[0].get_text(strip=True)
-                        matchday_url = urljoin(BASE_URL, matchday_elem.get('href')) if matchday_elem else None
-                        
-                        opponent_elem = cols[6].find('a')
-                        opponent_img = cols[5].find('img', {'class': 'tiny_wappen'})
-                        
-                        fixture = {
-                            'matchday': matchday,
-                            'matchday_url': matchday_url,
-                            'date': cols[1].get_text(strip=True),
-                            'time': cols[2].get_text(strip=True),
-                            'venue': cols[3].get_text(strip=True),
-                            'ranking': cols[4].get_text(strip=True),
-                            'opponent': {
-                                'club_id': opponent_elem.get('href').split('/')[-3] if opponent_elem else None,
-                                'name': cols[6].get_text(strip=True),
-                                'url': urljoin(BASE_URL, opponent_elem.get('href')) if opponent_elem else None,
-                                'logo': opponent_img.get('src') if opponent_img else None
-                            },
-                            'system_of_play': cols[7].get_text(strip=True),
-                            'attendance': cols[8].get_text(strip=True),
-                            'result': cols[9].get_text(strip=True),
-                            'result_url': urljoin(BASE_URL, cols[9].find('a').get('href')) if cols[9].find('a') else None
-                        }
-                        
-                        fixtures.append(fixture)
-                    except Exception as e:
-                        print(f"Error processing fixture row: {e}")
-                        continue
-
-                club_fixtures_cache[club_id] = fixtures
-                return fixtures
-                
+        status, html = await fetch_page(url)
+        if status != 200:
+            raise Exception(f"HTTP Error {status}")
+        fixtures = await parse(parse_club_fixtures, html)
+        if fixtures is None:
+            return []
+        club_fixtures_cache[club_id] = fixtures
+        return fixtures
+            
     except Exception as e:
         raise Exception(f"Error fetching fixtures for club {club_id}: {e}")
         return []
 
+COUNTRY_SELECT_SCOPE = SoupStrainer("select", attrs={"name": "land_id"})
+
+def parse_country_list(html):
+    """Extracts countries from the country select, or None when it is missing"""
+    soup = make_soup(html, parse_only=COUNTRY_SELECT_SCOPE)
+    
+    countries = []
+    
+    select = soup.find('select', {'name': 'land_id'})
+    if not select:
+        print("No country select element found")
+        return None
+    
+    for option in select.find_all('option'):
+        country = {
+            'id': option.get('value'),
+            'name': option.get_text(strip=True)
+        }
+        countries.append(country)
+    return countries
+
+@single_flight
+@revalidate(country_list_cache, key=lambda: "country_list")
 async def get_country_list():
     """
     Get list of countries and their IDs from Transfermarkt's foreigners statistics page
@@ -1544,33 +1914,55 @@ async def get_country_list():
     url = "https://www.transfermarkt.co.uk/land-statistik/legionaere/statistik/stat/"
     
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                countries = []
-                
-                select = soup.find('select', {'name': 'land_id'})
-                if not select:
-                    print("No country select element found")
-                    return []
-                
-                for option in select.find_all('option'):
-                    country = {
-                        'id': option.get('value'),
-                        'name': option.get_text(strip=True)
-                    }
-                    countries.append(country)
-
-                country_list_cache["country_list"] = countries
-                return countries
-                
+        status, html = await fetch_page(url)
+        if status != 200:
+            raise Exception(f"HTTP Error {status}")
+        countries = await parse(parse_country_list, html)
+        if countries is None:
+            return []
+        country_list_cache["country_list"] = countries
+        return countries
+            
     except Exception as e:
         raise Exception(f"Error fetching country list: {e}")
         return []
     
+def parse_foreign_players(html):
+    """Extracts per-country player counts, or None when the page has no table"""
+    soup = make_soup(html, parse_only=ITEMS_TABLE_SCOPE)
+    
+    countries = []
+    
+    # Find the main table
+    table = soup.find('table', class_='items')
+    if not table:
+        print("No data table found")
+        return None
+    
+    # Process all rows in the table body
+    for row in table.find_all('tr', class_=['odd', 'even']):
+        cols = row.find_all('td')
+        if len(cols) < 5:  # Ensure we have all columns
+            continue
+        
+        # Extract country data
+        country_flag = cols[1].find('img', class_='flaggenrahmen')
+        country_link = cols[2].find('a')
+        player_count = cols[3].get_text(strip=True)
+        total_value = cols[4].get_text(strip=True)
+        
+        countries.append({
+            'rank': cols[0].get_text(strip=True),
+            'country_id': country_link['href'].split('/')[-3] if country_link else None,
+            'country_name': country_link.get_text(strip=True) if country_link else None,
+            'flag_url': country_flag['src'] if country_flag else None,
+            'player_count': player_count,
+            'total_value': total_value
+        })
+    return countries
+
+@single_flight
+@revalidate(foreign_players_cache)
 async def get_foreign_players_request(country_id: str):
     """
     Get list of countries and number of players from specified country playing abroad
@@ -1587,48 +1979,106 @@ async def get_foreign_players_request(country_id: str):
     url = f"https://www.transfermarkt.co.uk/land-statistik/legionaere/statistik/stat/?land_id={country_id}"
     
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                countries = []
-                
-                # Find the main table
-                table = soup.find('table', class_='items')
-                if not table:
-                    print("No data table found")
-                    return []
-                
-                # Process all rows in the table body
-                for row in table.find_all('tr', class_=['odd', 'even']):
-                    cols = row.find_all('td')
-                    if len(cols) < 5:  # Ensure we have all columns
-                        continue
-                    
-                    # Extract country data
-                    country_flag = cols[1].find('img', class_='flaggenrahmen')
-                    country_link = cols[2].find('a')
-                    player_count = cols[3].get_text(strip=True)
-                    total_value = cols[4].get_text(strip=True)
-                    
-                    countries.append({
-                        'rank': cols[0].get_text(strip=True),
-                        'country_id': country_link['href'].split('/')[-3] if country_link else None,
-                        'country_name': country_link.get_text(strip=True) if country_link else None,
-                        'flag_url': country_flag['src'] if country_flag else None,
-                        'player_count': player_count,
-                        'total_value': total_value
-                    })
-
-                foreign_players_cache[country_id] = countries
-                return countries
-                
+        status, html = await fetch_page(url)
+        if status != 200:
+            raise Exception(f"HTTP Error {status}")
+        countries = await parse(parse_foreign_players, html)
+        if countries is None:
+            return []
+        foreign_players_cache[country_id] = countries
+        return countries
+            
     except Exception as e:
         raise Exception(f"Error fetching foreign players data for country {country_id}: {e}")
         return []
     
+TRANSFER_BOXES_SCOPE = scoped(("div", "box"))
+
+def parse_league_transfers_overview(html):
+    """Extracts per-team transfers from a league transfers overview page"""
+    soup = make_soup(html, parse_only=TRANSFER_BOXES_SCOPE)
+    
+    teams_data = []
+    team_boxes = soup.find_all('div', class_='box')
+    
+    for box in team_boxes:
+        team_header = box.find('h2', class_='content-box-headline')
+        if not team_header:
+            continue
+            
+        team_link = team_header.find('a')
+        if not team_link:
+            continue
+
+        team_name = team_link.get('title', '').replace('Array', '').strip()
+        team_url = urljoin(BASE_URL, team_link['href']) if team_link else None
+        team_id = team_url.split('/')[-3] if team_url else None
+        
+        logo_img = team_header.find('img')
+        team_logo = logo_img['src'] if logo_img else None
+        
+        stats_box = box.find('div', class_='transfer-zusatzinfo-box')
+        transfer_stats = {
+            'avg_age': None,
+            'total_market_value': None,
+            'expenditure': None,
+            'income': None
+        }
+        if stats_box:
+            age_span = stats_box.find('span', class_='transfer-zusatzinfo-alter')
+            if age_span:
+                transfer_stats['avg_age'] = age_span.get_text(strip=True).replace('Average age of arrivals:', '').strip()
+            
+            value_span = stats_box.find('span', class_='transfer-zusatzinfo-wert')
+            if value_span:
+                transfer_stats['total_market_value'] = value_span.get_text(strip=True).replace('Total market value of arrivals:', '').strip()
+            
+            expenditure_span = stats_box.find('span', class_='transfer-einnahmen-ausgaben')
+            if expenditure_span:
+                text = expenditure_span.get_text(strip=True)
+                if 'Expenditure:' in text:
+                    transfer_stats['expenditure'] = text.replace('Expenditure:', '').strip()
+                elif 'Income:' in text:
+                    transfer_stats['income'] = text.replace('Income:', '').strip()
+        
+        transfers_in = []
+        transfers_out = []
+        
+        tables = box.find_all('table')
+        
+        if len(tables) > 0:
+            for row in tables[0].find_all('tr')[1:]:  
+                cols = row.find_all('td')
+                if len(cols) < 9:
+                    continue
+                
+                transfer = extract_transfer_data_tr(cols)
+                transfer['transfer_type'] = 'in'
+                transfers_in.append(transfer)
+        
+        if len(tables) > 1:
+            for row in tables[1].find_all('tr')[1:]:  
+                cols = row.find_all('td')
+                if len(cols) < 9:
+                    continue
+                
+                transfer = extract_transfer_data_tr(cols)
+                transfer['transfer_type'] = 'out'
+                transfers_out.append(transfer)
+        
+        teams_data.append({
+            'team_id': team_id,
+            'team_name': team_name,
+            'team_logo': team_logo,
+            'team_url': team_url,
+            'transfers_in': transfers_in,
+            'transfers_out': transfers_out,
+            'transfer_stats': transfer_stats
+        })
+    return teams_data
+
+@single_flight
+@revalidate(leagues_transfers_overview_cache)
 async def get_league_transfers_overview_request(league_code: str, season: int):
     """
     Get complete transfer data for a specific league and season, grouped by team
@@ -1653,93 +2103,13 @@ async def get_league_transfers_overview_request(league_code: str, season: int):
     url = f"{BASE_URL}/-/transfers/wettbewerb/{league_code}/plus/?saison_id={season}&leihe=1&intern=0&intern=1"
     
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                teams_data = []
-                team_boxes = soup.find_all('div', class_='box')
-                
-                for box in team_boxes:
-                    team_header = box.find('h2', class_='content-box-headline')
-                    if not team_header:
-                        continue
-                        
-                    team_link = team_header.find('a')
-                    if not team_link:
-                        continue
-
-                    team_name = team_link.get('title', '').replace('Array', '').strip()
-                    team_url = urljoin(BASE_URL, team_link['href']) if team_link else None
-                    team_id = team_url.split('/')[-3] if team_url else None
-                    
-                    logo_img = team_header.find('img')
-                    team_logo = logo_img['src'] if logo_img else None
-                    
-                    stats_box = box.find('div', class_='transfer-zusatzinfo-box')
-                    transfer_stats = {
-                        'avg_age': None,
-                        'total_market_value': None,
-                        'expenditure': None,
-                        'income': None
-                    }
-                    if stats_box:
-                        age_span = stats_box.find('span', class_='transfer-zusatzinfo-alter')
-                        if age_span:
-                            transfer_stats['avg_age'] = age_span.get_text(strip=True).replace('Average age of arrivals:', '').strip()
-                        
-                        value_span = stats_box.find('span', class_='transfer-zusatzinfo-wert')
-                        if value_span:
-                            transfer_stats['total_market_value'] = value_span.get_text(strip=True).replace('Total market value of arrivals:', '').strip()
-                        
-                        expenditure_span = stats_box.find('span', class_='transfer-einnahmen-ausgaben')
-                        if expenditure_span:
-                            text = expenditure_span.get_text(strip=True)
-                            if 'Expenditure:' in text:
-                                transfer_stats['expenditure'] = text.replace('Expenditure:', '').strip()
-                            elif 'Income:' in text:
-                                transfer_stats['income'] = text.replace('Income:', '').strip()
-                    
-                    transfers_in = []
-                    transfers_out = []
-                    
-                    tables = box.find_all('table')
-                    
-                    if len(tables) > 0:
-                        for row in tables[0].find_all('tr')[1:]:  
-                            cols = row.find_all('td')
-                            if len(cols) < 9:
-                                continue
-                            
-                            transfer = extract_transfer_data_tr(cols)
-                            transfer['transfer_type'] = 'in'
-                            transfers_in.append(transfer)
-                    
-                    if len(tables) > 1:
-                        for row in tables[1].find_all('tr')[1:]:  
-                            cols = row.find_all('td')
-                            if len(cols) < 9:
-                                continue
-                            
-                            transfer = extract_transfer_data_tr(cols)
-                            transfer['transfer_type'] = 'out'
-                            transfers_out.append(transfer)
-                    
-                    teams_data.append({
-                        'team_id': team_id,
-                        'team_name': team_name,
-                        'team_logo': team_logo,
-                        'team_url': team_url,
-                        'transfers_in': transfers_in,
-                        'transfers_out': transfers_out,
-                        'transfer_stats': transfer_stats
-                    })
-
-                leagues_transfers_overview_cache[(league_code, season)] = teams_data
-                return teams_data
-                
+        status, html = await fetch_page(url)
+        if status != 200:
+            raise Exception(f"HTTP Error {status}")
+        teams_data = await parse(parse_league_transfers_overview, html)
+        leagues_transfers_overview_cache[(league_code, season)] = teams_data
+        return teams_data
+            
     except Exception as e:
         raise Exception(f"Error fetching transfers for {league_code} season {season}: {e}")
         return []
@@ -1777,6 +2147,52 @@ def extract_transfer_data_tr(cols):
         'fee': cols[8].get_text(strip=True) if len(cols) > 8 else ''
     }
 
+def parse_player_absences(html):
+    """Extracts absences, or None when the page has no absences table"""
+    soup = make_soup(html, parse_only=ITEMS_TABLE_SCOPE)
+    absences = []
+    
+    table = soup.find('table', {'class': 'items'})
+    if not table:
+        return None
+    
+    rows = table.find_all('tr')[1:]  
+    
+    for row in rows:
+        cells = row.find_all('td')
+        if len(cells) < 7:  
+            continue
+        
+        competition_img = cells[2].find('img')
+
+        competition = {
+            'code': competition_img.get('src').split('/')[-1].split('?')[0].replace('.png', '').upper() if competition_img else None,
+            'name': competition_img.get('title') if competition_img else None,
+            'logo': competition_img.get('src') if competition_img else None
+        }
+        
+        club_img = cells[6].find('img')
+        club = {
+            'id': club_img.get('src').split('/')[-1].split('?')[0].replace('.png', '').upper() if club_img else None,
+            'name': club_img.get('title') if club_img else None,
+            'logo': club_img.get('src') if club_img else None
+        }
+        
+        absence = {
+            'season': cells[0].get_text(strip=True),
+            'reason': cells[1].get_text(strip=True),
+            'competition': competition,
+            'from_date': cells[3].get_text(strip=True),
+            'until_date': cells[4].get_text(strip=True),
+            'duration': cells[5].get_text(strip=True),
+            'games_missed': cells[6].get_text(strip=True).split()[0],  
+            'club': club
+        }
+        absences.append(absence)
+    return absences
+
+@single_flight
+@revalidate(player_absences_cache)
 async def fetch_player_absences(player_id: int):
     """
     Fetches player absences (injuries/suspensions) from Transfermarkt
@@ -1787,61 +2203,89 @@ async def fetch_player_absences(player_id: int):
     
     url = f"https://www.transfermarkt.co.uk/-/ausfaelle/spieler/{player_id}"
     
-    absences = []
-    
-    async with aiohttp.ClientSession(headers=headers) as session:
-        try:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return []
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                table = soup.find('table', {'class': 'items'})
-                if not table:
-                    return []
-                
-                rows = table.find_all('tr')[1:]  
-                
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) < 7:  
-                        continue
-                    
-                    competition_img = cells[2].find('img')
-
-                    competition = {
-                        'code': competition_img.get('src').split('/')[-1].split('?')[0].replace('.png', '').upper() if competition_img else None,
-                        'name': competition_img.get('title') if competition_img else None,
-                        'logo': competition_img.get('src') if competition_img else None
-                    }
-                    
-                    club_img = cells[6].find('img')
-                    club = {
-                        'id': club_img.get('src').split('/')[-1].split('?')[0].replace('.png', '').upper() if club_img else None,
-                        'name': club_img.get('title') if club_img else None,
-                        'logo': club_img.get('src') if club_img else None
-                    }
-                    
-                    absence = {
-                        'season': cells[0].get_text(strip=True),
-                        'reason': cells[1].get_text(strip=True),
-                        'competition': competition,
-                        'from_date': cells[3].get_text(strip=True),
-                        'until_date': cells[4].get_text(strip=True),
-                        'duration': cells[5].get_text(strip=True),
-                        'games_missed': cells[6].get_text(strip=True).split()[0],  
-                        'club': club
-                    }
-                    absences.append(absence)
-                player_absences_cache[player_id] = absences
-                return absences
-                
-        except Exception as e:
-            print(f"Error fetching absences for player {player_id}: {e}")
+    try:
+        status, html = await fetch_page(url)
+        if status != 200:
+            return []
+        
+        absences = await parse(parse_player_absences, html)
+        if absences is None:
             return []
+        player_absences_cache[player_id] = absences
+        return absences
+        
+    except NotModified:
+        raise
+    except Exception as e:
+        print(f"Error fetching absences for player {player_id}: {e}")
+        return []
+
+def parse_national_team_career(html):
+    """Extracts national team career rows, or None when the section is missing"""
+    soup = make_soup(html, parse_only=HEADED_TABLES_SCOPE)
+    
+    header = (soup.find('h2', string='National team career') or 
+             soup.find('h2', string=lambda t: t and 'national team' in t.lower()))
+    
+    if not header:
+        return None  
+    
+    table = header.find_next('table')
+    if not table:
+        return None
+    
+    career_data = []
+    current_team = None
+    
+    for row in table.select('tr'):
+        if 'ueberzeile' in row.get('class', []) or not row.find('td'):
+            continue
+        
+        if 'show-for-small' in row.get('class', []):
+            team_link = row.find('a')
+            if team_link:
+                current_team = {
+                    'name': team_link.get('title', '').strip(),
+                    'id': team_link['href'].split('/')[-1],
+                    'flag': row.find('img')['src'] if row.find('img') else None
+                }
+            continue
+        
+        cols = row.find_all('td')
+        if len(cols) < 6:  
+            continue
+            
+        if not current_team:
+            team_link = cols[2].find('a') if len(cols) > 2 else None
+            if team_link:
+                current_team = {
+                    'name': team_link.get('title', '').strip(),
+                    'id': team_link['href'].split('/')[-1],
+                    'flag': cols[1].find('img')['src'] if len(cols) > 1 and cols[1].find('img') else None
+                }
+        
+        if not current_team:
+            continue
+            
+        debut_link = cols[3].find('a')
+        coach_link = cols[6].find('a') if len(cols) > 6 else None
+        
+        career_data.append({
+            'team': current_team['name'],
+            'team_id': current_team['id'],
+            'flag_url': current_team['flag'],
+            'debut': cols[3].get_text(strip=True),
+            'debut_match_url': ("https://www.transfermarkt.co.uk" + debut_link['href']) if debut_link else None,
+            'matches': cols[4].get_text(strip=True),
+            'goals': cols[5].get_text(strip=True),
+            'coach': cols[6].get_text(strip=True) if len(cols) > 6 else None,
+            'coach_id': coach_link['href'].split('/')[-1] if coach_link else None,
+            'age_at_debut': cols[7].get_text(strip=True) if len(cols) > 7 else None
+        })
+    return career_data
 
+@single_flight
+@revalidate(player_national_cache)
 async def get_national_team_career(player_id: int):
     """
     Scrapes a player's national team career from Transfermarkt.
@@ -1855,76 +2299,16 @@ async def get_national_team_career(player_id: int):
     url = f"https://www.transfermarkt.co.uk/-/nationalmannschaft/spieler/{player_id}"
     
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return []
-
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                header = (soup.find('h2', string='National team career') or 
-                         soup.find('h2', string=lambda t: t and 'national team' in t.lower()))
-                
-                if not header:
-                    return []  
-                
-                table = header.find_next('table')
-                if not table:
-                    return []
-                
-                career_data = []
-                current_team = None
-                
-                for row in table.select('tr'):
-                    if 'ueberzeile' in row.get('class', []) or not row.find('td'):
-                        continue
-                    
-                    if 'show-for-small' in row.get('class', []):
-                        team_link = row.find('a')
-                        if team_link:
-                            current_team = {
-                                'name': team_link.get('title', '').strip(),
-                                'id': team_link['href'].split('/')[-1],
-                                'flag': row.find('img')['src'] if row.find('img') else None
-                            }
-                        continue
-                    
-                    cols = row.find_all('td')
-                    if len(cols) < 6:  
-                        continue
-                        
-                    if not current_team:
-                        team_link = cols[2].find('a') if len(cols) > 2 else None
-                        if team_link:
-                            current_team = {
-                                'name': team_link.get('title', '').strip(),
-                                'id': team_link['href'].split('/')[-1],
-                                'flag': cols[1].find('img')['src'] if len(cols) > 1 and cols[1].find('img') else None
-                            }
-                    
-                    if not current_team:
-                        continue
-                        
-                    debut_link = cols[3].find('a')
-                    coach_link = cols[6].find('a') if len(cols) > 6 else None
-                    
-                    career_data.append({
-                        'team': current_team['name'],
-                        'team_id': current_team['id'],
-                        'flag_url': current_team['flag'],
-                        'debut': cols[3].get_text(strip=True),
-                        'debut_match_url': ("https://www.transfermarkt.co.uk" + debut_link['href']) if debut_link else None,
-                        'matches': cols[4].get_text(strip=True),
-                        'goals': cols[5].get_text(strip=True),
-                        'coach': cols[6].get_text(strip=True) if len(cols) > 6 else None,
-                        'coach_id': coach_link['href'].split('/')[-1] if coach_link else None,
-                        'age_at_debut': cols[7].get_text(strip=True) if len(cols) > 7 else None
-                    })
+        status, html = await fetch_page(url)
+        if status != 200:
+            return []
 
-                player_national_cache[player_id] = career_data
-                return career_data
-                
+        career_data = await parse(parse_national_team_career, html)
+        if career_data is None:
+            return []
+        player_national_cache[player_id] = career_data
+        return career_data
+            
     except aiohttp.ClientError as e:
         raise Exception(f"Network error: {str(e)}")
     except Exception as e:
@@ -0,0 +1,203 @@
+import bisect
+import heapq
+import os
+import re
+import unicodedata
+from collections import OrderedDict
+
+SEARCH_MIN_LOCAL_RESULTS = int(os.getenv("SEARCH_MIN_LOCAL_RESULTS", 5))
+SEARCH_INDEX_MAXSIZE = int(os.getenv("SEARCH_INDEX_MAXSIZE", 50000))
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents, e.g. "Ødegaard" -> "odegaard" """
+    folded = unicodedata.normalize("NFKD", text.replace("ø", "o").replace("Ø", "O").replace("ß", "ss"))
+    return "".join(char for char in folded if not unicodedata.combining(char)).lower()
+
+def tokenize(text: str) -> list:
+    return re.findall(r"[a-z0-9]+", normalize(text or ""))
+
+def trigrams(token: str) -> set:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SearchIndex:
+    """
+    In-process name index for one kind of search result (players, clubs, staff).
+
+    Every result the scrapers see is added under its ID with the document the
+    search endpoint returns for it. Queries match when each query token is a
+    prefix of some token of the name ("sa", "sak", "saka" all find Bukayo
+    Saka); tokens are kept sorted so a prefix is a bisect range. Queries with
+    no prefix match fall back to trigram similarity for typos.
+
+    The index holds at most maxsize documents and evicts the least recently
+    added or returned one beyond that, along with tokens no document uses.
+    """
+
+    def __init__(self, maxsize: int = SEARCH_INDEX_MAXSIZE, fuzzy_threshold: float = 0.5):
+        self.maxsize = maxsize
+        self.fuzzy_threshold = fuzzy_threshold
+        self.documents = OrderedDict()
+        self.names = {}
+        self.postings = {}
+        self.tokens = []
+        self.grams = {}
+
+    def add(self, doc_id, name: str, document: dict, replace: bool = False):
+        """
+        Index document under doc_id. An existing document is only replaced
+        when replace is set, so a full search result is not overwritten by
+        the partial one built from a profile or squad page.
+        """
+        if not doc_id or not name:
+            return
+        doc_id = str(doc_id)
+        if doc_id in self.documents:
+            self.documents.move_to_end(doc_id)
+            if not replace:
+                return
+            self._remove_tokens(doc_id)
+
+        tokens = tokenize(name)
+        self.documents[doc_id] = document
+        self.names[doc_id] = " ".join(tokens)
+        for token in set(tokens):
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                bisect.insort(self.tokens, token)
+                for gram in trigrams(token):
+                    self.grams.setdefault(gram, set()).add(token)
+            ids.add(doc_id)
+
+        while len(self.documents) > self.maxsize:
+            oldest = next(iter(self.documents))
+            self._remove_tokens(oldest)
+            del self.documents[oldest]
+            del self.names[oldest]
+
+    def _remove_tokens(self, doc_id: str):
+        for token in set(self.names[doc_id].split()):
+            ids = self.postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(doc_id)
+            if not ids:
+                # No document uses the token any more: drop it everywhere
+                del self.postings[token]
+                del self.tokens[bisect.bisect_left(self.tokens, token)]
+                for gram in trigrams(token):
+                    tokens = self.grams[gram]
+                    tokens.discard(token)
+                    if not tokens:
+                        del self.grams[gram]
+
+    def _prefixed(self, prefix: str) -> set:
+        ids = set()
+        start = bisect.bisect_left(self.tokens, prefix)
+        for token in self.tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            ids |= self.postings[token]
+        return ids
+
+    def _similar(self, token: str) -> set:
+        grams = trigrams(token)
+        counts = {}
+        for gram in grams:
+            for candidate in self.grams.get(gram, ()):
+                counts[candidate] = counts.get(candidate, 0) + 1
+
+        ids = set()
+        for candidate, shared in counts.items():
+            if shared / len(grams | trigrams(candidate)) >= self.fuzzy_threshold:
+                ids |= self.postings[candidate]
+        return ids
+
+    def lookup(self, query: str, limit: int = 20):
+        """
+        Documents whose name matches every token of query, best first.
+
+        Returns:
+            (documents, exact, fuzzy) - exact is True when the best match's
+            name equals the query, fuzzy when the matches come from the
+            trigram fallback rather than prefixes
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return [], False, False
+
+        # Look up the most selective (longest) token, then filter its matches
+        # by the others instead of building a posting union for every token
+        first, *others = sorted(query_tokens, key=len, reverse=True)
+        matches = self._prefixed(first)
+        fuzzy = False
+        if not matches and len(first) >= 3:
+            matches = self._similar(first)
+            fuzzy = True
+        for token in others:
+            matches = {
+                doc_id for doc_id in matches
+                if any(name_token.startswith(token) for name_token in self.names[doc_id].split())
+            }
+        if not matches:
+            return [], False, fuzzy
+
+        normalized_query = " ".join(query_tokens)
+
+        def rank(doc_id):
+            name = self.names[doc_id]
+            name_tokens = name.split()
+            return (
+                name != normalized_query,
+                -sum(token in name_tokens for token in query_tokens),
+                not name.startswith(normalized_query),
+                len(name),
+                name
+            )
+
+        ranked = heapq.nsmallest(limit, matches, key=rank)
+        for doc_id in ranked:
+            self.documents.move_to_end(doc_id)
+        return [self.documents[doc_id] for doc_id in ranked], self.names[ranked[0]] == normalized_query, fuzzy
+
+    def search(self, query: str, limit: int = 20) -> list:
+        return self.lookup(query, limit)[0]
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+player_index = SearchIndex()
+club_index = SearchIndex()
+staff_index = SearchIndex()
+
+def search_locally(index: SearchIndex, query: str):
+    """
+    Answer a search from the local index when it finds enough results.
+
+    Returns:
+        The local results, or None when the caller should go upstream: fewer
+        than SEARCH_MIN_LOCAL_RESULTS match (and none exactly), or only
+        similar names do
+    """
+    results, exact, fuzzy = index.lookup(query)
+    if fuzzy:
+        # Near misses say nothing about names the index has never seen
+        return None
+    # A name matching the query exactly is a complete answer on its own
+    if exact or len(results) >= SEARCH_MIN_LOCAL_RESULTS:
+        return results
+    return None
+
+async def indexed_search(index: SearchIndex, query: str, fetch):
+    """
+    Run a search locally when the index can answer it, else through fetch
+    (the upstream search scraper, which adds its results to the index).
+
+    Returns:
+        (results, local) - local is True when no upstream call was needed
+    """
+    results = search_locally(index, query)
+    if results is not None:
+        return results, True
+    return await fetch(query), False
@@ -0,0 +1,78 @@
+import asyncio
+import functools
+from collections import defaultdict
+from contextvars import ContextVar
+
+from .governor import SharedPriority
+
+# Decorated calls only share a flight with calls made in the same scope. A
+# cache refresh runs in a scope of its own, so requests never join work
+# done in its conditional mode, which can end in NotModified.
+flight_scope = ContextVar("flight_scope", default=None)
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into a single upstream call.
+
+    The first caller for a key starts the work as a task; every caller that
+    arrives while it is still running awaits that same task instead of
+    fetching and parsing the page again. The task's upstream requests are
+    scheduled at the best priority among the callers waiting for it.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self._counters = defaultdict(lambda: {"leaders": 0, "coalesced": 0})
+
+    async def do(self, key, fn, name: str = "default"):
+        flight = self._inflight.get(key)
+        if flight is not None:
+            task, priority = flight
+            self._counters[name]["coalesced"] += 1
+            priority.join()
+            return await asyncio.shield(task)
+
+        self._counters[name]["leaders"] += 1
+        priority = SharedPriority.start()
+        task = asyncio.ensure_future(self._run(fn, priority))
+        self._inflight[key] = (task, priority)
+        task.add_done_callback(functools.partial(self._done, key))
+        return await asyncio.shield(task)
+
+    @staticmethod
+    async def _run(fn, priority: SharedPriority):
+        priority.enter()
+        return await fn()
+
+    def _done(self, key, task):
+        if self._inflight.get(key, (None,))[0] is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every waiter was cancelled
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "coalesced": sum(c["coalesced"] for c in self._counters.values()),
+            "functions": {name: dict(counters) for name, counters in self._counters.items()}
+        }
+
+flights = SingleFlight()
+
+def single_flight(fn):
+    """
+    Decorator for scrapers: concurrent calls with the same arguments share
+    one in-flight call instead of each missing the cache independently.
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())), flight_scope.get())
+        return await flights.do(key, lambda: fn(*args, **kwargs), name=name)
+
+    return wrapper
@@ -1,3 +1,3 @@
-from .management import get_country_list, search_countries_query 
+from .management import get_country_list, get_country_list_json, get_country, search_countries_query 
 
-__all__ = ['get_country_list', 'search_countries_query']
\ No newline at end of file
+__all__ = ['get_country_list', 'get_country_list_json', 'get_country', 'search_countries_query']
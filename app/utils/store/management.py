@@ -1,29 +1,87 @@
 import json
 from pathlib import Path
 
+from ..search_index import normalize
+
 _countries_path = Path(__file__).parent / 'countries.json'
 with open(_countries_path, 'r') as f:
     countries = json.load(f)
 
+# Same encoding as FastAPI's JSONResponse, so /stats/countries can send these
+# bytes as they are instead of re-encoding the list on every call
+countries_json = json.dumps(countries, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+class CountryIndex:
+    """
+    Search index over the stored countries, built once at import.
+
+    Every suffix of each country's normalized name and ID is inserted into a
+    prefix trie, so a substring query (the matching search_countries_query has
+    always done) is a single walk down the trie. Each node keeps the positions
+    of its countries in list order, so results come back in the same order as
+    a linear scan. IDs also get an exact lookup map.
+    """
+
+    def __init__(self, entries: list):
+        self.entries = entries
+        self.by_id = {normalize(entry['id']): entry for entry in entries}
+        self.trie = {}
+
+        for position, entry in enumerate(entries):
+            for text in {normalize(entry['id']), normalize(entry['name'])}:
+                for start in range(len(text)):
+                    node = self.trie
+                    for char in text[start:]:
+                        node = node.setdefault(char, {})
+                        node.setdefault(None, set()).add(position)
+
+        self._freeze(self.trie)
+
+    def _freeze(self, node: dict):
+        # Match sets become sorted tuples once building is done
+        for char, child in node.items():
+            if char is None:
+                node[None] = tuple(sorted(child))
+            else:
+                self._freeze(child)
+
+    def search(self, query: str) -> list:
+        normalized = normalize(query.strip())
+        if not normalized:
+            return list(self.entries)
+
+        node = self.trie
+        for char in normalized:
+            node = node.get(char)
+            if node is None:
+                return []
+        return [self.entries[position] for position in node[None]]
+
+    def get(self, country_id: str):
+        return self.by_id.get(normalize(country_id.strip()))
+
+country_index = CountryIndex(countries["results"])
+
 def get_country_list():
     return countries
 
+def get_country_list_json() -> bytes:
+    return countries_json
+
+def get_country(country_id: str):
+    """Exact lookup of a stored country by its ID, None when unknown"""
+    return country_index.get(country_id)
+
 def search_countries_query(query: str):
     """
     Search countries by name or ID
     Returns results in the specified format
     """
-    query = query.lower().strip()
-    results = []
-    
-    for country in countries["results"]:
-        if (query in country['id'].lower() or 
-            query in country['name'].lower()):
-            results.append(country)
+    results = country_index.search(query)
     
     return {
-        "query": query,
+        "query": query.lower().strip(),
         "results": results,
         "stored_data": True,
         "count": len(results)
-    }
\ No newline at end of file
+    }
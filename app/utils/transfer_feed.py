@@ -0,0 +1,169 @@
+import asyncio
+import json
+import os
+import time
+
+from .cache_backends import WorkerConnection
+from .client import start_refresh
+from .governor import set_priority, BACKGROUND
+from .scraping import scrape_transfers
+
+TRANSFER_FEED_PATH = os.getenv("TRANSFER_FEED_PATH", "/tmp/tmkt-api-transfers.sqlite3")
+
+TRANSFER_FEED_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS transfers ("
+    "seq INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL UNIQUE, entry TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS feed (name TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+def transfer_key(row: dict) -> tuple:
+    """Stable identity of a latest-transfers row across polls"""
+    return (row['player_id'], row['previous_club'], row['current_club'], row['transfer_fee'])
+
+class TransferFeed:
+    """
+    Append-only log of latest transfers, filled by a background ingester.
+
+    Every `interval` seconds the ingester scrapes the latest transfers page and
+    appends the rows it has not seen before (by transfer_key), oldest first,
+    each with the next sequence number. A row's date is when it was first
+    seen, so it stays the same across polls. Clients remember the last seq
+    they received and pull only newer entries. The log keeps the newest
+    `maxlen` entries.
+
+    The log lives in a SQLite file (WAL mode) shared by every worker on the
+    host, and sequence numbers are its row IDs, so a transfer has the same
+    seq whichever worker a client's next request lands on. Each worker runs
+    an ingester, but only the one that claims an interval polls upstream.
+    """
+
+    def __init__(self, fetch, path: str, interval: float = 300, maxlen: int = 5000):
+        self.fetch = fetch
+        self.path = path
+        self.interval = interval
+        self.maxlen = maxlen
+        self._connection = WorkerConnection(path, TRANSFER_FEED_SCHEMA)
+        self._task = None
+
+    @property
+    def conn(self):
+        return self._connection.get()
+
+    def _get(self, name: str):
+        row = self.conn.execute("SELECT value FROM feed WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _set(self, name: str, value):
+        self.conn.execute("INSERT OR REPLACE INTO feed (name, value) VALUES (?, ?)", (name, json.dumps(value)))
+
+    @staticmethod
+    def _entries(rows) -> list:
+        return [{**json.loads(entry), 'seq': seq} for seq, entry in rows]
+
+    def ingest(self, rows: list) -> int:
+        """Append unseen rows to the log, returning how many were new"""
+        latest = []
+        new = 0
+        now = int(time.time())
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # The page lists the newest transfer first
+            for row in reversed(rows):
+                key = json.dumps(transfer_key(row))
+                seen = conn.execute("SELECT seq FROM transfers WHERE key = ?", (key,)).fetchone()
+                if seen is None:
+                    cursor = conn.execute(
+                        "INSERT INTO transfers (key, entry) VALUES (?, ?)",
+                        (key, json.dumps({**row, 'date': now}))
+                    )
+                    latest.append(cursor.lastrowid)
+                    new += 1
+                else:
+                    latest.append(seen[0])
+            conn.execute(
+                "DELETE FROM transfers WHERE seq <= (SELECT MAX(seq) FROM transfers) - ?",
+                (self.maxlen,)
+            )
+            self._set("latest", latest[::-1])
+            self._set("ingested_at", now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return new
+
+    async def refresh(self) -> int:
+        return self.ingest(await self.fetch())
+
+    @property
+    def latest(self) -> list:
+        """Entries of the rows on the page at the last poll, newest first"""
+        seqs = self._get("latest") or []
+        rows = self.conn.execute(
+            f"SELECT seq, entry FROM transfers WHERE seq IN ({','.join('?' * len(seqs))})", seqs
+        ).fetchall()
+        entries = {entry['seq']: entry for entry in self._entries(rows)}
+        return [entries[seq] for seq in seqs if seq in entries]
+
+    @property
+    def seq(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM transfers").fetchone()[0]
+
+    @property
+    def ingested_at(self):
+        return self._get("ingested_at")
+
+    def since(self, seq: int) -> list:
+        """Entries with a sequence number above seq, oldest first"""
+        return self._entries(self.conn.execute(
+            "SELECT seq, entry FROM transfers WHERE seq > ? ORDER BY seq", (seq,)
+        ).fetchall())
+
+    def _claim_poll(self) -> bool:
+        """Claim this interval's upstream poll for the calling worker"""
+        now = time.time()
+        cursor = self.conn.execute(
+            "INSERT INTO feed (name, value) VALUES ('polled_at', ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = excluded.value WHERE CAST(feed.value AS REAL) <= ?",
+            (json.dumps(now), now - self.interval * 0.9)
+        )
+        return cursor.rowcount == 1
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        set_priority(BACKGROUND)
+        while True:
+            if self._claim_poll():
+                # Ask upstream (conditionally) instead of reading the raw page cache
+                outcome = start_refresh()
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    if outcome["not_modified"]:
+                        self._set("ingested_at", int(time.time()))
+                    else:
+                        print(f"Transfer feed poll failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        return {
+            "entries": self.conn.execute("SELECT COUNT(*) FROM transfers").fetchone()[0],
+            "last_seq": self.seq,
+            "ingested_at": self.ingested_at
+        }
+
+transfer_feed = TransferFeed(
+    scrape_transfers,
+    path=TRANSFER_FEED_PATH,
+    interval=float(os.getenv("TRANSFER_FEED_INTERVAL", 300)),
+    maxlen=int(os.getenv("TRANSFER_FEED_MAXLEN", 5000))
+)
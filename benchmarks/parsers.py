@@ -0,0 +1,70 @@
+"""
+Parse+extract benchmark for each HTML parser backend.
+
+Runs every parse function in app.utils.scraping against saved Transfermarkt
+pages and reports the time per call for each available backend, checking that
+every backend produces the same output as html.parser.
+
+Pages are read from tests/fixtures (trimmed pages that tests/test_parsers.py
+also checks for equivalence) unless another directory of pages saved under
+the fixture names below (e.g. club_page.html, league_table.html) is given.
+Run from the repository root:
+
+    python -m benchmarks.parsers [path/to/fixtures] [iterations]
+"""
+import sys
+import time
+from pathlib import Path
+
+from app.utils import parsing, scraping
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+FIXTURES = {
+    "matches": lambda html: scraping.parse_matches(html),
+    "player_profile": lambda html: scraping.parse_player_profile(html, "0"),
+    "player_stats": lambda html: scraping.parse_player_stats(html, "0", None),
+    "player_injuries": scraping.parse_player_injuries,
+    "player_absences": scraping.parse_player_absences,
+    "player_national": scraping.parse_national_team_career,
+    "club_page": lambda html: scraping.parse_club_page(html, "0"),
+    "club_transfers": scraping.parse_team_transfers,
+    "club_fixtures": scraping.parse_club_fixtures,
+    "latest_transfers": scraping.parse_latest_transfers,
+    "leagues_search": scraping.parse_leagues_search,
+    "league_top_scorers": scraping.parse_league_top_scorers,
+    "league_clubs": scraping.parse_league_clubs,
+    "league_table": scraping.parse_league_table,
+    "league_transfers": scraping.parse_league_transfers_overview,
+    "staff_search": scraping.parse_staff_search,
+    "staff_profile": lambda html: scraping.parse_staff_profile(html, ""),
+    "foreign_players": scraping.parse_foreign_players,
+    "country_list": scraping.parse_country_list,
+}
+
+def run(fixtures_dir: Path, iterations: int = 20):
+    backends = parsing.available_parsers()
+    print(f"{'endpoint':<22}" + "".join(f"{backend:>16}" for backend in backends) + "  same output")
+
+    for name, parse in FIXTURES.items():
+        path = fixtures_dir / f"{name}.html"
+        if not path.exists():
+            print(f"{name:<22}  no fixture, skipped")
+            continue
+        html = path.read_text(encoding="utf-8")
+
+        timings = []
+        outputs = []
+        for backend in backends:
+            parsing.HTML_PARSER = backend
+            outputs.append(parse(html))
+            start = time.perf_counter()
+            for _ in range(iterations):
+                parse(html)
+            timings.append((time.perf_counter() - start) / iterations * 1000)
+
+        same = all(output == outputs[-1] for output in outputs)
+        print(f"{name:<22}" + "".join(f"{ms:>13.2f} ms" for ms in timings) + f"  {same}")
+
+if __name__ == "__main__":
+    run(Path(sys.argv[1]) if len(sys.argv) > 1 else FIXTURES_DIR, int(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -0,0 +1,29 @@
+"""
+Microbenchmark for app.utils.rate_limiter.RateLimiter.
+
+Measures checks/sec with 100k distinct clients spread over the same routes
+the API uses. Run from the repository root:
+
+    python -m benchmarks.rate_limiter
+"""
+import random
+import time
+
+from app.utils.rate_limiter import RateLimiter
+
+ROUTES = ["player_profile", "club_squad", "league_table", "search_players"]
+
+def run(clients: int = 100_000, checks: int = 1_000_000):
+    limiter = RateLimiter()
+    keys = [f"{random.choice(ROUTES)}:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(clients)]
+
+    start = time.perf_counter()
+    for i in range(checks):
+        limiter.hit(keys[i % clients], limit=5, window=60)
+    elapsed = time.perf_counter() - start
+
+    print(f"clients={clients} checks={checks} elapsed={elapsed:.2f}s "
+          f"checks/sec={checks / elapsed:,.0f} tracked_keys={limiter.size()}")
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,52 @@
+"""
+Full versus scoped (SoupStrainer) parse benchmark.
+
+Runs every parse function in app.utils.scraping against saved Transfermarkt
+pages twice - building the whole DOM and building only the subtree each
+parser declares - and reports the time and peak memory per call, checking
+that both produce the same output. Uses the same fixture names as
+benchmarks.parsers:
+
+    python -m benchmarks.scoped [path/to/fixtures] [iterations]
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.utils import parsing
+from benchmarks.parsers import FIXTURES, FIXTURES_DIR
+
+def measure(parse, html: str, iterations: int):
+    tracemalloc.start()
+    output = parse(html)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(html)
+    return output, (time.perf_counter() - start) / iterations * 1000, peak / 1024
+
+def run(fixtures_dir: Path, iterations: int = 20):
+    print(f"{'endpoint':<22}{'full':>12}{'scoped':>12}{'full peak':>14}{'scoped peak':>14}  same output")
+
+    for name, parse in FIXTURES.items():
+        path = fixtures_dir / f"{name}.html"
+        if not path.exists():
+            print(f"{name:<22}  no fixture, skipped")
+            continue
+        html = path.read_text(encoding="utf-8")
+
+        parsing.PARSE_SCOPED = False
+        full, full_ms, full_peak = measure(parse, html, iterations)
+        parsing.PARSE_SCOPED = True
+        scoped, scoped_ms, scoped_peak = measure(parse, html, iterations)
+
+        print(
+            f"{name:<22}{full_ms:>9.2f} ms{scoped_ms:>9.2f} ms"
+            f"{full_peak:>11.0f} KB{scoped_peak:>11.0f} KB  {repr(full) == repr(scoped)}"
+        )
+
+if __name__ == "__main__":
+    run(Path(sys.argv[1]) if len(sys.argv) > 1 else FIXTURES_DIR, int(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -11,4 +11,7 @@ setup(
         "beautifulsoup4",
         "cachetools",
     ],
+    extras_require={
+        "fast": ["lxml"],
+    },
 )
\ No newline at end of file
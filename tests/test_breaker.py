@@ -0,0 +1,19 @@
+"""
+A half-open circuit lets exactly one probe through until that probe itself
+succeeds or fails.
+"""
+from app.utils.breaker import CircuitBreaker
+
+def test_ordinary_failure_does_not_end_the_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "half-open"
+
+    assert breaker.allow()
+    # A request let through before the circuit opened fails meanwhile
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    breaker.record_success(probe=True)
+    assert breaker.state == "closed" and breaker.allow()
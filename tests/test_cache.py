@@ -0,0 +1,38 @@
+"""
+Cache backends must stay within their limits without scanning the table on
+every write, and entries must not outlive their hard TTL.
+"""
+import time
+
+from app.utils import cache
+from app.utils.cache_backends import SQLiteCache
+
+def test_limits_are_enforced_on_sampled_writes(tmp_path):
+    store = SQLiteCache(str(tmp_path / "cache.sqlite3"), namespace="test", maxsize=1000, max_bytes=100, evict_every=4)
+    for key in range(8):
+        store[key] = "x" * 20
+
+    # Checked on writes 1 and 5: the budget held after the fifth, then three more
+    total = store.conn.execute("SELECT SUM(size) FROM cache").fetchone()[0]
+    assert total == 22 * 7
+    store[8] = "x" * 20
+    assert store.conn.execute("SELECT SUM(size) FROM cache").fetchone()[0] <= 100
+    # Entries closest to expiry go first
+    assert 8 in store and 0 not in store
+
+def test_promoted_entries_keep_their_hard_ttl(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_PERSIST_PATH", str(tmp_path / "persist.sqlite3"))
+    promoted = cache.make_cache("promoted", ttl=10, max_stale=10)
+    now = time.time()
+    promoted.store["fresh"] = (now - 15, "value")
+    promoted.store["expired"] = (now - 25, "value")
+
+    assert promoted["fresh"] == "value"
+    assert "expired" not in promoted
+    promoted.backend.expire(now + 6)
+    assert "fresh" not in promoted.backend
+
+def test_touching_an_expired_key_is_a_no_op():
+    touched = cache.make_cache("touched")
+    touched.touch("gone")
+    assert "gone" not in touched
@@ -0,0 +1,13 @@
+"""
+Country search matches names and IDs as substrings, in list order.
+"""
+from app.utils.store import get_country, search_countries_query
+
+def test_id_queries_match_as_substrings():
+    ids = [country["id"] for country in search_countries_query(" 1 ")["results"]]
+    assert "1" in ids and "10" in ids and all("1" in country_id for country_id in ids)
+    assert get_country(" 1 ") == {"id": "1", "name": "Afghanistan"}
+
+def test_names_match_without_accents():
+    names = [country["name"] for country in search_countries_query("turk")["results"]]
+    assert "Türkiye" in names and "Turkmenistan" in names
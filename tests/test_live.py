@@ -0,0 +1,41 @@
+"""
+The live score poller must see every upstream change, not a copy of the
+page held by the raw page cache.
+"""
+import asyncio
+from pathlib import Path
+
+from app.utils import cache, client
+from app.utils.live import LiveScores, poll_todays_matches
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+def test_poller_pushes_each_upstream_score_change(monkeypatch):
+    page = (FIXTURES_DIR / "matches.html").read_text(encoding="utf-8")
+    calls = []
+
+    async def upstream(url, read, params=None, headers=None, timeout=None):
+        calls.append(url)
+        return 200, (page.replace("1:0", f"{len(calls)}:0"), {})
+
+    monkeypatch.setattr(client, "request", upstream)
+
+    async def run():
+        live = LiveScores(poll_todays_matches, interval=0.01)
+        queue = live.subscribe()
+        try:
+            return [await asyncio.wait_for(queue.get(), 1) for _ in range(3)]
+        finally:
+            live.unsubscribe(queue)
+
+    try:
+        updates = asyncio.run(run())
+    finally:
+        client.page_cache.pages.clear()
+        cache.matches_cache.backend.clear()
+
+    assert len(calls) >= 3
+    assert len(updates[0][1]) == 3
+    for kind, matches in updates[1:]:
+        assert kind == "update"
+        assert [match["match_id"] for match in matches] == ["4361262"]
@@ -0,0 +1,45 @@
+"""
+Parser backend equivalence: every parse function must return the same data
+on each available tree builder as on html.parser, with and without scoped
+parsing, for the trimmed Transfermarkt pages in tests/fixtures.
+"""
+from pathlib import Path
+
+import pytest
+
+from app.utils import parsing
+from benchmarks.parsers import FIXTURES
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+SAVED = sorted(path.stem for path in FIXTURES_DIR.glob("*.html"))
+
+def normalize(output):
+    """Makes parse outputs comparable: exceptions by repr, no wall-clock dates"""
+    if isinstance(output, BaseException):
+        return repr(output)
+    if isinstance(output, dict):
+        return {key: normalize(value) for key, value in output.items() if key != "date"}
+    if isinstance(output, (list, tuple)):
+        return [normalize(value) for value in output]
+    return output
+
+def run(name: str, parser: str, scoped: bool, monkeypatch):
+    monkeypatch.setattr(parsing, "HTML_PARSER", parser)
+    monkeypatch.setattr(parsing, "PARSE_SCOPED", scoped)
+    html = (FIXTURES_DIR / f"{name}.html").read_text(encoding="utf-8")
+    return normalize(FIXTURES[name](html))
+
+def test_every_fixture_has_a_parser():
+    assert SAVED
+    assert set(SAVED) <= set(FIXTURES)
+
+@pytest.mark.parametrize("name", SAVED)
+def test_fixture_parses_to_data(name, monkeypatch):
+    assert run(name, "html.parser", True, monkeypatch)
+
+@pytest.mark.parametrize("scoped", [True, False], ids=["scoped", "full"])
+@pytest.mark.parametrize("parser", parsing.available_parsers())
+@pytest.mark.parametrize("name", SAVED)
+def test_backend_matches_html_parser(name, parser, scoped, monkeypatch):
+    expected = run(name, "html.parser", True, monkeypatch)
+    assert run(name, parser, scoped, monkeypatch) == expected
@@ -0,0 +1,117 @@
+"""
+Background refreshes of stale cache entries must reach upstream even while
+the raw page cache still holds the page the entry was parsed from.
+"""
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from app.utils import cache, client, scraping
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+TODAY = scraping.match_day()
+MATCHES_URL = "https://www.transfermarkt.co.uk/live/index"
+
+class FakeUpstream:
+    """Stands in for client.request, answering every URL with one page"""
+
+    def __init__(self, html: str, etag: str = None):
+        self.html = html
+        self.etag = etag
+        self.calls = []
+
+    async def __call__(self, url, read, params=None, headers=None, timeout=None):
+        headers = headers or {}
+        self.calls.append((url, headers))
+        if self.etag and headers.get("If-None-Match") == self.etag:
+            return 304, ("", {})
+        return 200, (self.html, {"ETag": self.etag} if self.etag else {})
+
+@pytest.fixture
+def upstream(monkeypatch):
+    fake = FakeUpstream((FIXTURES_DIR / "matches.html").read_text(encoding="utf-8"))
+    monkeypatch.setattr(client, "request", fake)
+    yield fake
+    client.page_cache.pages.clear()
+    client.validators.urls.clear()
+    cache.matches_cache.backend.clear()
+
+async def settle():
+    while cache.refreshes_in_flight():
+        await asyncio.sleep(0)
+
+def store_stale(matches: list, age: float):
+    cache.matches_cache.backend[TODAY] = (time.time() - age, matches)
+
+def test_live_match_day_refresh_reaches_upstream(upstream):
+    old = [{"match_id": "1", "status": "live", "time_or_score": "0:0"}]
+    store_stale(old, age=cache.CACHE_MATCHES_LIVE_TTL + 1)
+    client.page_cache.set(MATCHES_URL, "<html>page the stale entry was parsed from</html>")
+
+    async def run():
+        served = await scraping.scrape_todays_matches()
+        await settle()
+        return served
+
+    assert asyncio.run(run()) == old
+    assert [url for url, _ in upstream.calls] == [MATCHES_URL]
+    refreshed = cache.matches_cache[TODAY]
+    assert [match["match_id"] for match in refreshed] == ["4361261", "4361262", "4361263"]
+    assert not cache.matches_cache.is_stale(TODAY)
+
+def test_unmodified_page_restarts_ttl_without_reparsing(upstream):
+    upstream.etag = '"v1"'
+    client.validators.set(MATCHES_URL, {"ETag": upstream.etag})
+    old = [{"match_id": "1", "status": "live", "time_or_score": "0:0"}]
+    store_stale(old, age=cache.CACHE_MATCHES_LIVE_TTL + 1)
+
+    async def run():
+        await scraping.scrape_todays_matches()
+        await settle()
+
+    asyncio.run(run())
+    assert upstream.calls[0][1]["If-None-Match"] == upstream.etag
+    assert cache.matches_cache[TODAY] == old
+    assert not cache.matches_cache.is_stale(TODAY)
+
+def test_unmodified_refresh_renews_a_scraper_that_swallows_errors(upstream):
+    # fetch_player_absences answers every failure with []; a 304 must still
+    # restart the cached entry's TTL instead of refreshing on every request
+    url = "https://www.transfermarkt.co.uk/-/ausfaelle/spieler/1"
+    upstream.etag = '"v1"'
+    client.validators.set(url, {"ETag": upstream.etag})
+    old = [{"season": "24/25", "reason": "Hamstring injury"}]
+    cache.player_absences_cache.backend[1] = (time.time() - cache.CACHE_TTL - 1, old)
+
+    async def run():
+        served = []
+        for _ in range(3):
+            served.append(await scraping.fetch_player_absences(1))
+            await settle()
+        return served
+
+    try:
+        assert asyncio.run(run()) == [old] * 3
+    finally:
+        served = cache.player_absences_cache.backend.pop(1, None)
+    assert [called for called, _ in upstream.calls] == [url]
+    assert served[1] == old and time.time() - served[0] < cache.CACHE_TTL
+
+def test_batch_profiles_revalidate_stale_entries(upstream):
+    upstream.html = (FIXTURES_DIR / "player_profile.html").read_text(encoding="utf-8")
+    old = {"result": {"id": 1, "name": "Old name"}}
+    cache.player_profile_cache.backend["1"] = (time.time() - cache.CACHE_TTL - 1, old)
+
+    async def run():
+        served = await scraping.scrape_player_profiles(["1"])
+        await settle()
+        return served
+
+    try:
+        assert asyncio.run(run()) == ({"1": old}, {})
+        assert [url for url, _ in upstream.calls] == ["https://www.transfermarkt.co.uk/-/profil/spieler/1"]
+        assert not cache.player_profile_cache.is_stale("1")
+    finally:
+        cache.player_profile_cache.backend.pop("1", None)
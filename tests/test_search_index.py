@@ -0,0 +1,38 @@
+"""
+The local search index must only answer from memory when it can, and must
+stay within its size limit.
+"""
+from app.utils import search_index
+from app.utils.search_index import SearchIndex, search_locally
+
+def test_similar_names_do_not_satisfy_local_recall():
+    index = SearchIndex()
+    for doc_id, name in enumerate(["Sanchez", "Sanches", "Sánchez", "Sanchéz", "Sanchês"], start=1):
+        index.add(doc_id, f"Player {name}", {"id": doc_id})
+
+    documents, exact, fuzzy = index.lookup("Sancho")
+    assert fuzzy and len(documents) >= search_index.SEARCH_MIN_LOCAL_RESULTS
+    assert search_locally(index, "Sancho") is None
+    assert len(search_locally(index, "Player")) == 5
+
+def test_least_recently_used_documents_are_evicted():
+    index = SearchIndex(maxsize=2)
+    index.add("1", "Bukayo Saka", {"id": "1"})
+    index.add("2", "Declan Rice", {"id": "2"})
+    index.search("Saka")
+    index.add("3", "Martin Odegaard", {"id": "3"})
+
+    assert len(index) == 2
+    assert index.search("Rice") == []
+    assert index.search("Saka") == [{"id": "1"}]
+    # Tokens no document uses any more are dropped with it
+    assert "rice" not in index.postings and "rice" not in index.tokens
+    assert all("rice" not in tokens for tokens in index.grams.values())
+
+def test_replacing_a_name_drops_its_old_tokens():
+    index = SearchIndex()
+    index.add("1", "Martin Odegaard", {"id": "1"})
+    index.add("1", "Martin Ødegaard", {"id": "1"}, replace=True)
+    index.add("1", "Martin Degaard", {"id": "1"}, replace=True)
+    assert "odegaard" not in index.postings
+    assert index.tokens == sorted(index.postings)
@@ -0,0 +1,53 @@
+"""
+Workers sharing one transfer feed file must hand out the same sequence
+numbers, so a client's since= works whichever worker answers it.
+"""
+from app.utils.transfer_feed import TransferFeed
+
+def row(player_id: str, fee: str = "€1.00m") -> dict:
+    return {
+        'name': f"Player {player_id}",
+        'player_id': player_id,
+        'previous_club': "A",
+        'current_club': "B",
+        'transfer_fee': fee,
+        'date': 0
+    }
+
+async def unused():
+    raise AssertionError("no upstream fetch expected")
+
+def test_workers_share_sequence_numbers(tmp_path):
+    path = str(tmp_path / "feed.sqlite3")
+    first = TransferFeed(unused, path=path)
+    second = TransferFeed(unused, path=path)
+
+    # Newest transfer first, as on the page
+    assert first.ingest([row("2"), row("1")]) == 2
+    assert second.ingest([row("3"), row("2"), row("1")]) == 1
+
+    assert [entry['seq'] for entry in first.since(0)] == [1, 2, 3]
+    assert first.since(1) == second.since(1)
+    assert [entry['player_id'] for entry in second.since(2)] == ["3"]
+    assert [entry['seq'] for entry in first.latest] == [3, 2, 1]
+    assert first.seq == second.seq == 3
+
+def test_first_seen_date_is_kept(tmp_path):
+    feed = TransferFeed(unused, path=str(tmp_path / "feed.sqlite3"))
+    feed.ingest([row("1")])
+    date = feed.since(0)[0]['date']
+    assert date > 0
+    feed.ingest([row("1")])
+    assert feed.since(0)[0]['date'] == date
+
+def test_log_keeps_newest_maxlen_entries(tmp_path):
+    feed = TransferFeed(unused, path=str(tmp_path / "feed.sqlite3"), maxlen=2)
+    feed.ingest([row("3"), row("2"), row("1")])
+    assert [entry['seq'] for entry in feed.since(0)] == [2, 3]
+
+def test_one_worker_polls_per_interval(tmp_path):
+    path = str(tmp_path / "feed.sqlite3")
+    first = TransferFeed(unused, path=path, interval=300)
+    second = TransferFeed(unused, path=path, interval=300)
+    assert first._claim_poll()
+    assert not second._claim_poll()